@@ -3,12 +3,13 @@ Workflow Automation Pipeline Dashboard
 Main application for managing automated workflows
 """
 
+import logging
+import os
+import sys
 import streamlit as st
 import streamlit.components.v1 as components
 import database.db_setup as db
 import auth
-import sys
-import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import config
 from pages import (
@@ -18,6 +19,13 @@ from pages import (
     settings_page
 )
 
+# Module loggers report through the root logger; LOG_LEVEL (e.g. DEBUG) sets the level, unknown values mean INFO
+_log_level = getattr(logging, os.getenv("LOG_LEVEL", "INFO").strip().upper(), None)
+logging.basicConfig(
+    level=_log_level if isinstance(_log_level, int) else logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+
 # Page configuration
 st.set_page_config(
     page_title="REimaginehome Content Creator - Workflow Dashboard",
@@ -4,7 +4,9 @@ Stores API keys and configuration settings
 """
 import os
 import json
+import functools
 from pathlib import Path
+from types import MappingProxyType
 from dotenv import load_dotenv, set_key, unset_key
 
 try:
@@ -309,13 +311,16 @@ def has_youtube_credentials():
     """
     return bool(os.getenv('YOUTUBE_CLIENT_ID') and os.getenv('YOUTUBE_CLIENT_SECRET'))
 
+@functools.lru_cache(maxsize=1)
 def get_openai_model():
     """
     Get OpenAI model from:
     1. Streamlit secrets (when running on Streamlit Cloud)
     2. Environment variable (OPENAI_MODEL)
     3. Config file (config.json)
-    Returns default model if not found
+    Returns default model if not found.
+    The result is cached per process; save_openai_model() clears it. Edits made
+    directly to Streamlit secrets or OPENAI_MODEL take effect after a restart.
     """
     # Valid models (GPT-5 support added, but may not be available yet)
     valid_models = [
@@ -389,6 +394,7 @@ def save_openai_model(model):
         with open(CONFIG_FILE, 'w') as f:
             json.dump(config, f, indent=2)
         
+        get_openai_model.cache_clear()
         return True
     except Exception as e:
         print(f"Error saving OpenAI model: {e}")
@@ -716,12 +722,14 @@ def save_shared_password(password):
         return False
 
 # Cloudinary API Functions
+@functools.lru_cache(maxsize=1)
 def get_cloudinary_credentials():
     """
     Get Cloudinary credentials from:
     1. Streamlit secrets (when running on Streamlit Cloud)
     2. Environment variables / .env
-    Returns dict with credentials or None
+    Returns a read-only mapping with credentials or None
+    The result is cached per process and shared by every caller; save/clear_cloudinary_credentials() clear it.
     """
     # First, try Streamlit secrets (for Streamlit Cloud deployment)
     cloud_name = None
@@ -750,11 +758,11 @@ def get_cloudinary_credentials():
     
     # If we got credentials from secrets, return them
     if cloud_name and api_key and api_secret:
-        return {
+        return MappingProxyType({
             'cloud_name': cloud_name,
             'api_key': api_key,
             'api_secret': api_secret
-        }
+        })
     
     # Second, try environment variables
     cloud_name = os.getenv('CLOUDINARY_CLOUD_NAME')
@@ -762,11 +770,11 @@ def get_cloudinary_credentials():
     api_secret = os.getenv('CLOUDINARY_API_SECRET')
     
     if cloud_name and api_key and api_secret:
-        return {
+        return MappingProxyType({
             'cloud_name': cloud_name,
             'api_key': api_key,
             'api_secret': api_secret
-        }
+        })
     
     return None
 
@@ -781,6 +789,7 @@ def save_cloudinary_credentials(cloud_name: str, api_key: str, api_secret: str):
             _set_env_var('CLOUDINARY_API_KEY', api_key)
         if api_secret:
             _set_env_var('CLOUDINARY_API_SECRET', api_secret)
+        get_cloudinary_credentials.cache_clear()
         return True
     except Exception as e:
         print(f"Error saving Cloudinary credentials: {e}")
@@ -794,6 +803,7 @@ def clear_cloudinary_credentials():
         _unset_env_var('CLOUDINARY_CLOUD_NAME')
         _unset_env_var('CLOUDINARY_API_KEY')
         _unset_env_var('CLOUDINARY_API_SECRET')
+        get_cloudinary_credentials.cache_clear()
         return True
     except Exception as e:
         print(f"Error clearing Cloudinary credentials: {e}")
@@ -3,8 +3,8 @@ Database setup for workflow automation pipeline
 Uses MongoDB for flexible document storage
 """
 
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, DuplicateKeyError
+from pymongo import MongoClient, UpdateOne, UpdateMany
+from pymongo.errors import BulkWriteError, ConnectionFailure, DuplicateKeyError
 from bson import ObjectId
 from datetime import datetime
 from typing import Optional, List, Dict, Any
@@ -12,6 +12,11 @@ import os
 import json
 import re
 import hashlib
+import queue
+import threading
+import time
+import functools
+from contextlib import contextmanager
 from pathlib import Path
 
 # Load .env file if present (before reading environment variables)
@@ -30,6 +35,19 @@ except ImportError:
 _client = None
 _db = None
 
+# Session of the transaction open on the current thread, if any
+_local = threading.local()
+
+# Incremented after every write made through this module (see get_write_version)
+_write_version = 0
+_write_version_lock = threading.Lock()
+
+# ObjectId lookups by (collection name, hash id) - ObjectIds never change once assigned
+_objectid_cache: Dict[tuple, ObjectId] = {}
+
+# Collections whose documents are addressed by hash id from the UI
+_HASH_ID_COLLECTIONS = ('blog_urls', 'scripts', 'videos', 'social_media_posts', 'master_prompts', 'uploaded_videos')
+
 def _get_mongo_credentials():
     """
     Get MongoDB credentials dynamically (checks Streamlit Secrets first, then env vars)
@@ -89,6 +107,10 @@ def get_db_connection():
     """Get MongoDB database connection"""
     global _client, _db
     
+    # One client per process - once connected, skip re-reading secrets on every query
+    if _db is not None:
+        return _db
+    
     # Get credentials dynamically (checks Streamlit Secrets first)
     mongo_uri, db_name = _get_mongo_credentials()
     
@@ -227,7 +249,7 @@ def init_db():
     db.blog_urls.create_index("created_at")
     
     # Scripts collection
-    db.scripts.create_index("blog_url_id")
+    # (blog_url_id, script_number) serves both blog_url_id lookups and the script-order sort
     db.scripts.create_index("status")
     db.scripts.create_index([("blog_url_id", 1), ("script_number", 1)])
     db.scripts.create_index("created_at")
@@ -257,8 +279,82 @@ def init_db():
     db.master_prompts.create_index("is_active")
     db.master_prompts.create_index("name")
     
+    # Hash id lookups (ids shown in the UI are hashes of the ObjectId)
+    for collection_name in _HASH_ID_COLLECTIONS:
+        _backfill_hash_ids(db[collection_name])
+        db[collection_name].create_index("_hash_id")
+    
     print("Database initialized successfully!")
 
+def _backfill_hash_ids(collection):
+    """Store _hash_id on documents created before it was persisted at insert time"""
+    updates = [
+        UpdateOne({'_id': doc['_id']}, {'$set': {'_hash_id': _get_consistent_id_hash(doc['_id'])}})
+        for doc in collection.find({'_hash_id': {'$exists': False}}, {'_id': 1})
+    ]
+    if updates:
+        collection.bulk_write(updates, ordered=False)
+
+def get_write_version() -> int:
+    """
+    Return a counter that changes whenever this process writes to the database.
+    Callers can key caches on it to skip re-reading unchanged data.
+    """
+    return _write_version
+
+def bump_write_version():
+    """Record a write made outside this module (e.g. directly on a collection)"""
+    global _write_version
+    with _write_version_lock:
+        _write_version += 1
+
+def _bumps_write_version(func):
+    """Advance the write version once the wrapped write has run"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            bump_write_version()
+    return wrapper
+
+def _current_session():
+    """Return the session of the transaction open on this thread, or None"""
+    return getattr(_local, 'session', None)
+
+@functools.lru_cache(maxsize=1)
+def _supports_transactions(client) -> bool:
+    """Transactions need a replica set or a sharded cluster"""
+    try:
+        hello = client.admin.command('hello')
+    except Exception:
+        return False
+    return bool(hello.get('setName')) or hello.get('msg') == 'isdbgrid'
+
+@contextmanager
+def transaction():
+    """
+    Run the writes made on this thread inside one MongoDB transaction.
+    On a standalone server, where transactions are unavailable, the writes
+    run as usual. Nested calls join the outer transaction.
+    """
+    if _current_session() is not None:
+        yield _current_session()
+        return
+    
+    client = get_db_connection().client
+    if not _supports_transactions(client):
+        yield None
+        return
+    
+    with client.start_session() as session:
+        with session.start_transaction():
+            _local.session = session
+            try:
+                yield session
+            finally:
+                _local.session = None
+
 def _get_consistent_id_hash(object_id) -> int:
     """Get consistent hash from ObjectId using MD5 (consistent across Python sessions)"""
     if isinstance(object_id, ObjectId):
@@ -272,19 +368,59 @@ def _get_consistent_id_hash(object_id) -> int:
     return hash_int % (10**9)
 
 def _find_objectid_by_hash(collection, hash_value: int) -> Optional[ObjectId]:
-    """Find ObjectId from hash value by searching all documents in collection"""
+    """Find ObjectId from hash value using the indexed _hash_id field"""
     try:
         hash_int = int(hash_value)
-        for doc in collection.find({}):
-            doc_id = doc.get('_id')
-            if doc_id:
-                doc_hash = _get_consistent_id_hash(doc_id)
-                if doc_hash == hash_int:
-                    return doc_id
+        cache_key = (collection.name, hash_int)
+        if cache_key in _objectid_cache:
+            return _objectid_cache[cache_key]
+        doc = collection.find_one({'_hash_id': hash_int}, {'_id': 1})
+        if doc:
+            _objectid_cache[cache_key] = doc['_id']
+            return doc['_id']
     except Exception as e:
         print(f"Error finding ObjectId by hash: {e}")
     return None
 
+def _id_reference_values(object_id: ObjectId) -> List[Any]:
+    """Values a foreign-key field may hold for a document: its ObjectId, or its legacy hash as int or str"""
+    hash_id = _get_consistent_id_hash(object_id)
+    return [object_id, hash_id, str(hash_id)]
+
+def _resolve_object_id(value, collection_name: str = None) -> Optional[ObjectId]:
+    """Resolve an id parameter (ObjectId string or legacy hash) to an ObjectId, or None"""
+    if isinstance(value, ObjectId):
+        return value
+    if isinstance(value, str) and len(value) == 24:
+        try:
+            return ObjectId(value)
+        except Exception:
+            pass
+    if collection_name:
+        try:
+            hash_int = int(value)
+        except (TypeError, ValueError):
+            return None
+        return _find_objectid_by_hash(get_db_connection()[collection_name], hash_int)
+    return None
+
+# Pattern to match: field operator ?  or  field IN (?, ?, ...)
+_WHERE_TERM_RE = re.compile(r'(\w+)\s*(?:(=|!=|>|<|>=|<=)\s*\?|IN\s*\(\s*(\?(?:\s*,\s*\?)*)\s*\))', re.IGNORECASE)
+
+@functools.lru_cache(maxsize=256)
+def _where_terms(where_clause: str) -> tuple:
+    """
+    Parse a WHERE clause once per distinct SQL text into (field, operator, in_count) terms.
+    operator is None for IN lists; in_count is None for single-placeholder comparisons.
+    """
+    terms = []
+    for match in _WHERE_TERM_RE.finditer(where_clause):
+        if match.group(3) is not None:
+            terms.append((match.group(1), None, match.group(3).count('?')))
+        else:
+            terms.append((match.group(1), match.group(2).strip(), None))
+    return tuple(terms)
+
 def _parse_sql_where(where_clause: str, params: tuple, collection_name: str = None) -> Dict[str, Any]:
     """Parse SQL WHERE clause to MongoDB filter"""
     if not where_clause:
@@ -293,14 +429,18 @@ def _parse_sql_where(where_clause: str, params: tuple, collection_name: str = No
     filter_dict = {}
     param_index = 0
     
-    # Find all ? placeholders and their corresponding operators
-    # Pattern to match: field operator ?
-    pattern = r'(\w+)\s*(=|!=|>|<|>=|<=)\s*\?'
-    matches = list(re.finditer(pattern, where_clause, re.IGNORECASE))
-    
-    for match in matches:
-        field = match.group(1)
-        operator = match.group(2).strip()
+    for field, operator, count in _where_terms(where_clause):
+        if count is not None:
+            # IN list - one parameter per placeholder
+            values = list(params[param_index:param_index + count])
+            param_index += count
+            if field == 'id':
+                # Resolve each id (ObjectId string or hash); unknown ids simply match nothing
+                object_ids = [_resolve_object_id(value, collection_name) for value in values]
+                filter_dict['_id'] = {'$in': [obj_id for obj_id in object_ids if obj_id is not None]}
+            else:
+                filter_dict[field] = {'$in': values}
+            continue
         
         if param_index < len(params):
             value = params[param_index]
@@ -373,6 +513,9 @@ def _convert_row_to_dict(row: Dict) -> Dict:
     """Convert MongoDB document to dict, handling ObjectId and other types"""
     result = {}
     for key, value in row.items():
+        if key == '_hash_id':
+            # Internal lookup field, 'id' already carries the hash
+            continue
         if key == '_id':
             # Convert ObjectId to int for backward compatibility using consistent hash
             if isinstance(value, ObjectId):
@@ -392,13 +535,59 @@ def _convert_row_to_dict(row: Dict) -> Dict:
             result[key] = value
     return result
 
-def execute_query(query: str, params: tuple = ()) -> List[Dict[str, Any]]:
-    """Execute a SELECT query and return results as list of dictionaries"""
+@functools.lru_cache(maxsize=256)
+def _select_projection(query: str) -> tuple:
+    """
+    MongoDB projection for a SELECT column list, plus the (column, alias) pairs to copy.
+    Returns (None, ()) for SELECT * or anything other than plain columns / "column as alias".
+    """
+    select_match = re.search(r'SELECT\s+(.+?)\s+FROM\s', query, re.IGNORECASE | re.DOTALL)
+    if not select_match:
+        return None, ()
+    
+    projection = {'_id': 1}
+    aliases = []
+    for column in select_match.group(1).split(','):
+        column_match = re.fullmatch(r'(\w+)(?:\s+as\s+(\w+))?', column.strip(), re.IGNORECASE)
+        if not column_match:
+            return None, ()
+        field, alias = column_match.groups()
+        if field not in ('id', '_object_id'):
+            projection[field] = 1
+        if alias:
+            aliases.append((field, alias))
+    return projection, tuple(aliases)
+
+def execute_query(query: str, params: tuple = (), project: bool = False) -> List[Dict[str, Any]]:
+    """
+    Execute a SELECT query and return results as list of dictionaries.
+    With project=True only the selected columns are read from MongoDB (and "column as alias"
+    is applied); by default whole documents are returned, as callers may rely on other fields.
+    """
     db = get_db_connection()
     
     # Parse SQL query
     query = query.strip()
     
+    # Check if this is a grouped COUNT query (SELECT field, COUNT(*) as alias ... GROUP BY field)
+    group_match = re.search(
+        r'SELECT\s+(\w+)\s*,\s*COUNT\s*\(\s*\*\s*\)\s+as\s+(\w+)\s+FROM\s+(\w+)(?:\s+WHERE\s+(.+?))?\s+GROUP\s+BY\s+(\w+)',
+        query, re.IGNORECASE | re.DOTALL
+    )
+    if group_match:
+        group_field, count_alias, collection_name, where_clause, group_by = group_match.groups()
+        if group_field != group_by:
+            raise ValueError(f"GROUP BY field must match the selected field: {query}")
+        filter_dict = _parse_sql_where(where_clause.strip(), params, collection_name) if where_clause else {}
+        pipeline = [
+            {'$match': filter_dict},
+            {'$group': {'_id': f'${group_field}', count_alias: {'$sum': 1}}},
+        ]
+        return [
+            {group_field: row['_id'], count_alias: row[count_alias]}
+            for row in db[collection_name].aggregate(pipeline)
+        ]
+    
     # Check if this is a COUNT query (supports COUNT(*) and COUNT(DISTINCT ...))
     count_match = re.search(r'SELECT\s+COUNT\s*\(\s*(?:\*|DISTINCT\s+\w+)\s*\)\s+as\s+(\w+)', query, re.IGNORECASE)
     if count_match:
@@ -467,8 +656,10 @@ def execute_query(query: str, params: tuple = ()) -> List[Dict[str, Any]]:
     if limit_match:
         limit = int(limit_match.group(1))
     
+    projection, aliases = _select_projection(query) if project else (None, ())
+    
     # Execute query
-    cursor = collection.find(filter_dict)
+    cursor = collection.find(filter_dict, projection)
     if sort_list:
         cursor = cursor.sort(sort_list)
     if limit:
@@ -476,10 +667,140 @@ def execute_query(query: str, params: tuple = ()) -> List[Dict[str, Any]]:
     
     results = []
     for doc in cursor:
-        results.append(_convert_row_to_dict(doc))
+        row = _convert_row_to_dict(doc)
+        for field, alias in aliases:
+            row[alias] = row.get(field)
+        results.append(row)
     
     return results
 
+def _parse_sql_literal(value_str):
+    """Convert a literal from a SET clause (quoted string, number, boolean, NULL)"""
+    value_str = value_str.strip()
+    if value_str.startswith("'") and value_str.endswith("'"):
+        return value_str[1:-1]
+    if value_str.startswith('"') and value_str.endswith('"'):
+        return value_str[1:-1]
+    # Try to parse as int/float
+    try:
+        if '.' in value_str:
+            return float(value_str)
+        return int(value_str)
+    except ValueError:
+        pass
+    # Booleans
+    if value_str.lower() in ['true', 'false']:
+        return value_str.lower() == 'true'
+    if value_str.lower() == 'null':
+        return None
+    return value_str
+
+@functools.lru_cache(maxsize=256)
+def _parse_update_sql(query: str) -> tuple:
+    """
+    Parse an UPDATE statement once per distinct SQL text into
+    (collection name, ((field, value expression), ...), WHERE clause or None)
+    """
+    table_match = re.search(r'UPDATE\s+(\w+)', query, re.IGNORECASE)
+    if not table_match:
+        raise ValueError(f"Could not parse table name from UPDATE query: {query}")
+    
+    # Parse SET clause
+    set_match = re.search(r'SET\s+(.+?)(?:\s+WHERE|$)', query, re.IGNORECASE | re.DOTALL)
+    if not set_match:
+        raise ValueError(f"Could not parse SET clause from UPDATE query: {query}")
+    
+    # SET assignments like "field = ?" or "field = CURRENT_TIMESTAMP" or "field = 0"
+    assignments = []
+    for assignment in set_match.group(1).strip().split(','):
+        match = re.match(r'(\w+)\s*=\s*(.+)$', assignment.strip())
+        if match:
+            assignments.append((match.group(1), match.group(2).strip()))
+    
+    where_match = re.search(r'WHERE\s+(.+?)$', query, re.IGNORECASE | re.DOTALL)
+    return table_match.group(1), tuple(assignments), where_match.group(1).strip() if where_match else None
+
+@functools.lru_cache(maxsize=256)
+def _parse_delete_sql(query: str) -> tuple:
+    """Parse a DELETE statement once per distinct SQL text into (collection name, WHERE clause or None)"""
+    table_match = re.search(r'DELETE\s+FROM\s+(\w+)', query, re.IGNORECASE)
+    if not table_match:
+        raise ValueError(f"Could not parse table name from DELETE query: {query}")
+    
+    where_match = re.search(r'WHERE\s+(.+?)$', query, re.IGNORECASE | re.DOTALL)
+    return table_match.group(1), where_match.group(1).strip() if where_match else None
+
+# SET expression adding to or subtracting from the column's own value: "field + ?" / "field - ?"
+_INCREMENT_RE = re.compile(r'(\w+)\s*([+-])\s*\?$')
+
+def _build_update(db, original_query: str, params: tuple):
+    """
+    Parse an UPDATE query into (collection, filter, update document).
+    "field = field + ?" assignments become $inc, everything else $set.
+    The filter is None when the WHERE id cannot be resolved to a document.
+    """
+    collection_name, assignments, where_clause = _parse_update_sql(original_query)
+    collection = db[collection_name]
+    update_dict = {}
+    inc_dict = {}
+    
+    # Fill the parsed SET assignments: parameterized values and literal values
+    param_index = 0
+    for field, value_expr in assignments:
+        increment = _INCREMENT_RE.match(value_expr)
+        if increment and increment.group(1) == field:
+            value = params[param_index] if param_index < len(params) else 0
+            param_index += 1
+            inc_dict[field] = -value if increment.group(2) == '-' else value
+        elif value_expr.upper() == 'CURRENT_TIMESTAMP':
+            update_dict[field] = datetime.now()
+        elif value_expr == '?':
+            if param_index < len(params):
+                value = params[param_index]
+                param_index += 1
+            else:
+                value = None
+            if field.endswith('_at') and isinstance(value, str):
+                try:
+                    if value.upper() == 'CURRENT_TIMESTAMP':
+                        update_dict[field] = datetime.now()
+                    else:
+                        update_dict[field] = datetime.fromisoformat(value.replace('Z', '+00:00'))
+                except:
+                    update_dict[field] = datetime.now()
+            else:
+                update_dict[field] = value
+        else:
+            update_dict[field] = _parse_sql_literal(value_expr)
+    
+    filter_dict = {}
+    if where_clause:
+        # Adjust params for WHERE clause (skip SET params)
+        where_params = params[param_index:] if param_index < len(params) else ()
+        filter_dict = _parse_sql_where(where_clause, where_params, collection_name)
+    
+    # Handle _id_hash case (when id is a hash value)
+    # First try to find ObjectId using hash lookup
+    if '_id_hash' in filter_dict:
+        hash_value = filter_dict.pop('_id_hash')
+        collection_name_for_lookup = filter_dict.pop('_collection_name', collection_name)
+        
+        # Try to find ObjectId by hash
+        obj_id = _find_objectid_by_hash(collection, hash_value)
+        if obj_id:
+            filter_dict['_id'] = obj_id
+        else:
+            print(f"Warning: Could not find document with hash {hash_value} in {collection_name}")
+            return collection, None, None
+    
+    update_doc = {}
+    if update_dict:
+        update_doc['$set'] = update_dict
+    if inc_dict:
+        update_doc['$inc'] = inc_dict
+    return collection, filter_dict, update_doc
+
+@_bumps_write_version
 def execute_update(query: str, params: tuple = ()) -> int:
     """Execute UPDATE/DELETE query and return affected rows"""
     db = get_db_connection()
@@ -489,144 +810,20 @@ def execute_update(query: str, params: tuple = ()) -> int:
     query_upper = original_query.upper()
     
     if query_upper.startswith('UPDATE'):
-        # Parse UPDATE query (use original for regex matching)
-        table_match = re.search(r'UPDATE\s+(\w+)', original_query, re.IGNORECASE)
-        if not table_match:
-            raise ValueError(f"Could not parse table name from UPDATE query: {original_query}")
-        
-        collection_name = table_match.group(1)
-        collection = db[collection_name]
-        
-        # Parse SET clause (use original query)
-        set_match = re.search(r'SET\s+(.+?)(?:\s+WHERE|$)', original_query, re.IGNORECASE | re.DOTALL)
-        if not set_match:
-            raise ValueError(f"Could not parse SET clause from UPDATE query: {original_query}")
-        
-        set_clause = set_match.group(1).strip()
-        update_dict = {}
-        
-        # Parse SET assignments like "field = ?" or "field = CURRENT_TIMESTAMP" or "field = 0"
-        # Handle parameterized values and literal values
-        param_index = 0
-        assignments = [part.strip() for part in set_clause.split(',')]
-        
-        def _parse_literal(value_str):
-            value_str = value_str.strip()
-            if value_str.startswith("'") and value_str.endswith("'"):
-                return value_str[1:-1]
-            if value_str.startswith('"') and value_str.endswith('"'):
-                return value_str[1:-1]
-            # Try to parse as int/float
-            try:
-                if '.' in value_str:
-                    return float(value_str)
-                return int(value_str)
-            except ValueError:
-                pass
-            # Booleans
-            if value_str.lower() in ['true', 'false']:
-                return value_str.lower() == 'true'
-            if value_str.lower() == 'null':
-                return None
-            return value_str
-        
-        for assignment in assignments:
-            if not assignment:
-                continue
-            match = re.match(r'(\w+)\s*=\s*(.+)$', assignment)
-            if not match:
-                continue
-            field = match.group(1)
-            value_expr = match.group(2).strip()
-            
-            if value_expr.upper() == 'CURRENT_TIMESTAMP':
-                update_dict[field] = datetime.now()
-            elif value_expr == '?':
-                if param_index < len(params):
-                    value = params[param_index]
-                    param_index += 1
-                else:
-                    value = None
-                if field.endswith('_at') and isinstance(value, str):
-                    try:
-                        if value.upper() == 'CURRENT_TIMESTAMP':
-                            update_dict[field] = datetime.now()
-                        else:
-                            update_dict[field] = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                    except:
-                        update_dict[field] = datetime.now()
-                else:
-                    update_dict[field] = value
-            else:
-                update_dict[field] = _parse_literal(value_expr)
-        
-        # Parse WHERE clause (use original query)
-        where_match = re.search(r'WHERE\s+(.+?)$', original_query, re.IGNORECASE | re.DOTALL)
-        filter_dict = {}
-        if where_match:
-            where_clause = where_match.group(1).strip()
-            # Adjust params for WHERE clause (skip SET params)
-            where_params = params[param_index:] if param_index < len(params) else ()
-            filter_dict = _parse_sql_where(where_clause, where_params, collection_name)
-        
-        # Handle _id_hash case (when id is a hash value)
-        # First try to find ObjectId using hash lookup
-        if '_id_hash' in filter_dict:
-            hash_value = filter_dict.pop('_id_hash')
-            collection_name_for_lookup = filter_dict.pop('_collection_name', collection_name)
-            
-            # Try to find ObjectId by hash
-            obj_id = _find_objectid_by_hash(collection, hash_value)
-            if obj_id:
-                filter_dict['_id'] = obj_id
-            else:
-                # Hash lookup failed - try querying the database directly to get ObjectId
-                # This handles cases where hash doesn't match (e.g., old data with different hash)
-                try:
-                    # Query all documents and check their hash
-                    for doc in collection.find({}):
-                        doc_id = doc.get('_id')
-                        if doc_id:
-                            doc_hash = _get_consistent_id_hash(doc_id)
-                            if doc_hash == hash_value:
-                                filter_dict['_id'] = doc_id
-                                break
-                    # If still not found, return 0
-                    if '_id' not in filter_dict:
-                        print(f"Warning: Could not find document with hash {hash_value} in {collection_name}")
-                        return 0
-                except Exception as e:
-                    print(f"Error looking up document by hash: {e}")
-                    return 0
+        collection, filter_dict, update_doc = _build_update(db, original_query, params)
+        if filter_dict is None:
+            return 0
         
-        # Execute update
-        if filter_dict and '_id' in filter_dict:
-            # Update specific document(s) by _id
-            result = collection.update_many(filter_dict, {"$set": update_dict})
-            return result.modified_count
-        elif not filter_dict:
-            # No WHERE clause - update all documents
-            result = collection.update_many({}, {"$set": update_dict})
-            return result.modified_count
-        else:
-            # WHERE clause exists but no _id - try to update matching documents
-            result = collection.update_many(filter_dict, {"$set": update_dict})
-            return result.modified_count
+        # Execute update (an empty filter updates all documents)
+        result = collection.update_many(filter_dict, update_doc, session=_current_session())
+        return result.modified_count
     
     elif query_upper.startswith('DELETE'):
-        # Parse DELETE query (use original for regex matching)
-        table_match = re.search(r'DELETE\s+FROM\s+(\w+)', original_query, re.IGNORECASE)
-        if not table_match:
-            raise ValueError(f"Could not parse table name from DELETE query: {original_query}")
-        
-        collection_name = table_match.group(1)
+        collection_name, where_clause = _parse_delete_sql(original_query)
         collection = db[collection_name]
         
-        # Parse WHERE clause (use original query)
-        where_match = re.search(r'WHERE\s+(.+?)$', original_query, re.IGNORECASE | re.DOTALL)
         filter_dict = {}
-        if where_match:
-            where_clause = where_match.group(1).strip()
+        if where_clause:
             filter_dict = _parse_sql_where(where_clause, params, collection_name)
         
         # Handle _id_hash case (when id is a hash value)
@@ -640,82 +837,39 @@ def execute_update(query: str, params: tuple = ()) -> int:
             if obj_id:
                 filter_dict['_id'] = obj_id
             else:
-                # Hash lookup failed - try querying the database directly to get ObjectId
-                try:
-                    # Query all documents and check their hash
-                    for doc in collection.find({}):
-                        doc_id = doc.get('_id')
-                        if doc_id:
-                            doc_hash = _get_consistent_id_hash(doc_id)
-                            if doc_hash == hash_value:
-                                filter_dict['_id'] = doc_id
-                                break
-                    # If still not found, return 0
-                    if '_id' not in filter_dict:
-                        print(f"Warning: Could not find document with hash {hash_value} in {collection_name}")
-                        return 0
-                except Exception as e:
-                    print(f"Error looking up document by hash: {e}")
-                    return 0
+                print(f"Warning: Could not find document with hash {hash_value} in {collection_name}")
+                return 0
         
         # Also delete related data (cascade delete)
         # Delete scripts, videos, and related data first
-        if collection_name == 'blog_urls' and '_id' in filter_dict:
-            blog_object_id = filter_dict.get('_id')
+        if collection_name == 'blog_urls' and isinstance(filter_dict.get('_id'), ObjectId):
+            blog_object_id = filter_dict['_id']
             scripts_collection = db['scripts']
-            
-            # Find all scripts for this blog (blog_url_id might be stored as hash or ObjectId)
-            # Query all scripts and find those that match
-            scripts_to_delete = []
-            for script in scripts_collection.find({}):
-                script_blog_id = script.get('blog_url_id')
-                if script_blog_id:
-                    # Check if it matches the blog ObjectId
-                    if script_blog_id == blog_object_id:
-                        scripts_to_delete.append(script.get('_id'))
-                    # Also check if it's a hash match
-                    elif isinstance(script_blog_id, (int, str)):
-                        try:
-                            script_hash = int(script_blog_id)
-                            blog_hash = _get_consistent_id_hash(blog_object_id)
-                            if script_hash == blog_hash:
-                                scripts_to_delete.append(script.get('_id'))
-                        except:
-                            pass
-            
-            # Delete scripts and their related data
             videos_collection = db['videos']
             social_posts_collection = db['social_media_posts']
             
-            for script_id in scripts_to_delete:
-                # Find all videos for this script (script_id might be stored as ObjectId or hash)
-                videos_to_delete = []
-                for video in videos_collection.find({}):
-                    video_script_id = video.get('script_id')
-                    if video_script_id:
-                        # Check if it matches the script ObjectId
-                        if video_script_id == script_id:
-                            videos_to_delete.append(video.get('_id'))
-                        # Also check if it's a hash match
-                        elif isinstance(video_script_id, (int, str)):
-                            try:
-                                video_script_hash = int(video_script_id)
-                                script_hash = _get_consistent_id_hash(script_id)
-                                if video_script_hash == script_hash:
-                                    videos_to_delete.append(video.get('_id'))
-                            except:
-                                pass
-                
-                # Delete social media posts for these videos
-                for video_id in videos_to_delete:
-                    social_posts_collection.delete_many({'video_id': video_id})
-                
-                # Delete videos
-                for video_id in videos_to_delete:
-                    videos_collection.delete_one({'_id': video_id})
+            # Find all scripts for this blog (blog_url_id might be stored as hash or ObjectId)
+            # using the blog_url_id index instead of scanning every script
+            scripts_to_delete = [
+                script['_id'] for script in scripts_collection.find(
+                    {'blog_url_id': {'$in': _id_reference_values(blog_object_id)}}, {'_id': 1}
+                )
+            ]
+            
+            if scripts_to_delete:
+                # Find all videos for these scripts (script_id might be stored as ObjectId or hash)
+                script_references = [value for script_id in scripts_to_delete for value in _id_reference_values(script_id)]
+                videos_to_delete = [
+                    video['_id'] for video in videos_collection.find(
+                        {'script_id': {'$in': script_references}}, {'_id': 1}
+                    )
+                ]
                 
-                # Delete the script
-                scripts_collection.delete_one({'_id': script_id})
+                # Delete social media posts, videos and scripts with one indexed delete each
+                if videos_to_delete:
+                    social_posts_collection.delete_many({'video_id': {'$in': videos_to_delete}}, session=_current_session())
+                    videos_collection.delete_many({'_id': {'$in': videos_to_delete}}, session=_current_session())
+                scripts_collection.delete_many({'_id': {'$in': scripts_to_delete}}, session=_current_session())
         
         # Execute delete
         if not filter_dict:
@@ -727,7 +881,7 @@ def execute_update(query: str, params: tuple = ()) -> int:
             return 0
         
         try:
-            result = collection.delete_many(filter_dict)
+            result = collection.delete_many(filter_dict, session=_current_session())
             deleted_count = result.deleted_count
             if deleted_count == 0:
                 print(f"Warning: Delete operation found 0 documents to delete. Filter: {filter_dict}")
@@ -740,29 +894,23 @@ def execute_update(query: str, params: tuple = ()) -> int:
     else:
         raise ValueError(f"Unsupported query type: {query}")
 
-def execute_insert(query: str, params: tuple = ()) -> int:
-    """Execute INSERT query and return last inserted row id"""
-    db = get_db_connection()
-    
-    # Parse INSERT query
-    query = query.strip()
-    
+def _parse_insert(query: str):
+    """Parse INSERT query into (collection_name, columns)"""
     # Extract table name
     table_match = re.search(r'INSERT\s+INTO\s+(\w+)', query, re.IGNORECASE)
     if not table_match:
         raise ValueError(f"Could not parse table name from INSERT query: {query}")
     
-    collection_name = table_match.group(1)
-    collection = db[collection_name]
-    
     # Parse column names
     columns_match = re.search(r'\(([^)]+)\)', query)
     if not columns_match:
         raise ValueError(f"Could not parse columns from INSERT query: {query}")
     
     columns = [col.strip() for col in columns_match.group(1).split(',')]
-    
-    # Build document
+    return table_match.group(1), columns
+
+def _build_insert_doc(columns: List[str], params: tuple) -> Dict[str, Any]:
+    """Build MongoDB document from INSERT columns and params"""
     doc = {}
     for i, col in enumerate(columns):
         if i < len(params):
@@ -791,12 +939,222 @@ def execute_insert(query: str, params: tuple = ()) -> int:
     if 'updated_at' not in doc:
         doc['updated_at'] = datetime.now()
     
-    # Insert document
-    result = collection.insert_one(doc)
-    
-    # Return a numeric ID for backward compatibility using consistent hash
-    inserted_id = result.inserted_id
+    # Assign the ObjectId up front so its hash can be stored for indexed lookups
+    if '_id' not in doc:
+        doc['_id'] = ObjectId()
+    doc['_hash_id'] = _get_consistent_id_hash(doc['_id'])
+    return doc
+
+def _to_legacy_id(inserted_id) -> int:
+    """Return a numeric ID for backward compatibility using consistent hash"""
     if isinstance(inserted_id, ObjectId):
         # Convert ObjectId to int using consistent hash
         return _get_consistent_id_hash(inserted_id)
     return int(inserted_id) if isinstance(inserted_id, int) else _get_consistent_id_hash(inserted_id)
+
+@_bumps_write_version
+def execute_insert(query: str, params: tuple = ()) -> int:
+    """Execute INSERT query and return last inserted row id"""
+    db = get_db_connection()
+    
+    # Parse INSERT query
+    query = query.strip()
+    collection_name, columns = _parse_insert(query)
+    collection = db[collection_name]
+    
+    # Insert document
+    doc = _build_insert_doc(columns, params)
+    result = collection.insert_one(doc, session=_current_session())
+    if isinstance(result.inserted_id, ObjectId):
+        _objectid_cache[(collection_name, doc['_hash_id'])] = result.inserted_id
+    return _to_legacy_id(result.inserted_id)
+
+@_bumps_write_version
+def execute_many(query: str, params_list: List[tuple]) -> List[int]:
+    """
+    Execute an INSERT query once per params tuple in a single round trip.
+    Returns the inserted row ids in input order.
+    """
+    if not params_list:
+        return []
+    
+    db = get_db_connection()
+    
+    query = query.strip()
+    if not query.upper().startswith('INSERT'):
+        raise ValueError(f"Unsupported query type for execute_many: {query}")
+    
+    collection_name, columns = _parse_insert(query)
+    collection = db[collection_name]
+    
+    docs = [_build_insert_doc(columns, params) for params in params_list]
+    result = collection.insert_many(docs, ordered=False, session=_current_session())
+    return [_to_legacy_id(inserted_id) for inserted_id in result.inserted_ids]
+
+@_bumps_write_version
+def execute_update_many(query: str, params_list: List[tuple]) -> int:
+    """
+    Execute an UPDATE query once per params tuple as a single bulk write.
+    Returns the total number of modified rows.
+    """
+    if not params_list:
+        return 0
+    
+    db = get_db_connection()
+    
+    query = query.strip()
+    if not query.upper().startswith('UPDATE'):
+        raise ValueError(f"Unsupported query type for execute_update_many: {query}")
+    
+    collection = None
+    operations = []
+    for params in params_list:
+        collection, filter_dict, update_doc = _build_update(db, query, params)
+        if filter_dict is not None:
+            operations.append(UpdateMany(filter_dict, update_doc))
+    
+    if not operations:
+        return 0
+    result = collection.bulk_write(operations, ordered=False, session=_current_session())
+    return result.modified_count
+
+@contextmanager
+def batch():
+    """
+    Collect UPDATE statements and write them together when the block exits.
+    Yields a list to append (query, params) tuples to; statements with the same
+    SQL text go out as one bulk write, all inside one transaction. Queued
+    updates are written even if the block raises, so finished work is kept.
+    """
+    pending: List[tuple] = []
+    try:
+        yield pending
+    finally:
+        grouped: Dict[str, List[tuple]] = {}
+        for query, params in pending:
+            grouped.setdefault(query.strip(), []).append(params)
+        if grouped:
+            with transaction():
+                for query, params_list in grouped.items():
+                    execute_update_many(query, params_list)
+
+class DbWriterActor:
+    """
+    Background writer that owns the inserts for one unit of work.
+    The caller enqueues (query, params) and the writer thread batches them
+    into execute_many calls, flushing every max_batch rows or max_wait seconds.
+    Each statement's rows go out in one transaction; if a row is rejected the
+    rows are retried one by one, so only the bad rows are lost (and reported).
+    Use as a context manager; leaving the block flushes and stops the thread.
+    """
+    
+    def __init__(self, max_batch: int = 500, max_wait: float = 0.05):
+        self._queue = queue.Queue()
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._lock = threading.Lock()
+        self._written = 0
+        self._errors = []
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, tb):
+        # Finish the queued rows; errors not collected with flush() are reported, never raised
+        self._stop()
+        for error in self._take_errors():
+            print(f"Error in background database writer: {error}")
+        return False
+    
+    def submit(self, query: str, params: tuple):
+        """Queue an INSERT for the writer thread"""
+        self._queue.put((query.strip(), params))
+    
+    def flush(self) -> tuple:
+        """
+        Wait until every queued row is written.
+        Returns (rows written, write errors) since the last flush; rejected rows don't stop the others.
+        """
+        self._queue.join()
+        with self._lock:
+            written, self._written = self._written, 0
+        return written, self._take_errors()
+    
+    def close(self) -> tuple:
+        """Flush pending rows and stop the writer thread"""
+        try:
+            return self.flush()
+        finally:
+            self._stop()
+    
+    def _stop(self):
+        self._queue.put(None)
+        self._thread.join()
+    
+    def _take_errors(self) -> list:
+        with self._lock:
+            errors, self._errors = self._errors, []
+        return errors
+    
+    def _drain(self) -> List[Optional[tuple]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self._max_wait
+        while batch[-1] is not None and len(batch) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _write(self, query: str, params_list: List[tuple]) -> int:
+        """Insert one statement's rows; a rejected row only loses itself. Returns rows written."""
+        in_transaction = False
+        try:
+            with transaction() as session:
+                in_transaction = session is not None
+                return len(execute_many(query, params_list))
+        except BulkWriteError as e:
+            if not in_transaction:
+                # Unordered insert_many outside a transaction already kept the good rows
+                with self._lock:
+                    self._errors.append(e)
+                return e.details.get('nInserted', 0)
+        
+        # The transaction rolled every row back - insert them one at a time
+        written = 0
+        for params in params_list:
+            try:
+                execute_insert(query, params)
+                written += 1
+            except Exception as e:
+                with self._lock:
+                    self._errors.append(e)
+        return written
+    
+    def _run(self):
+        while True:
+            batch = self._drain()
+            try:
+                # Group by query so each statement goes out as one insert_many
+                grouped: Dict[str, List[tuple]] = {}
+                for item in batch:
+                    if item is not None:
+                        grouped.setdefault(item[0], []).append(item[1])
+                for query, params_list in grouped.items():
+                    written = self._write(query, params_list)
+                    with self._lock:
+                        self._written += written
+            except Exception as e:
+                print(f"Error in background database writer: {e}")
+                with self._lock:
+                    self._errors.append(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if batch[-1] is None:
+                return
@@ -5,14 +5,16 @@ Upload blog URL and generate 5 scripts using ChatGPT
 
 import streamlit as st
 import json
+import logging
 import os
 from datetime import datetime
 import database.db_setup as db
 
-def generate_single_script_with_chatgpt(blog_url, master_prompt, category_name, script_number):
-    """Generate a single script for a specific category using ChatGPT API
-    Returns: (script_content, error_message, token_usage_dict)
-    Uses OpenAI Python SDK (same as generate_all_scripts_single_call)
+logger = logging.getLogger(__name__)
+
+def _request_script(full_prompt, label, max_tokens=4000, json_output=False):
+    """Send a script prompt to ChatGPT, retrying on rate limits and transient errors
+    Returns: (content, error_message, token_usage_dict); label names the request in messages
     """
     try:
         # Get OpenAI API key from backend config
@@ -22,11 +24,8 @@ def generate_single_script_with_chatgpt(blog_url, master_prompt, category_name,
         import config
         
         # Import OpenAI SDK
-        try:
-            from openai import OpenAI
-            OPENAI_SDK_AVAILABLE = True
-        except ImportError:
-            OPENAI_SDK_AVAILABLE = False
+        from utils.script_generator import OPENAI_SDK_AVAILABLE, get_openai_client, wait_for_openai_slot
+        if not OPENAI_SDK_AVAILABLE:
             return None, "OpenAI Python SDK not installed. Please install it with: pip install openai", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
         
         api_key = config.get_openai_api_key()
@@ -38,74 +37,24 @@ def generate_single_script_with_chatgpt(blog_url, master_prompt, category_name,
         if not api_key.startswith('sk-'):
             return None, f"Invalid OpenAI API key format. API key should start with 'sk-'. Please check your API key in Settings.", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
         
-        # Initialize OpenAI client
-        # Handle potential proxy or compatibility issues
-        try:
-            client = OpenAI(api_key=api_key)
-        except TypeError as e:
-            # If there's a compatibility issue, try without any extra parameters
-            if 'proxies' in str(e) or 'unexpected keyword argument' in str(e):
-                # Try creating client with minimal parameters
-                import os
-                # Temporarily clear proxy-related environment variables that might cause issues
-                old_proxy_vars = {}
-                proxy_vars = ['HTTP_PROXY', 'HTTPS_PROXY', 'http_proxy', 'https_proxy', 'ALL_PROXY', 'all_proxy']
-                for var in proxy_vars:
-                    if var in os.environ:
-                        old_proxy_vars[var] = os.environ[var]
-                        del os.environ[var]
-                
-                try:
-                    client = OpenAI(api_key=api_key)
-                finally:
-                    # Restore proxy environment variables
-                    for var, value in old_proxy_vars.items():
-                        os.environ[var] = value
-            else:
-                raise
-        
-        # Prepare the prompt for a single script
-        full_prompt = f"""
-{master_prompt}
-
-Blog URL: {blog_url}
-
-Generate ONE video script for the "{category_name}" category based on the content from this blog URL.
-The script should be formatted according to the output format specified in the master prompt.
-
-CRITICAL REQUIREMENT:
-- This script must be for the "{category_name}" category ONLY
-- Generate the COMPLETE script with ALL required fields and sections, including:
-  * Title
-  * Caption
-  * Short Description
-  * HeyGen Setup
-  * Avatar & Visual Style Rules
-  * Script
-  * Category
-  * Keyword Selection
-  * Additional Guidelines (if specified in the master prompt)
-- Do NOT truncate or omit any sections
-- Do NOT include any other categories or scripts in your response
-- Return ONLY the complete script for "{category_name}" category
-
-The script must be complete with ALL sections and ready to use.
-"""
+        # Shared client - reuses pooled connections across scripts and retries
+        client = get_openai_client(api_key)
         
         # Get model from config (user can change it in Settings)
         model_name = config.get_openai_model()
         
-        print(f"[DEBUG] Using model: {model_name} for {category_name} script")
+        logger.debug("Using model: %s for %s script", model_name, label)
         
         # Retry logic with exponential backoff and rate limit handling
         max_retries = 2  # Reduced from 3 to 2 for faster failure detection
         timeout_seconds = 90  # Reduced from 120 to 90 seconds for faster timeout
+        import random
         import time
         
         for attempt in range(max_retries):
             try:
                 # Log attempt
-                print(f"[DEBUG] Attempting to generate {category_name} script (attempt {attempt + 1}/{max_retries})")
+                logger.debug("Attempting to generate %s script (attempt %d/%d)", label, attempt + 1, max_retries)
                 
                 # Use standard chat completions API for all models (including GPT-5)
                 # No reasoning parameters - using standard API only for faster, more reliable responses
@@ -113,7 +62,7 @@ The script must be complete with ALL sections and ready to use.
                 token_usage = {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
                 
                 # Use standard chat completions API
-                print(f"[DEBUG] Using standard chat completions API (no reasoning)")
+                logger.debug("Using standard chat completions API (no reasoning)")
                 
                 # GPT-5 only supports default temperature (1), not custom values
                 # No reasoning parameters - using standard API only
@@ -123,7 +72,7 @@ The script must be complete with ALL sections and ready to use.
                         {"role": "system", "content": "You are a professional video script writer. Generate complete, well-formatted scripts with ALL sections including Additional Guidelines."},
                         {"role": "user", "content": full_prompt}
                     ],
-                    "max_tokens": 4000
+                    "max_tokens": max_tokens
                     # Timeout is set at client initialization level
                     # Note: No reasoning parameters (effort, summary, etc.) - using standard API
                 }
@@ -131,7 +80,10 @@ The script must be complete with ALL sections and ready to use.
                 # Only add temperature if not GPT-5 (GPT-5 only supports default value of 1)
                 if not model_name.startswith("gpt-5"):
                     api_params["temperature"] = 0.7
+                if json_output:
+                    api_params["response_format"] = {"type": "json_object"}
                 
+                wait_for_openai_slot()
                 response = client.chat.completions.create(**api_params)
                 
                 # Extract content from standard API response
@@ -148,12 +100,12 @@ The script must be complete with ALL sections and ready to use.
                     return None, "No choices in API response", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
                 
                 if content:
-                    print(f"[DEBUG] Token usage for {category_name}: Input={token_usage['input_tokens']}, Output={token_usage['output_tokens']}, Total={token_usage['total_tokens']}")
+                    logger.debug("Token usage for %s: Input=%s, Output=%s, Total=%s", label, token_usage['input_tokens'], token_usage['output_tokens'], token_usage['total_tokens'])
                     return content.strip(), None, token_usage
                 else:
                     if attempt < max_retries - 1:
                         wait_time = (2 ** attempt) * 10
-                        print(f"[DEBUG] No content received, waiting {wait_time} seconds before retry")
+                        logger.debug("No content received, waiting %s seconds before retry", wait_time)
                         time.sleep(wait_time)
                         continue
                     else:
@@ -195,11 +147,11 @@ The script must be complete with ALL sections and ready to use.
                         except:
                             pass
                 except Exception as e:
-                    print(f"[DEBUG] Error extracting status code: {str(e)}")
+                    logger.debug("Error extracting status code: %s", e)
                 
-                print(f"[DEBUG] API error: {error_type} - {error_msg}")
+                logger.debug("API error: %s - %s", error_type, error_msg)
                 if status_code:
-                    print(f"[DEBUG] API response status: {status_code}")
+                    logger.debug("API response status: %s", status_code)
                 else:
                     # Check error message for common error patterns
                     error_msg_lower = error_msg.lower()
@@ -213,52 +165,135 @@ The script must be complete with ALL sections and ready to use.
                         status_code = 403
                     elif '400' in error_msg or 'bad request' in error_msg_lower or 'invalid' in error_msg_lower:
                         status_code = 400
-                    print(f"[DEBUG] Detected status code from error message: {status_code}")
+                    logger.debug("Detected status code from error message: %s", status_code)
                 
                 # Handle rate limits
                 if status_code == 429:
                     if attempt < max_retries - 1:
-                        wait_time = 30 + (attempt * 15)  # Reduced: 30s, 45s (was 60s, 90s, 120s)
-                        print(f"[DEBUG] Rate limit hit, waiting {wait_time} seconds before retry")
+                        # 30s, 45s plus jitter so concurrent retries don't all resume together
+                        wait_time = 30 + (attempt * 15) + random.uniform(0, 5)
+                        logger.debug("Rate limit hit, waiting %.0f seconds before retry", wait_time)
                         time.sleep(wait_time)
                         continue
                     else:
-                        return None, f"Rate limit exceeded for {category_name} script. Please wait a few minutes and try again, or upgrade your OpenAI account for higher rate limits.", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
+                        return None, f"Rate limit exceeded for {label} script. Please wait a few minutes and try again, or upgrade your OpenAI account for higher rate limits.", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
                 
                 # Handle invalid model
                 elif status_code == 400:
                     if 'model' in error_msg.lower() or 'invalid' in error_msg.lower():
-                        return None, f"Invalid model '{model_name}' for {category_name} script. Error: {error_msg}. Please check your model selection in Settings → OpenAI Model and try a valid model.", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
+                        return None, f"Invalid model '{model_name}' for {label} script. Error: {error_msg}. Please check your model selection in Settings → OpenAI Model and try a valid model.", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
                     else:
-                        return None, f"Bad Request (400) for {category_name} script: {error_msg}", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
+                        return None, f"Bad Request (400) for {label} script: {error_msg}", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
                 
                 # Handle unauthorized
                 elif status_code == 401:
-                    return None, f"Invalid API key for {category_name} script. Please check your OpenAI API key in Settings → API Keys.", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
+                    return None, f"Invalid API key for {label} script. Please check your OpenAI API key in Settings → API Keys.", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
                 
                 # Handle payment required
                 elif status_code == 402:
-                    return None, f"Payment required for {category_name} script. Please check your OpenAI account billing and add credits.", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
+                    return None, f"Payment required for {label} script. Please check your OpenAI account billing and add credits.", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
                 
                 # Handle forbidden
                 elif status_code == 403:
-                    return None, f"API key doesn't have access for {category_name} script. Please check your OpenAI API key permissions.", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
+                    return None, f"API key doesn't have access for {label} script. Please check your OpenAI API key permissions.", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
                 
                 # Handle other errors
                 else:
                     if attempt < max_retries - 1:
                         wait_time = (2 ** attempt) * 5  # Reduced from 10 to 5 seconds
-                        print(f"[DEBUG] Error, waiting {wait_time} seconds before retry")
+                        logger.debug("Error, waiting %s seconds before retry", wait_time)
                         time.sleep(wait_time)
                         continue
                     else:
-                        return None, f"API Error for {category_name} script: {error_msg}", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
+                        return None, f"API Error for {label} script: {error_msg}", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
         
-        return None, f"Failed to generate {category_name} script after {max_retries} retries.", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
+        return None, f"Failed to generate {label} script after {max_retries} retries.", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
             
     except Exception as e:
-        print(f"[DEBUG] Outer exception in generate_single_script_with_chatgpt: {str(e)}")
-        return None, f"Error generating {category_name} script: {str(e)}", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
+        logger.debug("Outer exception in _request_script: %s", e)
+        return None, f"Error generating {label} script: {str(e)}", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
+
+def generate_single_script_with_chatgpt(blog_url, master_prompt, category_name, script_number):
+    """Generate a single script for a specific category using ChatGPT API
+    Returns: (script_content, error_message, token_usage_dict)
+    Uses OpenAI Python SDK (same as generate_all_scripts_single_call)
+    """
+    # Prepare the prompt for a single script
+    full_prompt = f"""
+{master_prompt}
+
+Blog URL: {blog_url}
+
+Generate ONE video script for the "{category_name}" category based on the content from this blog URL.
+The script should be formatted according to the output format specified in the master prompt.
+
+CRITICAL REQUIREMENT:
+- This script must be for the "{category_name}" category ONLY
+- Generate the COMPLETE script with ALL required fields and sections, including:
+  * Title
+  * Caption
+  * Short Description
+  * HeyGen Setup
+  * Avatar & Visual Style Rules
+  * Script
+  * Category
+  * Keyword Selection
+  * Additional Guidelines (if specified in the master prompt)
+- Do NOT truncate or omit any sections
+- Do NOT include any other categories or scripts in your response
+- Return ONLY the complete script for "{category_name}" category
+
+The script must be complete with ALL sections and ready to use.
+"""
+    
+    return _request_script(full_prompt, category_name)
+
+def generate_scripts_for_categories_with_chatgpt(blog_url, master_prompt, categories):
+    """Generate one script per category in a single ChatGPT request
+    The master prompt and blog are sent once for the whole batch; keep categories short
+    (a few entries) so every script fits in the response.
+    Returns: (list of script_content in category order, error_message, token_usage_dict)
+    """
+    category_list = ', '.join(f'"{category}"' for category in categories)
+    full_prompt = f"""
+{master_prompt}
+
+Blog URL: {blog_url}
+
+Generate {len(categories)} video scripts based on the content from this blog URL, one for each of these categories, in this order: [{category_list}].
+Each script should be formatted according to the output format specified in the master prompt.
+
+CRITICAL REQUIREMENT:
+- Return a JSON object: {{"videos": [{{"category": "...", "script": "..."}}, ...]}}
+- "videos" must contain exactly {len(categories)} objects, in the category order given above
+- Each "script" is the COMPLETE script text for its category with ALL required sections
+  (Title, Caption, Short Description, HeyGen Setup, Avatar & Visual Style Rules, Script,
+  Category, Keyword Selection, Additional Guidelines if specified in the master prompt)
+- Do NOT truncate or omit any sections
+"""
+    
+    label = ', '.join(str(category) for category in categories)
+    content, error, token_usage = _request_script(
+        full_prompt, label, max_tokens=4000 * len(categories), json_output=True
+    )
+    if error or not content:
+        return None, error or "No content received from API response", token_usage
+    
+    from utils.script_generator import loads_json
+    try:
+        videos = loads_json(content).get('videos') or []
+    except (ValueError, AttributeError) as e:
+        return None, f"Could not parse response for {label} scripts: {str(e)}", token_usage
+    if len(videos) != len(categories):
+        return None, f"Expected {len(categories)} scripts for {label}, received {len(videos)}", token_usage
+    
+    # Scripts are matched to categories by position, so the echoed categories must line up
+    returned = [str(video.get('category') or '').strip().lower() if isinstance(video, dict) else '' for video in videos]
+    if returned != [str(category).strip().lower() for category in categories]:
+        return None, f"Scripts for {label} came back out of order or for other categories", token_usage
+    
+    scripts = [str(video.get('script') or '').strip() for video in videos]
+    return scripts, None, token_usage
 
 def generate_scripts_with_chatgpt(blog_url, master_prompt):
     """Generate 5 scripts separately using ChatGPT API - one API call per category"""
@@ -5,20 +5,378 @@ Simplified page for generating and viewing scripts
 
 import streamlit as st
 import database.db_setup as db
-from datetime import datetime
+from datetime import datetime, timedelta
 import pandas as pd
 import re
 import json
 import os
+import shutil
+import string
 import sys
+import tempfile
+import atexit
+import functools
+import io
+import logging
+import time
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter, defaultdict
 
 # Add parent directory to path to import config
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
+from utils.cost_calculator import calculate_cost, format_cost
+from utils.script_generator import loads_json
+from utils.video_frame_extractor import extract_frames_from_video
+from PIL import Image
 
-def upload_to_storage(file_bytes: bytes, filename: str, resource_type: str = 'video', public_id: str = None):
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - fall back to the standard library serializer
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+@functools.lru_cache(maxsize=8)
+def _ensure_dir(path: str) -> str:
+    """Create a directory once per process and return its path"""
+    os.makedirs(path, exist_ok=True)
+    return path
+
+# Public id of a Cloudinary delivery URL, and a trailing file extension
+_CLOUDINARY_RE = re.compile(r'res\.cloudinary\.com/[^/]+/(?:video|image)/upload/(?:v\d+/)?(.+?)(?:\.[^.]+)?$')
+_EXT_RE = re.compile(r'\.[^.]+$')
+# Derived assets (e.g. a so_<offset> video frame) carry a transformation segment after /upload/
+_DERIVED_RE = re.compile(r'/upload/(?:[a-z]{1,3}_[^/]+/)+')
+
+# Local storage for uploads when Cloudinary is not configured (created on first use via _ensure_dir)
+_UPLOADS_VIDEOS_DIR = os.path.join(os.getcwd(), "uploads", "videos")
+_UPLOADS_THUMBNAILS_DIR = os.path.join(os.getcwd(), "uploads", "thumbnails")
+
+# A blog still 'processing' this long after creation is treated as stuck
+_STUCK_PROCESSING_MINUTES = 5
+
+# Failed scripts regenerated at once by "Retry All Failed" (kept low to stay under OpenAI rate limits)
+_RETRY_CONCURRENCY = 3
+
+# Failed scripts of one blog regenerated per request (4 x 4000 output tokens fits the model's output limit)
+_RETRY_BATCH_SIZE = 4
+
+# Read timeout for a streamed regeneration: this long without a new chunk abandons it
+_STREAM_STALL_SECONDS = 30
+
+# Streamed chunks between progress updates while regenerating
+_STREAM_PROGRESS_EVERY = 50
+
+# Appended to the master prompt when regenerating one script; $category is the script's category
+_SINGLE_SCRIPT_SUFFIX = string.Template("""
+
+IMPORTANT: Generate ONLY ONE video script for the "$category" category.
+Return a JSON object with a "videos" array containing exactly ONE video object with the following structure:
+{
+  "videos": [
+    {
+      "category": "$category",
+      "title": "...",
+      "caption": "...",
+      "description": "...",
+      "short_description": "...",
+      "keywords": ["...", "..."],
+      "heygen_setup": {...},
+      "avatar_visual_style": {...},
+      "script": "..."
+    }
+  ]
+}
+
+The video object must be for the "$category" category ONLY.""")
+
+# Categories expected from the master prompt, in order (used if a script has no category)
+_DEFAULT_CATEGORY_NAMES = ("How-To", "Common Mistake", "Pro Tip", "Myth-Busting", "Mini Makeover")
+
+# Accepted key variations for each script field in the API response, in priority order
+_FIELD_ALIASES = {
+    'title': ('title', 'Title'),
+    'caption': ('caption', 'Caption'),
+    'description': ('short_description', 'description', 'Description', 'Short Description'),
+    'script': ('script', 'Script', 'content', 'Content', 'text', 'Text'),
+}
+
+def _first(video, keys, default=''):
+    """Return the first non-empty value among keys, stripped"""
+    value = next((video[k] for k in keys if video.get(k)), default)
+    return (value if isinstance(value, str) else str(value)).strip()
+
+def _dumps_compact(obj) -> str:
+    """Serialize to compact JSON for storage"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+# Full script row as saved by generation (success and failure paths)
+_SCRIPT_INSERT_SQL = """
+    INSERT INTO scripts (
+        blog_url_id, script_number, script_content,
+        title, caption, category,
+        youtube_title, youtube_description, youtube_keywords,
+        status, error, video_url,
+        input_tokens, output_tokens, total_tokens,
+        input_cost, output_cost, total_cost
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _insert_script_row(writer, blog_id, script_number, script_content, category, status, error=None,
+                       title=None, caption=None, youtube_title=None, youtube_description=None,
+                       youtube_keywords=None, video_url=None, tokens=(0, 0, 0), costs=(0.0, 0.0, 0.0)):
+    """Queue one scripts row on a DbWriterActor. Per-script tokens and cost default to zero (only blog totals are known)."""
+    writer.submit(_SCRIPT_INSERT_SQL, (
+        blog_id, script_number, script_content,
+        title, caption, category,
+        youtube_title, youtube_description, youtube_keywords,
+        status, error, video_url,
+        *tokens, *costs
+    ))
+
+# Token usage, cost and status for a blog after generation
+_BLOG_URL_UPDATE_SQL = """
+    UPDATE blog_urls
+    SET input_tokens = ?,
+        output_tokens = ?,
+        total_tokens = ?,
+        input_cost = ?,
+        output_cost = ?,
+        total_cost = ?,
+        status = ?,
+        notes = ?,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+# Delete-video cascade: the video's posts and rows, then clear the script's file paths
+_POSTS_DELETE_SQL = "DELETE FROM social_media_posts WHERE video_id IN ({placeholders})"
+_VIDEOS_DELETE_SQL = "DELETE FROM videos WHERE id IN ({placeholders})"
+_SCRIPT_VIDEO_RESET_SQL = """
+    UPDATE scripts
+    SET video_file_path = NULL,
+        thumbnail_file_path = NULL,
+        upload_status = 'not_uploaded',
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id IN (?, ?)
+"""
+
+# Script rewrites queued by retry_all_failed_scripts
+_SCRIPT_RETRY_FAILED_SQL = """
+    UPDATE scripts
+    SET script_content = ?,
+        status = 'failed',
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+_SCRIPT_RETRY_COMPLETED_SQL = """
+    UPDATE scripts
+    SET script_content = ?,
+        youtube_title = ?,
+        youtube_description = ?,
+        youtube_keywords = ?,
+        status = 'completed',
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+@functools.lru_cache(maxsize=32)
+def _update_sql(columns: tuple, where: str = "id = ?") -> str:
+    """UPDATE scripts for a fixed set of columns, built once per shape; updated_at is always stamped"""
+    assignments = "".join(f"{column} = ?,\n        " for column in columns)
+    return f"""
+    UPDATE scripts
+    SET {assignments}updated_at = CURRENT_TIMESTAMP
+    WHERE {where}
+"""
+
+# Script status badge for (status, 'uploaded' or None): the element to render it with and its label
+_STATUS_LABELS = MappingProxyType({
+    ('completed', 'uploaded'): (st.success, "✅ Video Uploaded"),
+    ('completed', None): (st.success, "✅ Script Generated"),
+    ('failed', None): (st.error, "❌ Script Failed"),
+    ('pending', None): (st.info, "⏳ Generating..."),
+})
+
+# Script JSON template for scripts the API did not produce (read-only; copy with dict() to modify)
+_EMPTY_SCRIPT_JSON = MappingProxyType({
+    "title": "",
+    "caption": "",
+    "short_description": "",
+    "heygen_setup": {},
+    "avatar_visual_style": {},
+    "script": "",
+    "keywords": []
+})
+_EMPTY_SCRIPT_CONTENT = _dumps_compact(dict(_EMPTY_SCRIPT_JSON))
+
+def format_script_for_display(script_content):
+    """Pretty-print stored script JSON for reading; non-JSON content is returned unchanged"""
+    try:
+        if orjson is not None:
+            return orjson.dumps(orjson.loads(script_content), option=orjson.OPT_INDENT_2).decode()
+        return json.dumps(json.loads(script_content), indent=2, ensure_ascii=False)
+    except (ValueError, TypeError):
+        return script_content
+
+@st.cache_data(max_entries=2048, show_spinner=False)
+def _script_display_text(script_id, updated_at):
+    """Pretty-printed script body, read when the script is first opened and cached on (id, updated_at); '' if empty"""
+    rows = db.execute_query("SELECT script_content FROM scripts WHERE id = ? LIMIT 1", (script_id,), project=True)
+    script_content = rows[0].get('script_content') if rows else None
+    if not script_content or script_content == 'N/A':
+        return ''
+    return format_script_for_display(script_content)
+
+@st.cache_data(ttl=600, show_spinner=False, max_entries=64)
+def _fetch_article_text(url):
+    """Article text for a blog URL, cached briefly so repeat regenerations skip the fetch"""
+    from utils.article_fetcher import fetch_article_text
+    return fetch_article_text(url)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _frame_thumbnail(path, mtime):
+    """Small JPEG preview of an extracted frame, decoded once per (path, mtime)"""
+    with Image.open(path) as img:
+        img.thumbnail((320, 180))
+        buf = io.BytesIO()
+        img.convert('RGB').save(buf, 'JPEG', quality=80)
+    return buf.getvalue()
+
+def _frame_timestamp(frame_path, default):
+    """Timestamp label from an extracted frame's file name (format: frame_XXXXXX_TIMESTAMPs.jpg)"""
+    parts = os.path.basename(frame_path).split('_')
+    return parts[2].replace('s.jpg', '') if len(parts) >= 3 else default
+
+@functools.lru_cache(maxsize=4096)
+def _clean_path(path):
+    """Normalize a stored file path or URL; None, blank, 'None' and 'null' become ''"""
+    if not path:
+        return ''
+    path = str(path).strip()
+    return '' if path in ('None', 'null') else path
+
+@functools.lru_cache(maxsize=4096)
+def _file_name(path):
+    """File name shown for a stored video/thumbnail path or URL"""
+    return os.path.basename(path)
+
+@functools.lru_cache(maxsize=32)
+def _single_script_suffix(category_name):
+    """Regeneration instructions for a category, built once per category"""
+    return _SINGLE_SCRIPT_SUFFIX.substitute(category=category_name)
+
+def _set_session_flag(key, value):
+    """Button callback that stores a flag in session state before the rerun"""
+    st.session_state[key] = value
+
+def _ss_set(key, value, script_id):
+    """Set a per-script session key and index it so the script's state can be cleared without scanning all keys"""
+    st.session_state[key] = value
+    st.session_state.setdefault('_keys_by_script', {}).setdefault(script_id, set()).add(key)
+
+def _bulk_pop(keys):
+    """Remove several session keys in one pass; missing keys are ignored"""
+    for key in keys:
+        st.session_state.pop(key, None)
+
+def _clear_script_state(script_id, widget_keys=()):
+    """Drop every session key recorded for a script with _ss_set, plus the given widget keys (and its temp upload)"""
+    _discard_temp_upload(st.session_state.get(f"temp_video_path_{script_id}"))
+    _bulk_pop(st.session_state.get('_keys_by_script', {}).pop(script_id, set()).union(widget_keys))
+
+def _configure_cloudinary():
+    """Configure the Cloudinary SDK from the configured credentials; returns False when none are set"""
+    cloudinary_creds = config.get_cloudinary_credentials()
+    if not (cloudinary_creds and cloudinary_creds.get('cloud_name') and cloudinary_creds.get('api_key') and cloudinary_creds.get('api_secret')):
+        return False
+    from utils.cloudinary_storage import configure_cloudinary
+    configure_cloudinary(
+        cloudinary_creds['cloud_name'],
+        cloudinary_creds['api_key'],
+        cloudinary_creds['api_secret']
+    )
+    return True
+
+def _temp_dir_for(size: int) -> str:
+    """Directory for a short-lived temp file: /dev/shm if it can hold the file (plus extracted frames), else the OS temp dir"""
+    if os.path.isdir('/dev/shm'):
+        try:
+            if shutil.disk_usage('/dev/shm').free > 2 * size:
+                return '/dev/shm'
+        except OSError:
+            pass
+    return tempfile.gettempdir()
+
+def _remove_file(file_path: str):
+    """Delete a local file if it exists; failures are only reported"""
+    try:
+        os.remove(file_path)
+        print(f"[INFO] Deleted local file: {file_path}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[WARNING] Could not delete local file: {str(e)}")
+
+# Temp videos (and their extracted frames) still on disk; removed when replaced or cleared, or at exit
+_temp_uploads = set()
+
+def _discard_temp_upload(temp_video_path):
+    """Delete a temp upload video and the <stem>_frames directory extracted next to it"""
+    if not temp_video_path:
+        return
+    _temp_uploads.discard(temp_video_path)
+    _remove_file(temp_video_path)
+    stem = os.path.splitext(os.path.basename(temp_video_path))[0]
+    shutil.rmtree(os.path.join(os.path.dirname(temp_video_path), f"{stem}_frames"), ignore_errors=True)
+
+@atexit.register
+def _discard_all_temp_uploads():
+    for temp_video_path in list(_temp_uploads):
+        _discard_temp_upload(temp_video_path)
+
+def _delete_from_storage(file_path: str, cloudinary_ready: bool):
+    """
+    Delete a stored video/thumbnail: Cloudinary URLs are removed from Cloudinary
+    (the SDK must already be configured), anything else from local disk.
+    Safe to run from a worker thread - it does not touch st.session_state.
+    """
+    if not file_path:
+        return
+    
+    # Check if it's a Cloudinary URL
+    if 'res.cloudinary.com' in file_path:
+        if not cloudinary_ready:
+            return
+        if _DERIVED_RE.search(file_path):
+            # Rendered from the video on the fly - nothing of its own to destroy
+            return
+        try:
+            # Extract public_id from URL
+            match = _CLOUDINARY_RE.search(file_path)
+            if match:
+                public_id = _EXT_RE.sub('', match.group(1))
+                resource_type = 'video' if '/video/' in file_path else 'image'
+                from utils.cloudinary_storage import delete_file
+                delete_file(public_id, resource_type=resource_type)
+                print(f"[INFO] Deleted from Cloudinary: {public_id}")
+        except Exception as e:
+            print(f"[WARNING] Could not delete from Cloudinary: {str(e)}")
+    else:
+        # Local file - delete from disk
+        _remove_file(file_path)
+
+def upload_to_storage(file_bytes: bytes = None, filename: str = None, resource_type: str = 'video', public_id: str = None, file_path: str = None):
     """
     Upload file to Cloudinary if configured, otherwise save locally.
+    Pass either file_bytes or file_path; a file_path is streamed to Cloudinary
+    or moved into local storage rather than read into memory.
     Returns (storage_path, storage_type, cloudinary_url)
     - storage_path: Path/URL to the file
     - storage_type: 'cloudinary' or 'local'
@@ -29,24 +387,28 @@ def upload_to_storage(file_bytes: bytes, filename: str, resource_type: str = 'vi
     
     if cloudinary_creds and cloudinary_creds.get('cloud_name') and cloudinary_creds.get('api_key') and cloudinary_creds.get('api_secret'):
         try:
-            from utils.cloudinary_storage import configure_cloudinary, upload_file_from_bytes
+            from utils.cloudinary_storage import upload_file_from_bytes, upload_file_from_path
             
             # Configure Cloudinary
-            configure_cloudinary(
-                cloudinary_creds['cloud_name'],
-                cloudinary_creds['api_key'],
-                cloudinary_creds['api_secret']
-            )
+            _configure_cloudinary()
             
             # Upload to Cloudinary
             folder = "videos" if resource_type == 'video' else "thumbnails"
-            result = upload_file_from_bytes(
-                file_bytes,
-                filename,
-                resource_type=resource_type,
-                public_id=public_id,
-                folder=folder
-            )
+            if file_path:
+                result = upload_file_from_path(
+                    file_path,
+                    resource_type=resource_type,
+                    public_id=public_id,
+                    folder=folder
+                )
+            else:
+                result = upload_file_from_bytes(
+                    file_bytes,
+                    filename,
+                    resource_type=resource_type,
+                    public_id=public_id,
+                    folder=folder
+                )
             
             # Return Cloudinary URL
             cloudinary_url = result.get('secure_url') or result.get('url')
@@ -58,14 +420,745 @@ def upload_to_storage(file_bytes: bytes, filename: str, resource_type: str = 'vi
             # Fall through to local storage
     
     # Fallback to local storage
-    uploads_dir = os.path.join(os.getcwd(), "uploads", "videos" if resource_type == 'video' else "thumbnails")
-    os.makedirs(uploads_dir, exist_ok=True)
+    return _save_locally(file_bytes, filename, resource_type, file_path), 'local', None
+
+def _save_locally(file_bytes: bytes = None, filename: str = None, resource_type: str = 'video', file_path: str = None):
+    """Store a file under uploads/ (moving file_path into place if given) and return its path"""
+    uploads_dir = _ensure_dir(_UPLOADS_VIDEOS_DIR if resource_type == 'video' else _UPLOADS_THUMBNAILS_DIR)
     
     local_path = os.path.join(uploads_dir, filename)
-    with open(local_path, "wb") as f:
-        f.write(file_bytes)
+    if file_path:
+        # shutil.move falls back to copy + delete when file_path is on another filesystem (e.g. /dev/shm)
+        shutil.move(file_path, local_path)
+    else:
+        with open(local_path, "wb") as f:
+            f.write(file_bytes)
+    
+    return local_path
+
+def _upload_files_concurrently(uploads: dict):
+    """
+    Upload several files at once. uploads maps a label (e.g. 'video') to upload_to_storage kwargs.
+    Returns {label: (storage_path, storage_type, cloudinary_url)}.
+    With Cloudinary configured all uploads run as background futures and are collected as they
+    finish; a failed upload (or no Cloudinary) falls back to local storage.
+    """
+    try:
+        cloudinary_ready = _configure_cloudinary()
+    except Exception as e:
+        st.warning(f"⚠️ Cloudinary upload failed: {str(e)}. Falling back to local storage.")
+        cloudinary_ready = False
+    if not cloudinary_ready:
+        return {label: upload_to_storage(**kwargs) for label, kwargs in uploads.items()}
+    
+    from utils.cloudinary_storage import upload_large_async
+    
+    results = {}
+    with st.status(f"📤 Uploading {' & '.join(uploads)}...") as upload_status:
+        futures = {
+            upload_large_async(
+                kwargs.get('file_path') or kwargs.get('file_bytes'),
+                resource_type=kwargs['resource_type'],
+                folder="videos" if kwargs['resource_type'] == 'video' else "thumbnails"
+            ): label
+            for label, kwargs in uploads.items()
+        }
+        for future in as_completed(futures):
+            label = futures[future]
+            try:
+                result = future.result()
+                cloudinary_url = result.get('secure_url') or result.get('url')
+                results[label] = (cloudinary_url, 'cloudinary', cloudinary_url)
+                upload_status.write(f"✅ {label.capitalize()} uploaded")
+            except Exception as e:
+                st.warning(f"⚠️ Cloudinary upload failed: {str(e)}. Falling back to local storage.")
+                results[label] = (_save_locally(**uploads[label]), 'local', None)
+        upload_status.update(label="📤 Upload complete", state="complete")
+    
+    return results
+
+class ThrottledProgress:
+    """Progress bar plus status line that sends at most one update per interval to the frontend"""
+    
+    def __init__(self, bar, txt, interval=0.1):
+        self.bar = bar
+        self.txt = txt
+        self._interval = interval
+        self._last = float('-inf')
+    
+    def update(self, frac, text, force=False):
+        now = time.monotonic()
+        if not force and now - self._last < self._interval:
+            return
+        self.bar.progress(frac)
+        self.txt.text(text)
+        self._last = now
+
+def _ts_display(value):
+    """Timestamp as shown in the blog rows (ISO strings cut to seconds); '' when unset"""
+    if not value or value == 'N/A':
+        return ''
+    return value[:19] if isinstance(value, str) else str(value)
+
+def _usage_captions(blog):
+    """Token and cost caption lines for a blog row; () when no tokens were used"""
+    total_tokens = int(blog.get('total_tokens') or 0)
+    if total_tokens <= 0:
+        return ()
+    input_tokens = int(blog.get('input_tokens') or 0)
+    output_tokens = int(blog.get('output_tokens') or 0)
+    total_cost = float(blog.get('total_cost') or 0.0)
+    input_cost = float(blog.get('input_cost') or 0.0)
+    output_cost = float(blog.get('output_cost') or 0.0)
+    return (
+        f"💾 **Tokens:** Input: {input_tokens:,} | Output: {output_tokens:,} | Total: {total_tokens:,}",
+        f"💵 **Cost:** Total: {format_cost(total_cost)} | Input: {format_cost(input_cost)} | Output: {format_cost(output_cost)}",
+    )
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_blogs(version_tag):
+    """All blog URLs, newest first. version_tag is db.get_write_version(), so any write reloads the list."""
+    blogs = db.execute_query("""
+        SELECT id, _object_id, url, status, scripts_generated, created_at, updated_at, notes,
+               input_tokens, output_tokens, total_tokens,
+               input_cost, output_cost, total_cost
+        FROM blog_urls
+        ORDER BY updated_at DESC, created_at DESC
+    """)
+    for blog in blogs:
+        blog['_updated_display'] = _ts_display(blog.get('updated_at'))
+        blog['_created_display'] = _ts_display(blog.get('created_at'))
+        blog['_usage_captions'] = _usage_captions(blog)
+    return blogs
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_failed_counts(version_tag):
+    """Failed script count per blog id"""
+    return {
+        row['blog_url_id']: row['count']
+        for row in db.execute_query("""
+            SELECT blog_url_id, COUNT(*) as count FROM scripts
+            WHERE status = ?
+            GROUP BY blog_url_id
+        """, ('failed',))
+    }
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_stuck_blogs(version_tag):
+    """Blogs still 'processing' after _STUCK_PROCESSING_MINUTES; the TTL lets newly stuck blogs show up without a write"""
+    return db.execute_query("""
+        SELECT id, _object_id FROM blog_urls
+        WHERE status = ? AND created_at < ?
+    """, ('processing', datetime.now() - timedelta(minutes=_STUCK_PROCESSING_MINUTES)))
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_scripts_by_blog(version_tag):
+    """
+    All scripts in one query, bucketed by blog id and kept in script order.
+    Only the columns the rows render are read; the script body is loaded on open (_script_display_text).
+    """
+    scripts = db.execute_query("""
+        SELECT 
+            id, _object_id as script_object_id, blog_url_id, script_number,
+            title, category, 
+            youtube_title, youtube_description, youtube_keywords,
+            status, error,
+            video_file_path, thumbnail_file_path, upload_status,
+            created_at, updated_at
+        FROM scripts
+        ORDER BY blog_url_id ASC, script_number ASC
+    """, project=True)
+    by_blog = defaultdict(list)
+    for script in scripts:
+        # Overview timestamp, formatted once per load rather than on every rerun
+        script['_ts_display'] = str(script.get('updated_at') or script.get('created_at') or 'N/A')[:16]
+        by_blog[script.get('blog_url_id')].append(script)
+    return dict(by_blog)
+
+# st.fragment confines reruns triggered by a widget to that fragment (experimental_fragment before
+# Streamlit 1.37); on older versions blogs simply render as part of the full page
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+def _fail_blog(blog_id, error, progress_bar, status_text, persist_error=True, notes=None):
+    """
+    Mark a blog URL as failed, clear the progress widgets and rerun the page.
+    The error is kept in session state so it survives the rerun unless persist_error is False.
+    notes defaults to the error message.
+    """
+    if persist_error:
+        st.session_state.blog_errors[blog_id] = error
+    db.execute_update("""
+        UPDATE blog_urls 
+        SET status = 'failed', notes = ? 
+        WHERE id = ?
+    """, (notes if notes is not None else error, blog_id))
+    progress_bar.empty()
+    status_text.empty()
+    st.rerun()
+
+@_fragment
+def _render_blog(blog, scripts):
+    """Render one blog row and its script sub-rows (widget reruns stay inside this fragment)"""
+    blog_id = blog['id']
+    blog_url = blog['url']
+    blog_status = blog['status']
+    
+    # Debug: Log script count
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Blog %s: found %d scripts in database", blog_id, len(scripts))
+        for s in scripts:
+            logger.debug("  - Script %s: %s - Status: %s - Error: %s", s.get('script_number'), s.get('category'), s.get('status'), s.get('error'))
+    
+    # Main row for blog URL
+    st.markdown("---")
+    main_cols = st.columns([3.5, 1.5, 1.0])
+    
+    with main_cols[0]:
+        # Blog URL and status
+        st.markdown(f"**📄 [{blog_url}]({blog_url})**")
+        
+        # Status badge - tally script statuses in one pass
+        status_counts = Counter(s.get('status') for s in scripts)
+        completed_scripts = status_counts.get('completed', 0)
+        failed_scripts = status_counts.get('failed', 0)
+        if blog_status == 'completed':
+            # Use actual script count from the scripts list, not from the query
+            actual_script_count = len(scripts)
+            if actual_script_count > 0:
+                st.success(f"✅ Completed - {completed_scripts}/{actual_script_count} script(s) generated")
+            else:
+                st.success(f"✅ Completed - {completed_scripts} script(s) generated")
+        elif blog_status == 'processing':
+            st.info(f"🔄 Processing - Generating scripts...")
+        elif blog_status == 'failed':
+            st.error(f"❌ Failed - {failed_scripts} script(s) failed")
+            # Show notes if available
+            blog_notes = blog.get('notes')
+            if blog_notes:
+                st.caption(f"💡 {blog_notes}")
+        elif blog_status == 'partial':
+            st.warning(f"⚠️ Partial - {completed_scripts} succeeded, {failed_scripts} failed")
+        else:
+            st.text(f"Status: {blog_status}")
+        
+        # Token usage and cost breakdown (formatted when the blogs are loaded)
+        for usage_caption in blog['_usage_captions']:
+            st.caption(usage_caption)
+    
+    with main_cols[1]:
+        # Timestamps (formatted once when the blogs are loaded)
+        if blog['_updated_display']:
+            st.caption(f"**Updated:** {blog['_updated_display']}")
+        if blog['_created_display']:
+            st.caption(f"**Created:** {blog['_created_display']}")
+    
+    with main_cols[2]:
+        # Delete button for entire blog
+        if st.session_state.get('pending_delete_blog') == blog_id:
+            # Show confirm/cancel buttons
+            if st.button("✅ Confirm Delete", key=f"confirm_delete_blog_{blog_id}", use_container_width=True, type="primary"):
+                # Set delete_blog to trigger the handler
+                st.session_state.delete_blog = blog_id
+                st.session_state.pop('pending_delete_blog', None)
+                st.rerun()
+            if st.button("❌ Cancel", key=f"cancel_delete_blog_{blog_id}", use_container_width=True):
+                st.session_state.pop('pending_delete_blog', None)
+                st.rerun()
+        else:
+            if st.button("🗑️ Delete Blog", key=f"delete_blog_{blog_id}", use_container_width=True, type="secondary"):
+                st.session_state.pending_delete_blog = blog_id
+                st.rerun()
+    
+    # Sub-rows for scripts (expandable)
+    # Always show scripts section if scripts exist, regardless of blog status
+    if scripts and len(scripts) > 0:
+        # Determine if we should expand by default (if there are errors or if status is failed)
+        expand_by_default = blog_status == 'failed' or any(s.get('status') == 'failed' for s in scripts)
+        # Script rows are only built while the blog is toggled open, so collapsed blogs create no widgets
+        expanded_key = f"blog_expanded_{blog_id}"
+        scripts_expanded = st.session_state.get(expanded_key, expand_by_default)
+        st.button(
+            f"📋 {'Hide' if scripts_expanded else 'View'} {len(scripts)} Script(s)",
+            key=f"toggle_scripts_{blog_id}",
+            on_click=_set_session_flag,
+            args=(expanded_key, not scripts_expanded)
+        )
+        if scripts_expanded:
+            # Read-only overview in one dataframe element; the rows below only carry the interactive parts
+            st.dataframe(
+                pd.DataFrame([
+                    {
+                        'Category': s.get('category') or 'N/A',
+                        'Title': s.get('title') or s.get('youtube_title') or 'N/A',
+                        'Status': s.get('status') or 'N/A',
+                        'Updated': s['_ts_display'],
+                    }
+                    for s in scripts
+                ]),
+                use_container_width=True,
+                hide_index=True,
+                column_config={'Title': st.column_config.TextColumn(width='large')}
+            )
+            
+            # Sub-row header (5 columns - Script column is much wider, Status/Error merged, Video/Thumbnail wider)
+            sub_header_cols = st.columns([1.0, 0.5, 4.0, 2.0, 1.5])
+            sub_headers = ["Category", "Regenerate", "Script", "Video/Thumbnail", "Status/Error"]
+            for i, header in enumerate(sub_headers):
+                if i < len(sub_header_cols):
+                    sub_header_cols[i].markdown(f"**{header}**")
+            st.markdown("---")
+            
+            # Display each script as a sub-row
+            for script in scripts:
+                script_id = script['id']
+                category = script.get('category') or 'N/A'
+                title = script.get('title') or script.get('youtube_title') or 'N/A'
+                
+                # Get video paths - None, empty and 'None'/'null' strings all mean no file
+                video_path_clean = _clean_path(script.get('video_file_path'))
+                thumbnail_path_clean = _clean_path(script.get('thumbnail_file_path'))
+                
+                upload_status = script.get('upload_status') or 'not_uploaded'
+                script_status = script.get('status') or 'N/A'
+                error = script.get('error') or ''
+                script_timestamp = script.get('updated_at') or script.get('created_at') or 'N/A'
+                
+                # Session/widget keys used more than once for this script
+                replace_key = f"show_replace_{script_id}"
+                upload_widget_keys = (f"video_upload_{script_id}", f"thumbnail_upload_{script_id}")
+                
+                # Create sub-row columns (5 columns - Script column is much wider, Status/Error merged, Video/Thumbnail wider)
+                sub_row_cols = st.columns([1.0, 0.5, 4.0, 2.0, 1.5])
+                
+                with sub_row_cols[0]:
+                    st.text(category)
+                
+                with sub_row_cols[1]:
+                    # Regenerate button for this specific script (icon only, smaller)
+                    if st.button("🔄", key=f"regenerate_script_{script_id}", use_container_width=True, help=f"Regenerate {category} script only"):
+                        st.session_state.regenerate_script = script_id
+                        st.rerun()
+                
+                with sub_row_cols[2]:
+                    # The script body is only read and sent to the browser once the row is opened
+                    # (st.code has a built-in copy button, so no per-script HTML component is needed)
+                    view_key = f"script_open_{script_id}"
+                    script_open = st.session_state.get(view_key, False)
+                    st.button(
+                        "📝 Hide" if script_open else "📝 View",
+                        key=f"toggle_script_{script_id}",
+                        on_click=_set_session_flag,
+                        args=(view_key, not script_open)
+                    )
+                    if script_open:
+                        script_text = _script_display_text(script_id, script_timestamp)
+                        if script_text:
+                            st.code(script_text, language="json")
+                        else:
+                            st.text("N/A")
+                
+                with sub_row_cols[3]:
+                    # ============================================
+                    # VIDEO/THUMBNAIL UPLOAD SECTION - COMPLETE REWRITE
+                    # ============================================
+                    
+                    # Check if video is uploaded (must have video_file_path)
+                    video_uploaded = bool(video_path_clean)
+                    
+                    # ============================================
+                    # SECTION 1: If video is uploaded, show files + delete option
+                    # ============================================
+                    if video_uploaded:
+                        # Display uploaded files
+                        st.caption(f"📹 **Video:**")
+                        st.caption(_file_name(video_path_clean))
+                        
+                        if thumbnail_path_clean:
+                            st.caption(f"🖼️ **Thumbnail:**")
+                            st.caption(_file_name(thumbnail_path_clean))
+                        
+                        st.markdown("---")
+                        
+                        # Delete button with simple confirmation
+                        delete_confirm_key = f"confirm_delete_{script_id}"
+                        if st.session_state.get(delete_confirm_key, False):
+                            st.warning("⚠️ **Confirm deletion?**")
+                            col1, col2 = st.columns(2)
+                            with col1:
+                                if st.button("✅ Yes, Delete", key=f"yes_delete_{script_id}", use_container_width=True, type="primary"):
+                                    try:
+                                        # Delete files from Cloudinary or local storage - the deletions are
+                                        # independent I/O, so run them concurrently (SDK configured once up front)
+                                        stored_files = [path for path in (video_path_clean, thumbnail_path_clean) if path]
+                                        cloudinary_ready = False
+                                        if any('res.cloudinary.com' in path for path in stored_files):
+                                            try:
+                                                cloudinary_ready = _configure_cloudinary()
+                                            except Exception as e:
+                                                print(f"[WARNING] Could not delete from Cloudinary: {str(e)}")
+                                        with ThreadPoolExecutor(max_workers=4) as executor:
+                                            for future in [executor.submit(_delete_from_storage, path, cloudinary_ready) for path in stored_files]:
+                                                future.result()
+                                        
+                                        # Delete related records and clear the video paths in one transaction
+                                        video_ids = tuple(v_rec['id'] for v_rec in db.execute_query("SELECT id FROM videos WHERE script_id = ?", (script_id,)) if v_rec.get('id'))
+                                        # Match on _object_id (reliable) or the hash id, whichever resolves
+                                        script_object_id = script.get('_object_id') or script.get('script_object_id') or script_id
+                                        
+                                        with db.transaction():
+                                            if video_ids:
+                                                placeholders = ', '.join('?' * len(video_ids))
+                                                db.execute_update(_POSTS_DELETE_SQL.format(placeholders=placeholders), video_ids)
+                                                db.execute_update(_VIDEOS_DELETE_SQL.format(placeholders=placeholders), video_ids)
+                                            
+                                            affected = db.execute_update(_SCRIPT_VIDEO_RESET_SQL, (script_object_id, script_id))
+                                        
+                                        # Clear all session state for this script
+                                        _clear_script_state(script_id, upload_widget_keys)
+                                        
+                                        if affected > 0:
+                                            st.success("✅ Video deleted! Upload section will appear below.")
+                                        else:
+                                            st.error("❌ Database update failed. Please refresh the page manually.")
+                                        
+                                        st.rerun()
+                                    except Exception as e:
+                                        st.error(f"❌ Error: {str(e)}")
+                            
+                            with col2:
+                                if st.button("❌ Cancel", key=f"cancel_delete_{script_id}", use_container_width=True):
+                                    if delete_confirm_key in st.session_state:
+                                        del st.session_state[delete_confirm_key]
+                                    st.rerun()
+                        else:
+                            if st.button("🗑️ Delete", key=f"delete_btn_{script_id}", use_container_width=True, type="secondary"):
+                                _ss_set(delete_confirm_key, True, script_id)
+                                st.rerun()
+                        
+                        # Show option to replace video
+                        st.markdown("---")
+                        if st.button("🔄 Replace Video", key=f"replace_video_{script_id}", use_container_width=True):
+                            _ss_set(replace_key, True, script_id)
+                            st.rerun()
+                    
+                    # ============================================
+                    # SECTION 2: Upload section (shown when no video OR when replacing)
+                    # ============================================
+                    replacing = st.session_state.get(replace_key, False)
+                    if not video_uploaded or replacing:
+                        # Show cancel replace button if replacing
+                        if replacing:
+                            if st.button("❌ Cancel Replace", key=f"cancel_replace_{script_id}", use_container_width=True):
+                                del st.session_state[replace_key]
+                                st.rerun()
+                        
+                        # Upload section
+                        uploaded_video = st.file_uploader("📹 Upload Video", key=upload_widget_keys[0], type=['mp4', 'mov', 'avi', 'webm'], help="Upload video file")
+                        
+                        # Initialize session state for frame selection
+                        frame_key = f"selected_frame_{script_id}"
+                        frames_key = f"extracted_frames_{script_id}"
+                        temp_video_key = f"temp_video_path_{script_id}"
+                        
+                        # Handle video upload and frame extraction
+                        if uploaded_video is not None:
+                            # Save video temporarily to extract frames (RAM-backed /dev/shm when it has room)
+                            temp_video_path = os.path.join(_temp_dir_for(uploaded_video.size), f"reih_temp_{script_id}_{uploaded_video.name}")
+                            
+                            # Check if this is a new upload (different from stored temp path)
+                            if temp_video_key not in st.session_state or st.session_state[temp_video_key] != temp_video_path:
+                                # A different file replaces the previous upload - drop its temp video and frames
+                                _discard_temp_upload(st.session_state.get(temp_video_key))
+                                # Save video temporarily
+                                uploaded_video.seek(0)
+                                with open(temp_video_path, "wb") as f:
+                                    shutil.copyfileobj(uploaded_video, f, length=1024 * 1024)
+                                # Don't leave the temp video behind if the process exits before the upload
+                                _temp_uploads.add(temp_video_path)
+                                _ss_set(temp_video_key, temp_video_path, script_id)
+                                
+                                # Extract frames
+                                try:
+                                    with st.spinner("Extracting frames from video..."):
+                                        frames = extract_frames_from_video(temp_video_path, num_frames=12)
+                                        # Parse each frame's timestamp once and keep (path, timestamp) pairs
+                                        frames = [(frame_path, _frame_timestamp(frame_path, str(frame_idx))) for frame_idx, frame_path in enumerate(frames)]
+                                        _ss_set(frames_key, frames, script_id)
+                                    
+                                    st.success(f"✅ Extracted {len(frames)} frames from video")
+                                except ImportError as e:
+                                    st.warning("⚠️ OpenCV not installed. Install with: pip install opencv-python")
+                                    _ss_set(frames_key, [], script_id)
+                                except Exception as e:
+                                    st.error(f"❌ Error extracting frames: {str(e)}")
+                                    _ss_set(frames_key, [], script_id)
+                            
+                            # Display frames for selection
+                            if frames_key in st.session_state and st.session_state[frames_key]:
+                                frames = st.session_state[frames_key]
+                                
+                                st.markdown("**🎬 Select Thumbnail from Video Frames:**")
+                                
+                                # Display frames in a grid with selection buttons
+                                # (one set of columns; frame i goes to column i % num_cols, so rows still read left to right)
+                                num_cols = 4
+                                
+                                # Show currently selected frame if any
+                                current_selection = st.session_state.get(frame_key, None)
+                                
+                                cols = st.columns(num_cols)
+                                for frame_idx, (frame_path, timestamp) in enumerate(frames):
+                                    with cols[frame_idx % num_cols]:
+                                        # Skip if frame file doesn't exist (was deleted) - the stat also keys the preview cache
+                                        try:
+                                            frame_mtime = os.path.getmtime(frame_path)
+                                        except OSError:
+                                            continue
+                                        
+                                        # Display frame with selection button
+                                        try:
+                                            # Highlight selected frame
+                                            is_current_selection = current_selection == frame_path
+                                            border_color = "#00ff00" if is_current_selection else "transparent"
+                                            
+                                            st.image(_frame_thumbnail(frame_path, frame_mtime), use_container_width=True, caption=f"Frame at {timestamp}s")
+                                            
+                                            # Selection button
+                                            button_label = "✅ Selected" if is_current_selection else "Select"
+                                            button_type = "primary" if is_current_selection else "secondary"
+                                            
+                                            if st.button(button_label, key=f"select_frame_{script_id}_{frame_idx}", use_container_width=True, type=button_type):
+                                                _ss_set(frame_key, frame_path, script_id)
+                                                
+                                                # Delete remaining frames (except the selected one)
+                                                if frames_key in st.session_state:
+                                                    # One directory scan instead of an exists() + remove() per frame
+                                                    with os.scandir(os.path.dirname(frame_path)) as entries:
+                                                        for entry in entries:
+                                                            if entry.path != frame_path:
+                                                                try:
+                                                                    os.remove(entry.path)
+                                                                except OSError as e:
+                                                                    print(f"Warning: Could not delete frame {entry.path}: {str(e)}")
+                                                    
+                                                    # Update session state to only keep the selected frame
+                                                    _ss_set(frames_key, [(frame_path, timestamp)], script_id)
+                                                
+                                                st.rerun()
+                                        except Exception as e:
+                                            st.error(f"Error loading frame: {str(e)}")
+                                
+                                # Show selected frame info
+                                if frame_key in st.session_state and st.session_state[frame_key]:
+                                    timestamp = dict(frames).get(st.session_state[frame_key], "unknown")
+                                    st.success(f"✅ Selected thumbnail: Frame at {timestamp}s")
+                            
+                            # Manual thumbnail upload option (fallback)
+                            st.markdown("---")
+                            st.caption("Or upload a custom thumbnail:")
+                            uploaded_thumbnail = st.file_uploader("Custom Thumbnail", key=upload_widget_keys[1], type=['jpg', 'jpeg', 'png', 'webp'], help="Upload a custom thumbnail image")
+                            
+                            if st.button("📤 Upload Video & Thumbnail", key=f"upload_btn_{script_id}", use_container_width=True, type="primary"):
+                                video_path = None
+                                thumbnail_path = None
+                                video_storage_type = 'local'
+                                thumbnail_storage_type = 'local'
+                                
+                                uploads = {}
+                                # One timestamp for every file name in this upload
+                                upload_ts = int(time.time())
+                                
+                                # Upload video file (use temp path if available, otherwise use uploaded file)
+                                temp_path = None
+                                if uploaded_video:
+                                    temp_path = st.session_state.get(temp_video_key)
+                                    if temp_path and os.path.exists(temp_path):
+                                        # Upload straight from the temp video file (no second read into memory)
+                                        video_source = {'file_path': temp_path}
+                                    else:
+                                        # Use uploaded video bytes
+                                        temp_path = None
+                                        video_source = {'file_bytes': uploaded_video.getbuffer()}
+                                    
+                                    video_filename = f"script_{script_id}_video_{upload_ts}_{uploaded_video.name}"
+                                    uploads['video'] = dict(filename=video_filename, resource_type='video', **video_source)
+                                
+                                # Save thumbnail (prefer selected frame, then uploaded thumbnail)
+                                selected_frame = st.session_state.get(frame_key)
+                                if selected_frame:
+                                    # Use selected frame as thumbnail
+                                    thumbnail_filename = f"script_{script_id}_thumbnail_{upload_ts}.jpg"
+                                    frame_upload = dict(filename=thumbnail_filename, resource_type='image', file_path=selected_frame)
+                                    if 'video' not in uploads:
+                                        uploads['thumbnail'] = frame_upload
+                                elif uploaded_thumbnail:
+                                    # Use uploaded thumbnail
+                                    thumbnail_filename = f"script_{script_id}_thumbnail_{upload_ts}_{uploaded_thumbnail.name}"
+                                    uploads['thumbnail'] = dict(filename=thumbnail_filename, resource_type='image', file_bytes=uploaded_thumbnail.getbuffer())
+                                
+                                # Upload video and thumbnail to Cloudinary (concurrently) or local storage
+                                stored = _upload_files_concurrently(uploads) if uploads else {}
+                                
+                                if selected_frame and 'thumbnail' not in stored:
+                                    # A frame of a video stored on Cloudinary is rendered from the video itself
+                                    # (so_<offset>/f_jpg) - only upload the frame file if the video went to local storage
+                                    frame_timestamp = dict(st.session_state.get(frames_key) or []).get(selected_frame)
+                                    video_public_id = None
+                                    if stored.get('video', (None, 'local'))[1] == 'cloudinary' and frame_timestamp:
+                                        from utils.cloudinary_storage import extract_public_id_from_url, video_frame_url
+                                        video_public_id = extract_public_id_from_url(stored['video'][0])
+                                    if video_public_id:
+                                        frame_url = video_frame_url(video_public_id, float(frame_timestamp))
+                                        stored['thumbnail'] = (frame_url, 'cloudinary', frame_url)
+                                    else:
+                                        stored['thumbnail'] = upload_to_storage(**frame_upload)
+                                
+                                if 'video' in stored:
+                                    video_path, video_storage_type, cloudinary_video_url = stored['video']
+                                    
+                                    # Clean up temp file (local storage has already moved it into place)
+                                    if temp_path and os.path.exists(temp_path):
+                                        try:
+                                            os.remove(temp_path)
+                                        except:
+                                            pass
+                                    
+                                    if video_storage_type == 'cloudinary':
+                                        st.success(f"✅ Video uploaded to Cloudinary: {uploaded_video.name}")
+                                        st.info(f"🌐 Cloudinary URL: {cloudinary_video_url[:80]}...")
+                                    else:
+                                        st.success(f"✅ Video uploaded: {uploaded_video.name}")
+                                        st.caption(f"💾 Stored locally: {video_path}")
+                                
+                                if 'thumbnail' in stored:
+                                    thumbnail_path, thumbnail_storage_type, cloudinary_thumbnail_url = stored['thumbnail']
+                                    
+                                    if thumbnail_storage_type == 'cloudinary':
+                                        st.success(f"✅ Thumbnail uploaded to Cloudinary")
+                                        st.info(f"🌐 Cloudinary URL: {cloudinary_thumbnail_url[:80]}...")
+                                    elif selected_frame:
+                                        st.success(f"✅ Thumbnail selected from video frame")
+                                        st.caption(f"💾 Stored locally: {thumbnail_path}")
+                                    else:
+                                        st.success(f"✅ Thumbnail uploaded: {uploaded_thumbnail.name}")
+                                        st.caption(f"💾 Stored locally: {thumbnail_path}")
+                                
+                                if selected_frame:
+                                    # Clean up extracted frames and frame directory
+                                    # (their session keys are dropped with the rest of the script's state below)
+                                    frames_to_clean = st.session_state.get(frames_key)
+                                    if frames_to_clean:
+                                        # All frames live in the extractor's own directory - remove it in one go
+                                        shutil.rmtree(os.path.dirname(frames_to_clean[0][0]), ignore_errors=True)
+                                
+                                # Copy title, description, and keywords directly from the script row (same as displayed in script generation page)
+                                # Get the current script data to copy the values
+                                script_title = script.get('title') or script.get('youtube_title') or None
+                                script_description = script.get('youtube_description') or None
+                                script_keywords = script.get('youtube_keywords') or None
+                                
+                                # Use the values from the script row directly (no extraction)
+                                final_title = script_title
+                                final_description = script_description if script_description and script_description != 'N/A' else None
+                                final_keywords = script_keywords if script_keywords and script_keywords != 'N/A' else None
+                                
+                                # Update database - use _object_id for reliable update
+                                script_object_id = script.get('_object_id') or script.get('script_object_id')
+                                update_id = script_object_id if script_object_id else script_id
+                                
+                                # Only set upload_status = 'uploaded' if video_file_path exists (video is uploaded)
+                                # Copy title, description, keywords from script row to ensure they're saved
+                                db.execute_update(_update_sql(
+                                    ('video_file_path', 'thumbnail_file_path', 'upload_status',
+                                     'youtube_title', 'youtube_description', 'youtube_keywords'),
+                                    where="id IN (?, ?)"
+                                ), (
+                                    video_path,
+                                    thumbnail_path,
+                                    'uploaded' if video_path else 'not_uploaded',
+                                    final_title,  # Copy title from script row
+                                    final_description,  # Copy description from script row
+                                    final_keywords,  # Copy keywords from script row
+                                    update_id,
+                                    script_id
+                                ))
+                                
+                                # Clear the replace flag and all video upload session state
+                                _clear_script_state(script_id, upload_widget_keys)
+                                
+                                st.rerun()
+                        else:
+                            # No video uploaded - show manual thumbnail upload option
+                            uploaded_thumbnail = st.file_uploader("Thumbnail", key=upload_widget_keys[1], type=['jpg', 'jpeg', 'png', 'webp'], help="Upload thumbnail image")
+                            
+                            if uploaded_thumbnail:
+                                if st.button("📤 Upload Thumbnail", key=f"upload_thumbnail_btn_{script_id}", use_container_width=True, type="primary"):
+                                    # Create uploads directory if it doesn't exist
+                                    uploads_dir = _ensure_dir(_UPLOADS_VIDEOS_DIR)
+                                    
+                                    thumbnail_filename = f"script_{script_id}_thumbnail_{int(time.time())}_{uploaded_thumbnail.name}"
+                                    thumbnail_path = os.path.join(uploads_dir, thumbnail_filename)
+                                    
+                                    uploaded_thumbnail.seek(0)
+                                    with open(thumbnail_path, "wb") as f:
+                                        shutil.copyfileobj(uploaded_thumbnail, f, length=1024 * 1024)
+                                    
+                                    # Update database
+                                    db.execute_update(_update_sql(('thumbnail_file_path',)), (thumbnail_path, script_id))
+                                    
+                                    st.success(f"✅ Thumbnail uploaded: {uploaded_thumbnail.name}")
+                                    st.rerun()
+                
+                with sub_row_cols[4]:
+                    # Merged Status/Error column - show error if present, otherwise show status
+                    if error:
+                        error_display = str(error)
+                        if len(error_display) > 30:
+                            with st.expander(f"❌ Error ({len(error_display)} chars)", expanded=False):
+                                st.error(error_display)
+                                
+                                # If error contains API response debug info, format it nicely
+                                if "🔍 ACTUAL API RESPONSE:" in error_display:
+                                    st.divider()
+                                    st.warning("**🔍 Debugging Information:**")
+                                    # Extract and display the API response part
+                                    parts = error_display.split("🔍 ACTUAL API RESPONSE:")
+                                    if len(parts) > 1:
+                                        st.code(parts[1], language="text")
+                                        st.info("💡 **Fix:** Update your master prompt to return JSON with these exact fields: `title`, `caption`, `description` (or `short_description`), and `script`. All fields must contain actual text (not empty strings). See Settings → Master Prompt → Format Guide for details.")
+                                else:
+                                    st.code(error_display, language=None)
+                        else:
+                            st.error(error_display)
+                    else:
+                        # Show status if no error
+                        uploaded = 'uploaded' if script_status == 'completed' and upload_status == 'uploaded' else None
+                        show_status, status_text = _STATUS_LABELS.get((script_status, uploaded), (st.text, script_status))
+                        show_status(status_text)
+                
+                st.markdown("---")
+    else:
+        # No scripts yet - but check if blog status indicates what happened
+        if blog_status == 'processing':
+            st.info("⏳ Scripts are being generated... Please wait.")
+        elif blog_status == 'failed':
+            st.error("❌ Script generation failed. Check the error message above or try regenerating.")
+            # Show a button to retry
+            if st.button("🔄 Retry Script Generation", key=f"retry_blog_{blog_id}", use_container_width=True):
+                # Reset status and trigger regeneration
+                db.execute_update("""
+                    UPDATE blog_urls 
+                    SET status = 'pending', 
+                        notes = NULL,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """, (blog_id,))
+                st.rerun()
+        else:
+            st.warning("⚠️ No scripts generated yet. Click 'Generate Scripts' to create scripts.")
     
-    return local_path, 'local', None
+    st.markdown("")
+
 
 def show():
     st.title("📝 Generate Scripts")
@@ -105,9 +1198,9 @@ def show():
                             st.session_state.selected_blog_id = blog_id
                             st.rerun()
             else:
-                # Blog was deleted, remove error
+                # Blog was deleted, remove error (one rerun for all of them, after the actions below)
                 del st.session_state.blog_errors[blog_id]
-                st.rerun()
+                st.session_state['_needs_rerun'] = True
     
     # Simple form with just Blog URL and Generate Scripts button
     with st.form("add_blog_url_form", clear_on_submit=True):
@@ -125,17 +1218,13 @@ def show():
         prompt_options = {}
         default_index = 0
         for idx, prompt in enumerate(all_master_prompts):
-            prompt_name = prompt.get('name', 'Unnamed Prompt')
-            is_active = prompt.get('is_active', 0)
-            prompt_id = prompt.get('id')
-            
+            prompt_name = prompt.get('name') or 'Unnamed Prompt'
+            is_active = prompt.get('is_active')
             # Add "(Active)" label if it's the active prompt
-            display_name = f"{prompt_name}"
+            display_name = f"{prompt_name} ⭐ (Active)" if is_active else prompt_name
+            prompt_options[display_name] = prompt['id']
             if is_active:
-                display_name += " ⭐ (Active)"
                 default_index = idx
-            
-            prompt_options[display_name] = prompt_id
         
         # Master Prompt Selection
         selected_prompt_display = st.selectbox(
@@ -244,37 +1333,26 @@ def show():
                     from utils.article_fetcher import fetch_article_text
                     from utils.script_generator import generate_all_scripts_single_call
                     from utils.script_metadata_extractor import extract_metadata_from_script
-                    from utils.cost_calculator import calculate_cost, format_cost
                     
                     progress_bar = st.progress(0)
                     status_text = st.empty()
+                    progress = ThrottledProgress(progress_bar, status_text)
                     
                     # Step 1: Fetch article text from URL
-                    status_text.text("📥 Fetching article from URL...")
-                    progress_bar.progress(0.1)
+                    progress.update(0.1, "📥 Fetching article from URL...")
                     
                     try:
                         article_text = fetch_article_text(blog_url)
                         st.success(f"✅ Article fetched! ({len(article_text)} characters)")
-                        print(f"[DEBUG] Fetched article text: {len(article_text)} characters")
+                        logger.debug("Fetched article text: %d characters", len(article_text))
                     except Exception as e:
                         error_msg = f"Failed to fetch article from URL: {str(e)}"
                         st.error(f"❌ {error_msg}")
-                        # Store error in session state for persistence
-                        st.session_state.blog_errors[blog_id] = error_msg
-                        db.execute_update("""
-                            UPDATE blog_urls 
-                            SET status = 'failed', notes = ? 
-                            WHERE id = ?
-                        """, (error_msg, blog_id))
-                        progress_bar.empty()
-                        status_text.empty()
-                        st.rerun()
+                        _fail_blog(blog_id, error_msg, progress_bar, status_text)
                         return
                     
                     # Step 2: Generate scripts in single API call
-                    status_text.text("🤖 Generating scripts in single API call...")
-                    progress_bar.progress(0.3)
+                    progress.update(0.3, "🤖 Generating scripts in single API call...")
                     
                     # Use the selected master prompt
                     master_prompt = selected_master_prompt['prompt_text']
@@ -292,41 +1370,22 @@ def show():
                     if error:
                         error_message = f"❌ Failed to generate scripts: {error}"
                         st.error(error_message)
-                        # Store error in session state for persistence
-                        st.session_state.blog_errors[blog_id] = error
-                        db.execute_update("""
-                            UPDATE blog_urls 
-                            SET status = 'failed', notes = ? 
-                            WHERE id = ?
-                        """, (error, blog_id))
-                        progress_bar.empty()
-                        status_text.empty()
-                        st.rerun()
+                        _fail_blog(blog_id, error, progress_bar, status_text)
                         return
                     
                     if not videos or len(videos) == 0:
                         error_message = "❌ No scripts generated. API returned empty response."
                         st.error(error_message)
-                        # Store error in session state for persistence
-                        st.session_state.blog_errors[blog_id] = "No scripts generated. API returned empty response."
-                        db.execute_update("""
-                            UPDATE blog_urls 
-                            SET status = 'failed', notes = 'No scripts generated' 
-                            WHERE id = ?
-                        """, (blog_id,))
-                        progress_bar.empty()
-                        status_text.empty()
-                        st.rerun()
+                        _fail_blog(blog_id, "No scripts generated. API returned empty response.", progress_bar, status_text, notes='No scripts generated')
                         return
                     
                     # Process scripts dynamically based on what master prompt returns
-                    # Expected categories for reference (used if category is not provided in response)
-                    expected_categories = ["How-To", "Common Mistake", "Pro Tip", "Myth-Busting", "Mini Makeover"]
                     
                     # Log what we received from API
-                    print(f"[DEBUG] Received {len(videos)} videos from API")
-                    for i, vid in enumerate(videos):
-                        print(f"[DEBUG] Video {i+1}: {json.dumps(vid, indent=2)[:500]}")
+                    logger.debug("Received %d videos from API", len(videos))
+                    if logger.isEnabledFor(logging.DEBUG):
+                        for i, vid in enumerate(videos):
+                            logger.debug("Video %d: %s", i + 1, json.dumps(vid, indent=2)[:500])
                     
                     # Check if videos have actual data (check for various field name variations)
                     videos_with_data = []
@@ -363,12 +1422,13 @@ def show():
                                 videos_with_data.append(v)
                             else:
                                 # Log what fields this video actually has
-                                print(f"[DEBUG] Video without data - keys: {list(v.keys())}")
-                                print(f"[DEBUG] Video content: {json.dumps(v, indent=2)[:1000]}")
-                                # Log each field's value and type
-                                for key, val in v.items():
-                                    print(f"[DEBUG]   - {key}: type={type(val).__name__}, value={str(val)[:100] if val else 'None/Empty'}")
-                    print(f"[DEBUG] Videos with data: {len(videos_with_data)} out of {len(videos)}")
+                                if logger.isEnabledFor(logging.DEBUG):
+                                    logger.debug("Video without data - keys: %s", list(v.keys()))
+                                    logger.debug("Video content: %s", json.dumps(v, indent=2)[:1000])
+                                    # Log each field's value and type
+                                    for key, val in v.items():
+                                        logger.debug("  - %s: type=%s, value=%s", key, type(val).__name__, str(val)[:100] if val else 'None/Empty')
+                    logger.debug("Videos with data: %d out of %d", len(videos_with_data), len(videos))
                     
                     if len(videos_with_data) == 0:
                         # Show detailed error with actual API response
@@ -473,60 +1533,22 @@ OR for a single script:
                                 api_response_debug = f"\n\n🔍 ACTUAL API RESPONSE:\nType: {type(first_video)}\nValue: {str(first_video)[:500]}"
                         
                         error_msg = f"API returned {len(videos)} videos but none contain script data. Check master prompt format. Expected fields: script, title, caption, or description.{api_response_debug}"
-                        failed_script_json = {
-                            "title": "",
-                            "caption": "",
-                            "short_description": "",
-                            "heygen_setup": {},
-                            "avatar_visual_style": {},
-                            "script": "",
-                            "keywords": []
-                        }
-                        failed_script_content = json.dumps(failed_script_json, indent=2)
                         
                         # Create records for all videos returned (or 1 placeholder if empty)
                         num_records = max(len(videos), 1)
-                        for idx in range(num_records):
-                            cat = videos[idx].get('category', f"Script {idx + 1}") if idx < len(videos) else f"Script {idx + 1}"
-                            try:
-                                db.execute_insert("""
-                                    INSERT INTO scripts (
-                                        blog_url_id, script_number, script_content, 
-                                        title, caption, category,
-                                        youtube_title, youtube_description, youtube_keywords,
-                                        status, error, video_url,
-                                        input_tokens, output_tokens, total_tokens,
-                                        input_cost, output_cost, total_cost
-                                    )
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                                """, (
-                                    blog_id,
-                                    idx + 1,
-                                    failed_script_content,
-                                    None,
-                                    None,
-                                    cat,
-                                    None,
-                                    None,
-                                    None,
-                                    'failed',
-                                    error_msg,
-                                    None,
-                                    0, 0, 0,
-                                    0.0, 0.0, 0.0
-                                ))
-                            except Exception as e:
-                                print(f"[DEBUG] Error saving failed script record for {cat}: {str(e)}")
+                        try:
+                            with db.DbWriterActor() as writer:
+                                for idx in range(num_records):
+                                    cat = videos[idx].get('category', f"Script {idx + 1}") if idx < len(videos) else f"Script {idx + 1}"
+                                    _insert_script_row(writer, blog_id, idx + 1, _EMPTY_SCRIPT_CONTENT, cat, 'failed', error=error_msg)
+                                saved_count, write_errors = writer.flush()
+                            logger.debug("Saved %d failed script records for blog %s", saved_count, blog_id)
+                            for write_error in write_errors:
+                                logger.debug("Error saving failed script record: %s", write_error)
+                        except Exception as e:
+                            logger.debug("Error saving failed script records: %s", e)
                         
-                        db.execute_update("""
-                            UPDATE blog_urls 
-                            SET status = 'failed', 
-                                notes = ? 
-                            WHERE id = ?
-                        """, (error_msg, blog_id))
-                        progress_bar.empty()
-                        status_text.empty()
-                        st.rerun()
+                        _fail_blog(blog_id, error_msg, progress_bar, status_text, persist_error=False)
                         return
                     
                     # Filter out videos without data (only process videos that have actual content)
@@ -549,13 +1571,11 @@ OR for a single script:
                         st.info(f"ℹ️ Master prompt returned **{len(videos)} scripts**. Processing all {len(videos)} scripts.")
                     
                     st.success(f"✅ Processing {len(videos)} script(s)!")
-                    progress_bar.progress(0.7)
-                    status_text.text(f"💾 Saving {len(videos)} scripts to database...")
+                    progress.update(0.7, f"💾 Saving {len(videos)} scripts to database...")
                     
                     # Step 3: Process and save all scripts
                     
-                    # Calculate cost
-                    current_model = config.get_openai_model()
+                    # Calculate cost (current_model was read when the run started)
                     cost_info = calculate_cost(
                         token_usage.get('input_tokens', 0),
                         token_usage.get('output_tokens', 0),
@@ -570,253 +1590,151 @@ OR for a single script:
                     total_cost = cost_info['total_cost']
                     
                     success_count = 0
+                    # Script rows are handed to a background writer and saved in batches
                     
-                    # Process each video from the JSON response
-                    for idx, video in enumerate(videos):
-                        try:
-                            # Extract video data
-                            category_name = str(video.get('category', '')).strip()
-                            if not category_name:
-                                # Use expected category based on index if available, otherwise generic name
-                                if idx < len(expected_categories):
-                                    category_name = expected_categories[idx]
-                                else:
-                                    category_name = f"Script {idx + 1}"
-                            
-                            # Script number is simply the index + 1 (1-based)
-                            script_number = idx + 1
-                            
-                            # Extract fields directly from JSON (matching Google Sheets format)
-                            # Support multiple field name variations
-                            title = str(video.get('title') or video.get('Title') or '').strip()
-                            caption = str(video.get('caption') or video.get('Caption') or '').strip()
-                            description = str(
-                                video.get('short_description') or 
-                                video.get('description') or 
-                                video.get('Description') or
-                                video.get('Short Description') or
-                                ''
-                            ).strip()
-                            
-                            # Also check for script field with variations
-                            script_content = str(
-                                video.get('script') or 
-                                video.get('Script') or
-                                video.get('content') or
-                                video.get('Content') or
-                                video.get('text') or
-                                video.get('Text') or
-                                ''
-                            ).strip()
-                            
-                            # Check if this is a placeholder (empty script)
-                            # A placeholder is one that has no script content AND no title/content
-                            is_placeholder = not script_content and not title and not caption
-                            
-                            # Keywords can be array or comma-separated string
-                            keywords = video.get('keywords', [])
-                            if isinstance(keywords, str):
-                                keywords = [k.strip() for k in keywords.split(',') if k.strip()]
-                            elif isinstance(keywords, list):
-                                keywords = [str(k).strip() for k in keywords if k]
-                            else:
-                                keywords = []
-                            
-                            keywords_str = ', '.join(keywords) if keywords else ''
-                            
-                            # Build the full JSON structure for script_content
-                            # Include all fields from the video object in the proper format
-                            script_json = {
-                                "title": title if title else "",
-                                "caption": caption if caption else "",
-                                "short_description": description if description else "",
-                                "heygen_setup": video.get('heygen_setup', {}),
-                                "avatar_visual_style": video.get('avatar_visual_style', {}),
-                                "script": script_content,  # Use the script_content we extracted with variations
-                                "keywords": keywords if keywords else []
-                            }
-                            
-                            # Check if script JSON is valid (has at least script field or title)
-                            script_json_valid = bool(script_json.get('script') or script_json.get('title'))
-                            
-                            # Convert to formatted JSON string for storage
+                    with db.DbWriterActor() as writer:
+                        # Process each video from the JSON response
+                        for idx, video in enumerate(videos):
                             try:
-                                script_content = json.dumps(script_json, indent=2, ensure_ascii=False)
-                            except Exception as e:
-                                print(f"[DEBUG] Error converting script to JSON: {str(e)}")
-                                # Fallback: use the script text if JSON conversion fails
-                                script_content = str(video.get('script', '')).strip() or f"{category_name} script content"
-                                # If JSON conversion failed, mark as invalid
-                                script_json_valid = False
+                                # Extract video data
+                                category_name = str(video.get('category', '')).strip()
+                                if not category_name:
+                                    # Use expected category based on index if available, otherwise generic name
+                                    category_name = _DEFAULT_CATEGORY_NAMES[idx] if idx < len(_DEFAULT_CATEGORY_NAMES) else f"Script {idx + 1}"
                             
-                            # Debug: Print what we extracted from JSON
-                            print(f"[DEBUG] Video {idx + 1} ({category_name}) JSON fields:")
-                            print(f"  - title: '{title}'")
-                            print(f"  - caption: '{caption}'")
-                            print(f"  - description: '{description[:100] if description else ''}...'")
-                            print(f"  - keywords: '{keywords_str}'")
-                            print(f"  - heygen_setup: {bool(script_json.get('heygen_setup'))}")
-                            print(f"  - avatar_visual_style: {bool(script_json.get('avatar_visual_style'))}")
-                            print(f"  - script_json_valid: {script_json_valid}")
-                            print(f"  - script_content length: {len(script_content)}")
+                                # Script number is simply the index + 1 (1-based)
+                                script_number = idx + 1
                             
-                            # Determine status and error message
-                            # Check if this is a real video object with data
-                            # We've already extracted the fields above, so check if any have content
-                            has_data = bool(script_content or title or caption or description or keywords)
+                                # Extract fields directly from JSON (matching Google Sheets format)
+                                # Support multiple field name variations
+                                title = _first(video, _FIELD_ALIASES['title'])
+                                caption = _first(video, _FIELD_ALIASES['caption'])
+                                description = _first(video, _FIELD_ALIASES['description'])
+                                script_content = _first(video, _FIELD_ALIASES['script'])
                             
-                            if is_placeholder and not has_data:
-                                script_status = 'failed'
-                                error_message = f'API did not generate script content for {category_name}.'
-                                # Create minimal JSON for failed scripts
-                                script_json = {
-                                    "title": "",
-                                    "caption": "",
-                                    "short_description": "",
-                                    "heygen_setup": {},
-                                    "avatar_visual_style": {},
-                                    "script": "",
-                                    "keywords": []
-                                }
-                                script_content = json.dumps(script_json, indent=2)
-                                print(f"[DEBUG] Placeholder script {script_number} ({category_name}): Not generated by API")
-                                print(f"[DEBUG] Video object: {video}")
-                            elif not script_json_valid:
-                                script_status = 'failed'
-                                error_message = f'Empty or invalid script content for {category_name}. API response may not contain script data.'
-                                print(f"[DEBUG] Empty/invalid script {script_number} ({category_name}): script_json has no script or title")
-                                print(f"[DEBUG] Full video object: {video}")
-                            else:
-                                script_status = 'completed'
-                                error_message = None
-                                success_count += 1
-                                print(f"[DEBUG] ✅ Saved script {script_number} ({category_name}): Title='{title}', Caption='{caption}', Description='{description[:50] if description else None}...', Keywords='{keywords_str}'")
+                                # Keywords can be array or comma-separated string
+                                keywords = video.get('keywords') or ()
+                                if isinstance(keywords, str):
+                                    keywords = keywords.split(',')
+                                elif not isinstance(keywords, list):
+                                    keywords = ()
+                                keywords = [k for k in (str(k).strip() for k in keywords) if k]
+                                keywords_str = ', '.join(keywords)
                             
-                            # Store fields directly from JSON (with fallback to extracted metadata)
-                            # Store script in database with all fields matching Google Sheets format
-                            # script_content now contains the full JSON structure
-                            db.execute_insert("""
-                                INSERT INTO scripts (
-                                    blog_url_id, script_number, script_content, 
-                                    title, caption, category, 
-                                    youtube_title, youtube_description, youtube_keywords,
-                                    status, error, video_url,
-                                    input_tokens, output_tokens, total_tokens,
-                                    input_cost, output_cost, total_cost
-                                )
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            """, (
-                                blog_id, 
-                                script_number, 
-                                script_content,  # Full JSON structure stored here
-                                title if title else None,  # Title from JSON (or extracted from script)
-                                caption if caption else None,  # Caption from JSON
-                                category_name,  # Category
-                                title if title else None,  # youtube_title (same as title)
-                                description if description else None,  # youtube_description (same as description)
-                                keywords_str if keywords_str else None,  # youtube_keywords (same as keywords)
-                                script_status,  # status (completed or failed)
-                                error_message,  # error message if failed
-                                None,  # video_url (will be filled later)
-                                0,  # Individual script tokens not available from single call
-                                0,
-                                0,
-                                0.0,  # Individual script cost not available
-                                0.0,
-                                0.0
-                            ))
+                                # A placeholder is a video object with none of the fields filled in
+                                has_data = any((script_content, title, caption, description, keywords))
                             
-                        except Exception as e:
-                            st.error(f"❌ Error processing script {idx + 1}: {str(e)}")
-                            print(f"[DEBUG] Error processing video {idx + 1}: {str(e)}")
-                            import traceback
-                            traceback.print_exc()
-                            # Store failed script record
-                            try:
-                                # Try to get category from video object
-                                category_name = str(video.get('category', '')).strip() if video else ''
-                                if not category_name:
-                                    # Determine category from index
-                                    category_names = ["How-To", "Common Mistake", "Pro Tip", "Myth-Busting", "Mini Makeover"]
-                                    if idx < len(category_names):
-                                        category_name = category_names[idx]
-                                    else:
-                                        category_name = f"Script {idx + 1}"
-                                script_number = categories_map.get(category_name, idx + 1)
-                                error_message = f"Error: {str(e)}"
-                                # Create JSON structure for failed scripts
-                                failed_script_json = {
-                                    "title": "",
-                                    "caption": "",
-                                    "short_description": "",
-                                    "heygen_setup": {},
-                                    "avatar_visual_style": {},
-                                    "script": "",
-                                    "keywords": []
-                                }
-                                failed_script_content = json.dumps(failed_script_json, indent=2)
+                                # Determine status and error message
+                                if not has_data:
+                                    # Placeholder - store the minimal JSON without building script_json
+                                    script_status = 'failed'
+                                    error_message = f'API did not generate script content for {category_name}.'
+                                    script_content = _EMPTY_SCRIPT_CONTENT
+                                    logger.debug("Placeholder script %d (%s): Not generated by API", script_number, category_name)
+                                    if logger.isEnabledFor(logging.DEBUG):
+                                        logger.debug("Video object: %s", video)
+                                else:
+                                    # Build the full JSON structure for script_content
+                                    # Include all fields from the video object in the proper format
+                                    script_json = {
+                                        "title": title,
+                                        "caption": caption,
+                                        "short_description": description,
+                                        "heygen_setup": video.get('heygen_setup', {}),
+                                        "avatar_visual_style": video.get('avatar_visual_style', {}),
+                                        "script": script_content,  # Use the script_content we extracted with variations
+                                        "keywords": keywords
+                                    }
+                                
+                                    # Check if script JSON is valid (has at least script field or title)
+                                    script_json_valid = bool(script_content or title)
+                                
+                                    # Convert to compact JSON string for storage (pretty-printed only for display)
+                                    try:
+                                        script_content = _dumps_compact(script_json)
+                                    except Exception as e:
+                                        logger.debug("Error converting script to JSON: %s", e)
+                                        # Fallback: use the script text if JSON conversion fails
+                                        script_content = str(video.get('script', '')).strip() or f"{category_name} script content"
+                                        # If JSON conversion failed, mark as invalid
+                                        script_json_valid = False
                                 
-                                db.execute_insert("""
-                                    INSERT INTO scripts (
-                                        blog_url_id, script_number, script_content, 
-                                        title, caption, category,
-                                        youtube_title, youtube_description, youtube_keywords,
-                                        status, error, video_url,
-                                        input_tokens, output_tokens, total_tokens,
-                                        input_cost, output_cost, total_cost
+                                    # Debug: Print what we extracted from JSON
+                                    logger.debug(
+                                        "Video %d (%s) JSON fields: title=%r caption=%r description=%r keywords=%r "
+                                        "heygen_setup=%s avatar_visual_style=%s script_json_valid=%s script_content length=%d",
+                                        idx + 1, category_name, title, caption, description[:100], keywords_str,
+                                        bool(script_json.get('heygen_setup')), bool(script_json.get('avatar_visual_style')),
+                                        script_json_valid, len(script_content)
                                     )
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                                """, (
-                                    blog_id,
-                                    script_number,
-                                    failed_script_content,  # Store JSON structure
-                                    None,  # title
-                                    None,  # caption
-                                    category_name,  # category
-                                    None,  # youtube_title
-                                    None,  # youtube_description
-                                    None,  # youtube_keywords
-                                    'failed',
-                                    error_message,  # error
-                                    None,  # video_url
-                                    0,
-                                    0,
-                                    0,
-                                    0.0,
-                                    0.0,
-                                    0.0
-                                ))
-                            except Exception as save_error:
-                                st.error(f"❌ Error saving failed script record: {str(save_error)}")
+                                
+                                    if not script_json_valid:
+                                        script_status = 'failed'
+                                        error_message = f'Empty or invalid script content for {category_name}. API response may not contain script data.'
+                                        logger.debug("Empty/invalid script %d (%s): script_json has no script or title", script_number, category_name)
+                                        if logger.isEnabledFor(logging.DEBUG):
+                                            logger.debug("Full video object: %s", video)
+                                    else:
+                                        script_status = 'completed'
+                                        error_message = None
+                                        success_count += 1
+                                        logger.debug("✅ Saved script %d (%s): Title=%r, Caption=%r, Description=%r, Keywords=%r", script_number, category_name, title, caption, description[:50], keywords_str)
+                            
+                                # Store fields directly from JSON (with fallback to extracted metadata)
+                                # Store script in database with all fields matching Google Sheets format
+                                # script_content now contains the full JSON structure
+                                _insert_script_row(
+                                    writer, blog_id, script_number,
+                                    script_content,  # Full JSON structure stored here
+                                    category_name,
+                                    script_status,  # completed or failed
+                                    error=error_message,
+                                    title=title or None,  # Title from JSON
+                                    caption=caption or None,  # Caption from JSON
+                                    youtube_title=title or None,  # same as title
+                                    youtube_description=description or None,  # same as description
+                                    youtube_keywords=keywords_str or None,  # same as keywords
+                                )
+                            
+                            except Exception as e:
+                                st.error(f"❌ Error processing script {idx + 1}: {str(e)}")
+                                logger.debug("Error processing video %d: %s", idx + 1, e)
                                 import traceback
                                 traceback.print_exc()
+                                # Store failed script record
+                                try:
+                                    # Try to get category from video object
+                                    category_name = str(video.get('category', '')).strip() if video else ''
+                                    if not category_name:
+                                        # Determine category from index
+                                        category_name = _DEFAULT_CATEGORY_NAMES[idx] if idx < len(_DEFAULT_CATEGORY_NAMES) else f"Script {idx + 1}"
+                                    script_number = idx + 1
+                                    error_message = f"Error: {str(e)}"
+                                
+                                    _insert_script_row(writer, blog_id, script_number, _EMPTY_SCRIPT_CONTENT,
+                                                       category_name, 'failed', error=error_message)
+                                except Exception as save_error:
+                                    st.error(f"❌ Error saving failed script record: {str(save_error)}")
+                                    import traceback
+                                    traceback.print_exc()
                     
-                    progress_bar.progress(0.9)
-                    status_text.text("💾 Saving scripts to database...")
+                        # Wait for the writer to acknowledge every row before moving on
+                        actual_saved_count, write_errors = writer.flush()
                     
-                    # Update blog_urls table with total token usage and cost
-                    db.execute_update("""
-                        UPDATE blog_urls
-                        SET input_tokens = ?,
-                            output_tokens = ?,
-                            total_tokens = ?,
-                            input_cost = ?,
-                            output_cost = ?,
-                            total_cost = ?,
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE id = ?
-                    """, (total_input_tokens, total_output_tokens, total_tokens, 
-                          total_input_cost, total_output_cost, total_cost, blog_id))
+                    # Rows the database rejected count as failed scripts; the blog update below still runs
+                    rejected_count = max(len(videos) - actual_saved_count, 0)
+                    if write_errors:
+                        st.error(f"❌ {rejected_count or len(write_errors)} script record(s) could not be saved: {write_errors[0]}")
+                        for write_error in write_errors:
+                            logger.warning("Error saving script record for blog %s: %s", blog_id, write_error)
+                    success_count = min(success_count, actual_saved_count)
+                    
+                    progress.update(0.9, "💾 Saving scripts to database...")
                     
-                    print(f"[DEBUG] Total token usage for blog {blog_id}: Input={total_input_tokens}, Output={total_output_tokens}, Total={total_tokens}")
-                    print(f"[DEBUG] Total cost for blog {blog_id}: Input=${total_input_cost:.6f}, Output=${total_output_cost:.6f}, Total=${total_cost:.6f}")
+                    logger.debug("Total token usage for blog %s: Input=%d, Output=%d, Total=%d", blog_id, total_input_tokens, total_output_tokens, total_tokens)
+                    logger.debug("Total cost for blog %s: Input=$%.6f, Output=$%.6f, Total=$%.6f", blog_id, total_input_cost, total_output_cost, total_cost)
                     
-                    # Verify scripts were saved
-                    saved_scripts_count = db.execute_query("""
-                        SELECT COUNT(*) as count FROM scripts WHERE blog_url_id = ?
-                    """, (blog_id,))
-                    actual_saved_count = saved_scripts_count[0].get('count', 0) if saved_scripts_count and len(saved_scripts_count) > 0 else 0
-                    print(f"[DEBUG] Successfully saved {actual_saved_count} script records to database (expected {len(videos)})")
+                    logger.debug("Successfully saved %d script records to database (expected %d)", actual_saved_count, len(videos))
                     
                     # Update blog URL status - IMPORTANT: This must happen to clear "processing" status
                     try:
@@ -831,92 +1749,69 @@ OR for a single script:
                             new_status = 'completed'
                             notes = None
                         
-                        # Try updating with hash ID first (most common case)
-                        update_result = db.execute_update("""
-                            UPDATE blog_urls 
-                            SET status = ?, 
-                                notes = ?,
-                                updated_at = CURRENT_TIMESTAMP
-                            WHERE id = ?
-                        """, (new_status, notes, blog_id))
-                        print(f"[DEBUG] Attempted to update blog {blog_id} status to '{new_status}'. Update result: {update_result}")
+                        # Token usage, cost and status are written together in one update
+                        blog_update_values = (total_input_tokens, total_output_tokens, total_tokens,
+                                              total_input_cost, total_output_cost, total_cost,
+                                              new_status, notes)
                         
-                        # If update failed with hash ID, try with ObjectId string
-                        if update_result == 0:
-                            blog_details = db.execute_query("SELECT _object_id FROM blog_urls WHERE id = ? LIMIT 1", (blog_id,))
-                            if blog_details and blog_details[0].get('_object_id'):
-                                blog_id_obj = blog_details[0]['_object_id']
-                                update_result = db.execute_update("""
-                                    UPDATE blog_urls 
-                                    SET status = ?, 
-                                        notes = ?,
-                                        updated_at = CURRENT_TIMESTAMP
-                                    WHERE id = ?
-                                """, (new_status, notes, blog_id_obj))
-                                print(f"[DEBUG] Retried update with ObjectId {blog_id_obj}. Update result: {update_result}")
-                                if update_result > 0:
-                                    blog_id = blog_id_obj  # Use ObjectId for verification
+                        # The hash id and the ObjectId both resolve to the same document, so one update covers either
+                        update_result = db.execute_update(_BLOG_URL_UPDATE_SQL, blog_update_values + (blog_id,))
+                        logger.debug("Attempted to update blog %s status to '%s'. Update result: %s", blog_id, new_status, update_result)
                         
-                        # Verify the update worked by querying the database
-                        verify_blog = db.execute_query("SELECT status FROM blog_urls WHERE id = ? LIMIT 1", (blog_id,))
-                        if verify_blog:
-                            actual_status = verify_blog[0].get('status')
-                            if actual_status == new_status:
-                                print(f"[DEBUG] ✅ Status successfully updated: blog {blog_id} status is '{actual_status}'")
-                            elif update_result == 0:
-                                # Status didn't change - this might mean it was already set, or the update failed
-                                print(f"[WARNING] Status update returned 0 rows. Current status: '{actual_status}', Expected: '{new_status}'")
-                                # If status is still 'processing', force update it
-                                if actual_status == 'processing':
-                                    print(f"[DEBUG] Status is still 'processing', forcing update to '{new_status}'")
-                                    # Try direct MongoDB update as last resort
-                                    from bson import ObjectId
-                                    try:
-                                        db_conn = db.get_db_connection()
-                                        collection = db_conn['blog_urls']
-                                        if isinstance(blog_id, str) and len(blog_id) == 24:
-                                            obj_id = ObjectId(blog_id)
-                                        else:
-                                            # Find ObjectId from hash - try to get from blog_details first
-                                            blog_details = db.execute_query("SELECT _object_id FROM blog_urls WHERE id = ? LIMIT 1", (blog_id,))
-                                            if blog_details and blog_details[0].get('_object_id'):
-                                                obj_id = ObjectId(blog_details[0]['_object_id'])
+                        if update_result > 0:
+                            logger.debug("✅ Status set to '%s' for blog %s", new_status, blog_id)
+                        else:
+                            # Update reported no change - read the status back to see whether it landed
+                            verify_blog = db.execute_query("SELECT status FROM blog_urls WHERE id = ? LIMIT 1", (blog_id,))
+                            if verify_blog:
+                                actual_status = verify_blog[0].get('status')
+                                if actual_status == new_status:
+                                    logger.debug("✅ Status successfully updated: blog %s status is '%s'", blog_id, actual_status)
+                                else:
+                                    # Status didn't change - this might mean it was already set, or the update failed
+                                    logger.warning("Status update returned 0 rows. Current status: '%s', Expected: '%s'", actual_status, new_status)
+                                    # If status is still 'processing', force update it
+                                    if actual_status == 'processing':
+                                        logger.debug("Status is still 'processing', forcing update to '%s'", new_status)
+                                        # Try direct MongoDB update as last resort
+                                        from bson import ObjectId
+                                        try:
+                                            db_conn = db.get_db_connection()
+                                            collection = db_conn['blog_urls']
+                                            if isinstance(blog_id, str) and len(blog_id) == 24:
+                                                obj_id = ObjectId(blog_id)
                                             else:
-                                                # Fallback: search all documents
-                                                import hashlib
-                                                for doc in collection.find({}):
-                                                    doc_id = doc.get('_id')
-                                                    if doc_id:
-                                                        # Create hash of ObjectId (matching db_setup._get_consistent_id_hash)
-                                                        doc_id_str = str(doc_id)
-                                                        hash_obj = hashlib.md5(doc_id_str.encode())
-                                                        doc_hash = int(hash_obj.hexdigest()[:8], 16) % (10**9)
-                                                        if doc_hash == blog_id or doc_id_str == str(blog_id):
-                                                            obj_id = doc_id
-                                                            break
+                                                # Find ObjectId from hash - try to get from blog_details first
+                                                blog_details = db.execute_query("SELECT _object_id FROM blog_urls WHERE id = ? LIMIT 1", (blog_id,))
+                                                if blog_details and blog_details[0].get('_object_id'):
+                                                    obj_id = ObjectId(blog_details[0]['_object_id'])
                                                 else:
-                                                    raise ValueError(f"Could not find ObjectId for blog_id {blog_id}")
+                                                    # Fallback: indexed hash lookup
+                                                    doc = collection.find_one({'_hash_id': blog_id}, {'_id': 1})
+                                                    if doc:
+                                                        obj_id = doc['_id']
+                                                    else:
+                                                        raise ValueError(f"Could not find ObjectId for blog_id {blog_id}")
                                         
-                                        result = collection.update_one(
-                                            {'_id': obj_id},
-                                            {'$set': {'status': new_status, 'notes': notes, 'updated_at': datetime.now()}}
-                                        )
-                                        print(f"[DEBUG] Direct MongoDB update result: {result.modified_count} documents modified")
-                                        if result.modified_count > 0:
-                                            update_result = result.modified_count
-                                    except Exception as mongo_error:
-                                        print(f"[DEBUG] Direct MongoDB update failed: {str(mongo_error)}")
+                                            result = collection.update_one(
+                                                {'_id': obj_id},
+                                                {'$set': {'status': new_status, 'notes': notes, 'updated_at': datetime.now()}}
+                                            )
+                                            db.bump_write_version()
+                                            logger.debug("Direct MongoDB update result: %d documents modified", result.modified_count)
+                                            if result.modified_count > 0:
+                                                update_result = result.modified_count
+                                        except Exception as mongo_error:
+                                            logger.debug("Direct MongoDB update failed: %s", mongo_error)
                             else:
-                                print(f"[DEBUG] Status mismatch: Expected '{new_status}' but got '{actual_status}' for blog {blog_id}")
-                        else:
-                            print(f"[WARNING] Could not verify status update - blog {blog_id} not found")
+                                logger.warning("Could not verify status update - blog %s not found", blog_id)
                     except Exception as update_error:
                         st.error(f"❌ Error updating blog status: {str(update_error)}")
-                        print(f"[DEBUG] Exception updating blog status: {str(update_error)}")
+                        logger.debug("Exception updating blog status: %s", update_error)
                         import traceback
                         traceback.print_exc()
                     
-                    progress_bar.progress(1.0)
+                    progress.update(1.0, "", force=True)
                     status_text.empty()
                     
                     if success_count == len(videos):
@@ -938,1369 +1833,207 @@ OR for a single script:
                         if blog_id and 'blog_errors' not in st.session_state:
                             st.session_state.blog_errors = {}
                         if blog_id:
-                            st.session_state.blog_errors[blog_id] = "Failed to generate any scripts."
-                    
-                    st.rerun()
-                    
-                except Exception as e:
-                    # Handle any errors during the entire process
-                    error_msg = f"Error during script generation: {str(e)}"
-                    st.error(f"❌ {error_msg}")
-                    print(f"[DEBUG] Exception in script generation: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
-                    
-                    # Store error in session state for persistence
-                    if blog_id:
-                        st.session_state.blog_errors[blog_id] = error_msg
-                    
-                    # Update blog status to failed if an exception occurs
-                    try:
-                        db.execute_update("""
-                            UPDATE blog_urls 
-                            SET status = 'failed', 
-                                notes = ?,
-                                updated_at = CURRENT_TIMESTAMP
-                            WHERE id = ?
-                        """, (error_msg, blog_id))
-                        print(f"[DEBUG] Updated blog {blog_id} status to 'failed' due to exception")
-                    except Exception as update_error:
-                        print(f"[DEBUG] Error updating blog status: {str(update_error)}")
-                        traceback.print_exc()
-                    if blog_id:
-                        db.execute_update("""
-                            UPDATE blog_urls 
-                            SET status = 'failed', 
-                                notes = ?,
-                                updated_at = CURRENT_TIMESTAMP
-                            WHERE id = ?
-                        """, (error_msg, blog_id))
-                    if 'progress_bar' in locals():
-                        progress_bar.empty()
-                    if 'status_text' in locals():
-                        status_text.empty()
-            else:
-                st.error("Blog URL is required!")
-    
-    # Display table of blog URLs and scripts
-    st.divider()
-    st.subheader("📊 Generated Scripts")
-    
-    # Handle delete operations first (before displaying the table)
-    if 'delete_blog' in st.session_state and st.session_state.delete_blog:
-        blog_id_to_delete = st.session_state.delete_blog
-        
-        # Get script count before deletion
-        scripts_count = db.execute_query("""
-            SELECT COUNT(*) as count FROM scripts WHERE blog_url_id = ?
-        """, (blog_id_to_delete,))
-        script_count = scripts_count[0].get('count', 0) if scripts_count and len(scripts_count) > 0 else 0
-        
-        # Delete blog URL (cascade will delete all scripts, videos, etc.)
-        db.execute_update("DELETE FROM blog_urls WHERE id = ?", (blog_id_to_delete,))
-        st.success(f"✅ Blog URL and all {script_count} associated script(s) deleted successfully!")
-        
-        # Clean up session state - also clear any errors for this blog
-        if 'blog_errors' in st.session_state and blog_id_to_delete in st.session_state.blog_errors:
-            del st.session_state.blog_errors[blog_id_to_delete]
-        del st.session_state.delete_blog
-        if 'pending_delete_blog' in st.session_state:
-            del st.session_state.pending_delete_blog
-        st.rerun()
-    
-    # Handle re-extract metadata
-    if 're_extract_metadata' in st.session_state:
-        blog_id = st.session_state.re_extract_metadata
-        del st.session_state.re_extract_metadata
-        
-        # Get all scripts for this blog that need metadata extraction
-        scripts = db.execute_query("""
-            SELECT id, script_content, title
-            FROM scripts
-            WHERE blog_url_id = ? AND status = 'completed' AND script_content IS NOT NULL
-        """, (blog_id,))
-        
-        from utils.script_metadata_extractor import extract_metadata_from_script
-        
-        updated_count = 0
-        for script in scripts:
-            script_id = script['id']
-            script_content = script['script_content']
-            
-            if script_content and not script_content.startswith('Error:'):
-                # Re-extract metadata
-                metadata = extract_metadata_from_script(script_content)
-                
-                # Update script with new metadata
-                db.execute_update("""
-                    UPDATE scripts
-                    SET youtube_title = ?,
-                        youtube_description = ?,
-                        youtube_keywords = ?,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (
-                    metadata.get('title', '') or None,
-                    metadata.get('description', '') or None,
-                    ', '.join(metadata.get('keywords', [])) if metadata.get('keywords') else None,
-                    script_id
-                ))
-                updated_count += 1
-        
-        st.success(f"✅ Re-extracted metadata for {updated_count} script(s)!")
-        st.rerun()
-    
-    if 'delete_script' in st.session_state and st.session_state.delete_script:
-        script_id_to_delete = st.session_state.delete_script
-        # Delete individual script
-        db.execute_update("DELETE FROM scripts WHERE id = ?", (script_id_to_delete,))
-        st.success("✅ Script deleted successfully!")
-        del st.session_state.delete_script
-        st.rerun()
-    
-    # Process regenerate button clicks
-    if 'regenerate_script' in st.session_state:
-        script_id = st.session_state.regenerate_script
-        with st.spinner("Regenerating script... This may take a moment."):
-            regenerate_script(script_id)
-        del st.session_state.regenerate_script
-        st.rerun()
-    
-    # Handle retry all failed scripts
-    if 'retry_all_failed' in st.session_state and st.session_state.retry_all_failed:
-        with st.spinner("Retrying all failed scripts... This may take several minutes."):
-            retry_all_failed_scripts()
-        st.session_state.retry_all_failed = False
-        st.rerun()
-    
-    # Get all blog URLs with their scripts (include _object_id for reliable updates)
-    # Order by updated_at DESC so newly generated scripts appear at the top
-    blog_urls = db.execute_query("""
-        SELECT id, _object_id, url, status, scripts_generated, created_at, updated_at, notes
-        FROM blog_urls
-        ORDER BY updated_at DESC, created_at DESC
-    """)
-    
-    if not blog_urls:
-        st.info("ℹ️ No blog URLs added yet. Add a blog URL above to generate scripts.")
-    else:
-        # Check if there are any failed scripts
-        failed_scripts_count = 0
-        for blog in blog_urls:
-            scripts = db.execute_query("""
-                SELECT COUNT(*) as count FROM scripts
-                WHERE blog_url_id = ? AND status = ?
-            """, (blog['id'], 'failed'))
-            if scripts and len(scripts) > 0 and scripts[0].get('count', 0) > 0:
-                failed_scripts_count += scripts[0].get('count', 0)
-        
-        # Check for stuck processing statuses
-        stuck_count = 0
-        for blog in blog_urls:
-            if blog['status'] == 'processing':
-                try:
-                    if blog.get('created_at') and blog.get('created_at') != 'N/A':
-                        created_time = datetime.strptime(str(blog.get('created_at'))[:19], '%Y-%m-%d %H:%M:%S')
-                        current_time = datetime.now()
-                        time_diff = (current_time - created_time).total_seconds() / 60  # minutes
-                        if time_diff > 5:  # More than 5 minutes
-                            stuck_count += 1
-                except:
-                    stuck_count += 1
-        
-        # Show action buttons
-        action_cols = st.columns(3)
-        
-        with action_cols[0]:
-            if failed_scripts_count > 0:
-                if st.button("🔄 Retry All Failed", use_container_width=True, type="secondary"):
-                    st.session_state.retry_all_failed = True
-                    st.rerun()
-        
-        with action_cols[1]:
-            if stuck_count > 0:
-                if st.button("🔧 Reset Stuck Processing", use_container_width=True, type="secondary", help="Reset blog URLs stuck in processing status"):
-                    # Reset all stuck processing statuses
-                    reset_count = 0
-                    for blog in blog_urls:
-                        if blog['status'] == 'processing':
-                            try:
-                                if blog.get('created_at') and blog.get('created_at') != 'N/A':
-                                    created_time = datetime.strptime(str(blog.get('created_at'))[:19], '%Y-%m-%d %H:%M:%S')
-                                    current_time = datetime.now()
-                                    time_diff = (current_time - created_time).total_seconds() / 60
-                                    if time_diff > 5:
-                                        # Use ObjectId string if available, otherwise use hash ID
-                                        blog_id = blog.get('_object_id') or blog['id']
-                                        result = db.execute_update("""
-                                            UPDATE blog_urls 
-                                            SET status = 'failed', 
-                                                notes = 'Reset: Script generation was stuck in processing status. You can try generating again.',
-                                                updated_at = CURRENT_TIMESTAMP
-                                            WHERE id = ?
-                                        """, (blog_id,))
-                                        if result > 0:
-                                            reset_count += 1
-                            except Exception as e:
-                                # Use ObjectId string if available, otherwise use hash ID
-                                blog_id = blog.get('_object_id') or blog['id']
-                                result = db.execute_update("""
-                                    UPDATE blog_urls 
-                                    SET status = 'failed', 
-                                        notes = 'Reset: Script generation was stuck in processing status.',
-                                        updated_at = CURRENT_TIMESTAMP
-                                    WHERE id = ?
-                                """, (blog_id,))
-                                if result > 0:
-                                    reset_count += 1
-                    if reset_count > 0:
-                        st.success(f"✅ Reset {reset_count} stuck blog URL(s)! They have been marked as 'failed' and can be regenerated.")
-                        st.rerun()
-                    else:
-                        st.warning("⚠️ Could not reset stuck blog URLs. They may have already been processed or there was an error.")
-        
-        with action_cols[2]:
-            if st.button("🔄 Refresh", use_container_width=True, type="secondary", help="Refresh the page to check latest status"):
-                st.rerun()
-        
-        # Show warnings
-        if failed_scripts_count > 0:
-            st.warning(f"⚠️ {failed_scripts_count} script(s) failed. You can retry them individually or retry all at once.")
-        
-        if stuck_count > 0:
-            st.error(f"⚠️ {stuck_count} blog URL(s) appear to be stuck in processing. Click 'Reset Stuck Processing' to fix them.")
-        
-        # Display blogs with hierarchical structure (main row + sub-rows for scripts)
-        st.markdown("### Generated Scripts")
-        
-        # Get all blog URLs with their scripts
-        blog_urls_with_data = db.execute_query("""
-            SELECT 
-                bu.id, bu.url, bu.status, bu.created_at, bu.updated_at,
-                bu.input_tokens, bu.output_tokens, bu.total_tokens,
-                bu.input_cost, bu.output_cost, bu.total_cost,
-                COUNT(s.id) as script_count
-            FROM blog_urls bu
-            LEFT JOIN scripts s ON bu.id = s.blog_url_id
-            GROUP BY bu.id
-            ORDER BY bu.updated_at DESC, bu.created_at DESC
-        """)
-        
-        if blog_urls_with_data:
-            for blog in blog_urls_with_data:
-                blog_id = blog['id']
-                blog_url = blog['url']
-                blog_status = blog['status']
-                blog_created_at = blog.get('created_at', 'N/A')
-                blog_updated_at = blog.get('updated_at', 'N/A')
-                script_count = blog.get('script_count', 0)
-                
-                # Get token usage and cost for this blog
-                blog_input_tokens = int(blog.get('input_tokens') or 0)
-                blog_output_tokens = int(blog.get('output_tokens') or 0)
-                blog_total_tokens = int(blog.get('total_tokens') or 0)
-                blog_input_cost = float(blog.get('input_cost') or 0.0)
-                blog_output_cost = float(blog.get('output_cost') or 0.0)
-                blog_total_cost = float(blog.get('total_cost') or 0.0)
-                
-                # Get scripts for this blog
-                scripts = db.execute_query("""
-                    SELECT 
-                        id, _object_id as script_object_id, script_number, script_content,
-                        title, caption, category, 
-                        youtube_title, youtube_description, youtube_keywords,
-                        status, error, video_url,
-                        video_file_path, thumbnail_file_path, upload_status,
-                        created_at, updated_at
-                    FROM scripts
-                    WHERE blog_url_id = ?
-                    ORDER BY script_number ASC
-                """, (blog_id,))
-                
-                # Debug: Log script count
-                print(f"[DEBUG] Blog {blog_id}: Found {len(scripts) if scripts else 0} scripts in database")
-                if scripts:
-                    for s in scripts:
-                        print(f"[DEBUG]   - Script {s.get('script_number')}: {s.get('category')} - Status: {s.get('status')} - Error: {s.get('error')}")
-                
-                # Main row for blog URL
-                st.markdown("---")
-                main_cols = st.columns([3.5, 1.5, 1.0])
-                
-                with main_cols[0]:
-                    # Blog URL and status
-                    st.markdown(f"**📄 [{blog_url}]({blog_url})**")
-                    
-                    # Status badge
-                    if blog_status == 'completed':
-                        # Use actual script count from the scripts list, not from the query
-                        actual_script_count = len(scripts) if scripts else 0
-                        completed_scripts = len([s for s in scripts if s.get('status') == 'completed']) if scripts else 0
-                        if actual_script_count > 0:
-                            st.success(f"✅ Completed - {completed_scripts}/{actual_script_count} script(s) generated")
-                        else:
-                            st.success(f"✅ Completed - {completed_scripts} script(s) generated")
-                    elif blog_status == 'processing':
-                        st.info(f"🔄 Processing - Generating scripts...")
-                    elif blog_status == 'failed':
-                        failed_scripts = len([s for s in scripts if s.get('status') == 'failed']) if scripts else 0
-                        st.error(f"❌ Failed - {failed_scripts} script(s) failed")
-                        # Show notes if available
-                        blog_notes = blog.get('notes')
-                        if blog_notes:
-                            st.caption(f"💡 {blog_notes}")
-                    elif blog_status == 'partial':
-                        completed_scripts = len([s for s in scripts if s.get('status') == 'completed']) if scripts else 0
-                        failed_scripts = len([s for s in scripts if s.get('status') == 'failed']) if scripts else 0
-                        st.warning(f"⚠️ Partial - {completed_scripts} succeeded, {failed_scripts} failed")
-                    else:
-                        st.text(f"Status: {blog_status}")
-                    
-                    # Token usage and cost breakdown
-                    if blog_total_tokens > 0:
-                        from utils.cost_calculator import format_cost
-                        st.caption(f"💾 **Tokens:** Input: {blog_input_tokens:,} | Output: {blog_output_tokens:,} | Total: {blog_total_tokens:,}")
-                        st.caption(f"💵 **Cost:** Total: {format_cost(blog_total_cost)} | Input: {format_cost(blog_input_cost)} | Output: {format_cost(blog_output_cost)}")
-                
-                with main_cols[1]:
-                    # Timestamp
-                    if blog_updated_at and blog_updated_at != 'N/A':
-                        try:
-                            if isinstance(blog_updated_at, str):
-                                ts_str = str(blog_updated_at)[:19]
-                            else:
-                                ts_str = str(blog_updated_at)
-                            st.caption(f"**Updated:** {ts_str}")
-                        except:
-                            st.caption(f"**Updated:** {str(blog_updated_at)}")
-                    
-                    if blog_created_at and blog_created_at != 'N/A':
-                        try:
-                            if isinstance(blog_created_at, str):
-                                ts_str = str(blog_created_at)[:19]
-                            else:
-                                ts_str = str(blog_created_at)
-                            st.caption(f"**Created:** {ts_str}")
-                        except:
-                            st.caption(f"**Created:** {str(blog_created_at)}")
-                
-                with main_cols[2]:
-                    # Delete button for entire blog
-                    if 'pending_delete_blog' in st.session_state and st.session_state.pending_delete_blog == blog_id:
-                        # Show confirm/cancel buttons
-                        if st.button("✅ Confirm Delete", key=f"confirm_delete_blog_{blog_id}", use_container_width=True, type="primary"):
-                            # Set delete_blog to trigger the handler
-                            st.session_state.delete_blog = blog_id
-                            if 'pending_delete_blog' in st.session_state:
-                                del st.session_state.pending_delete_blog
-                            st.rerun()
-                        if st.button("❌ Cancel", key=f"cancel_delete_blog_{blog_id}", use_container_width=True):
-                            if 'pending_delete_blog' in st.session_state:
-                                del st.session_state.pending_delete_blog
-                            st.rerun()
-                    else:
-                        if st.button("🗑️ Delete Blog", key=f"delete_blog_{blog_id}", use_container_width=True, type="secondary"):
-                            st.session_state.pending_delete_blog = blog_id
-                            st.rerun()
-                
-                # Sub-rows for scripts (expandable)
-                # Always show scripts section if scripts exist, regardless of blog status
-                if scripts and len(scripts) > 0:
-                    # Determine if we should expand by default (if there are errors or if status is failed)
-                    expand_by_default = blog_status == 'failed' or any(s.get('status') == 'failed' for s in scripts)
-                    with st.expander(f"📋 View {len(scripts)} Script(s)", expanded=expand_by_default):
-                        # Sub-row header (6 columns - Script column is much wider, Status/Error merged, Video/Thumbnail wider)
-                        sub_header_cols = st.columns([1.0, 0.5, 4.0, 2.0, 1.0, 0.5])
-                        sub_headers = ["Category", "Regenerate", "Script", "Video/Thumbnail", "Status/Error", "Timestamp"]
-                        for i, header in enumerate(sub_headers):
-                            if i < len(sub_header_cols):
-                                sub_header_cols[i].markdown(f"**{header}**")
-                        st.markdown("---")
-                        
-                        # Display each script as a sub-row
-                        for script in scripts:
-                            script_id = script['id']
-                            category = script.get('category') or 'N/A'
-                            title = script.get('title') or script.get('youtube_title') or 'N/A'
-                            caption = script.get('caption') or 'N/A'
-                            description = script.get('youtube_description') or 'N/A'
-                            keywords = script.get('youtube_keywords') or 'N/A'
-                            script_content = script.get('script_content') or 'N/A'
-                            
-                            # Get video paths - ensure we're getting fresh data from database
-                            # Handle both None and empty string cases properly
-                            video_file_path = script.get('video_file_path')
-                            if video_file_path is None or (isinstance(video_file_path, str) and video_file_path.strip() == ''):
-                                video_file_path = ''
-                            else:
-                                video_file_path = str(video_file_path).strip()
-                            
-                            thumbnail_file_path = script.get('thumbnail_file_path')
-                            if thumbnail_file_path is None or (isinstance(thumbnail_file_path, str) and thumbnail_file_path.strip() == ''):
-                                thumbnail_file_path = ''
-                            else:
-                                thumbnail_file_path = str(thumbnail_file_path).strip()
-                            
-                            upload_status = script.get('upload_status') or 'not_uploaded'
-                            script_status = script.get('status') or 'N/A'
-                            error = script.get('error') or ''
-                            script_timestamp = script.get('updated_at') or script.get('created_at') or 'N/A'
-                            
-                            # Get blog URL for regenerate
-                            blog_info = db.execute_query("SELECT url FROM blog_urls WHERE id = ?", (blog_id,))
-                            blog_url = blog_info[0]['url'] if blog_info else ''
-                            
-                            # Create sub-row columns (6 columns - Script column is much wider, Status/Error merged, Video/Thumbnail wider)
-                            sub_row_cols = st.columns([1.0, 0.5, 4.0, 2.0, 1.0, 0.5])
-                            
-                            with sub_row_cols[0]:
-                                st.text(category)
-                            
-                            with sub_row_cols[1]:
-                                # Regenerate button for this specific script (icon only, smaller)
-                                if st.button("🔄", key=f"regenerate_script_{script_id}", use_container_width=True, help=f"Regenerate {category} script only"):
-                                    st.session_state.regenerate_script = script_id
-                                    st.rerun()
-                            
-                            with sub_row_cols[2]:
-                                if script_content and script_content != 'N/A':
-                                    # Create container for copy button and view button (smaller copy button)
-                                    script_container_col1, script_container_col2 = st.columns([0.3, 2.7])
-                                    
-                                    with script_container_col1:
-                                        # Escape the script content properly for JavaScript string
-                                        js_escaped_content = json.dumps(script_content)
-                                        
-                                        # Copy button with modern clipboard API (icon only, smaller)
-                                        copy_button_html = f"""
-                                        <div>
-                                            <button id="copy_btn_{script_id}" onclick="copyScript_{script_id}()" style="
-                                                background-color: #1f77b4;
-                                                color: white;
-                                                border: none;
-                                                padding: 4px 8px;
-                                                border-radius: 4px;
-                                                cursor: pointer;
-                                                font-size: 14px;
-                                                width: auto;
-                                                min-width: 35px;
-                                            ">📋</button>
-                                        </div>
-                                        <script>
-                                        async function copyScript_{script_id}() {{
-                                            const scriptContent = {js_escaped_content};
-                                            const button = document.getElementById('copy_btn_{script_id}');
-                                            try {{
-                                                if (navigator.clipboard && navigator.clipboard.writeText) {{
-                                                    await navigator.clipboard.writeText(scriptContent);
-                                                }} else {{
-                                                    const textarea = document.createElement('textarea');
-                                                    textarea.value = scriptContent;
-                                                    textarea.style.position = 'fixed';
-                                                    textarea.style.opacity = '0';
-                                                    document.body.appendChild(textarea);
-                                                    textarea.select();
-                                                    document.execCommand('copy');
-                                                    document.body.removeChild(textarea);
-                                                }}
-                                                const originalText = button.innerHTML;
-                                                button.innerHTML = '✅';
-                                                button.style.backgroundColor = '#28a745';
-                                                setTimeout(function() {{
-                                                    button.innerHTML = originalText;
-                                                    button.style.backgroundColor = '#1f77b4';
-                                                }}, 2000);
-                                            }} catch (err) {{
-                                                button.innerHTML = '❌';
-                                                button.style.backgroundColor = '#dc3545';
-                                                setTimeout(function() {{
-                                                    button.innerHTML = '📋';
-                                                    button.style.backgroundColor = '#1f77b4';
-                                                }}, 2000);
-                                            }}
-                                        }}
-                                        </script>
-                                        """
-                                        st.components.v1.html(copy_button_html, height=30)
-                                    
-                                    with script_container_col2:
-                                        with st.expander("📝 View", expanded=False):
-                                            try:
-                                                script_json = json.loads(script_content)
-                                                st.json(script_json)
-                                            except (json.JSONDecodeError, TypeError):
-                                                st.text_area("", script_content, height=150, key=f"script_view_{script_id}", label_visibility="collapsed")
-                                else:
-                                    st.text("N/A")
-                            
-                            with sub_row_cols[3]:
-                                # ============================================
-                                # VIDEO/THUMBNAIL UPLOAD SECTION - COMPLETE REWRITE
-                                # ============================================
-                                
-                                # Normalize video and thumbnail paths - ensure empty strings are treated as empty
-                                video_path_clean = ''
-                                if video_file_path:
-                                    video_path_str = str(video_file_path).strip()
-                                    if video_path_str and video_path_str != 'None' and video_path_str != 'null':
-                                        video_path_clean = video_path_str
-                                
-                                thumbnail_path_clean = ''
-                                if thumbnail_file_path:
-                                    thumbnail_path_str = str(thumbnail_file_path).strip()
-                                    if thumbnail_path_str and thumbnail_path_str != 'None' and thumbnail_path_str != 'null':
-                                        thumbnail_path_clean = thumbnail_path_str
-                                
-                                # Check if video is uploaded (must have video_file_path)
-                                video_uploaded = bool(video_path_clean)
-                                
-                                # ============================================
-                                # SECTION 1: If video is uploaded, show files + delete option
-                                # ============================================
-                                if video_uploaded:
-                                    # Display uploaded files
-                                    st.caption(f"📹 **Video:**")
-                                    st.caption(f"{os.path.basename(video_path_clean)}")
-                                    
-                                    if thumbnail_path_clean:
-                                        st.caption(f"🖼️ **Thumbnail:**")
-                                        st.caption(f"{os.path.basename(thumbnail_path_clean)}")
-                                    
-                                    st.markdown("---")
-                                    
-                                    # Delete button with simple confirmation
-                                    delete_confirm_key = f"confirm_delete_{script_id}"
-                                    if st.session_state.get(delete_confirm_key, False):
-                                        st.warning("⚠️ **Confirm deletion?**")
-                                        col1, col2 = st.columns(2)
-                                        with col1:
-                                            if st.button("✅ Yes, Delete", key=f"yes_delete_{script_id}", use_container_width=True, type="primary"):
-                                                try:
-                                                    # Delete files from Cloudinary or local storage
-                                                    # Helper function to delete from storage
-                                                    def delete_file_from_storage(file_path: str):
-                                                        if not file_path:
-                                                            return
-                                                        
-                                                        # Check if it's a Cloudinary URL
-                                                        if isinstance(file_path, str) and 'res.cloudinary.com' in file_path:
-                                                            try:
-                                                                # Extract public_id from URL
-                                                                import re
-                                                                pattern = r'res\.cloudinary\.com/[^/]+/(?:video|image)/upload/(?:v\d+/)?(.+?)(?:\.[^.]+)?$'
-                                                                match = re.search(pattern, file_path)
-                                                                if match:
-                                                                    public_id = re.sub(r'\.[^.]+$', '', match.group(1))
-                                                                    resource_type = 'video' if '/video/' in file_path else 'image'
-                                                                    
-                                                                    # Get Cloudinary credentials
-                                                                    cloudinary_creds = config.get_cloudinary_credentials()
-                                                                    if cloudinary_creds and cloudinary_creds.get('cloud_name'):
-                                                                        from utils.cloudinary_storage import configure_cloudinary, delete_file
-                                                                        configure_cloudinary(
-                                                                            cloudinary_creds['cloud_name'],
-                                                                            cloudinary_creds['api_key'],
-                                                                            cloudinary_creds['api_secret']
-                                                                        )
-                                                                        delete_file(public_id, resource_type=resource_type)
-                                                                        print(f"[INFO] Deleted from Cloudinary: {public_id}")
-                                                            except Exception as e:
-                                                                print(f"[WARNING] Could not delete from Cloudinary: {str(e)}")
-                                                        else:
-                                                            # Local file - delete from disk
-                                                            if os.path.exists(file_path):
-                                                                try:
-                                                                    os.remove(file_path)
-                                                                    print(f"[INFO] Deleted local file: {file_path}")
-                                                                except Exception as e:
-                                                                    print(f"[WARNING] Could not delete local file: {str(e)}")
-                                                    
-                                                    # Delete files
-                                                    delete_file_from_storage(video_path_clean)
-                                                    delete_file_from_storage(thumbnail_path_clean)
-                                                    
-                                                    # Delete related records
-                                                    video_records = db.execute_query("SELECT id FROM videos WHERE script_id = ?", (script_id,))
-                                                    for v_rec in video_records:
-                                                        video_id = v_rec.get('id')
-                                                        if video_id:
-                                                            db.execute_update("DELETE FROM social_media_posts WHERE video_id = ?", (video_id,))
-                                                            db.execute_update("DELETE FROM videos WHERE id = ?", (video_id,))
-                                                    
-                                                    # Clear video paths - use _object_id for reliable update
-                                                    script_object_id = script.get('_object_id') or script.get('script_object_id')
-                                                    update_id = script_object_id if script_object_id else script_id
-                                                    
-                                                    affected = db.execute_update("""
-                                                        UPDATE scripts 
-                                                        SET video_file_path = NULL, 
-                                                            thumbnail_file_path = NULL,
-                                                            upload_status = 'not_uploaded',
-                                                            updated_at = CURRENT_TIMESTAMP
-                                                        WHERE id = ?
-                                                    """, (update_id,))
-                                                    
-                                                    # Fallback to script_id if _object_id didn't work
-                                                    if affected == 0:
-                                                        affected = db.execute_update("""
-                                                            UPDATE scripts 
-                                                            SET video_file_path = NULL, 
-                                                                thumbnail_file_path = NULL,
-                                                                upload_status = 'not_uploaded',
-                                                                updated_at = CURRENT_TIMESTAMP
-                                                            WHERE id = ?
-                                                        """, (script_id,))
-                                                    
-                                                    # Clear all session state for this script
-                                                    keys_to_clear = [k for k in list(st.session_state.keys()) if str(script_id) in str(k)]
-                                                    for key in keys_to_clear:
-                                                        try:
-                                                            del st.session_state[key]
-                                                        except:
-                                                            pass
-                                                    
-                                                    if affected > 0:
-                                                        st.success("✅ Video deleted! Upload section will appear below.")
-                                                    else:
-                                                        st.error("❌ Database update failed. Please refresh the page manually.")
-                                                    
-                                                    st.rerun()
-                                                except Exception as e:
-                                                    st.error(f"❌ Error: {str(e)}")
-                                        
-                                        with col2:
-                                            if st.button("❌ Cancel", key=f"cancel_delete_{script_id}", use_container_width=True):
-                                                if delete_confirm_key in st.session_state:
-                                                    del st.session_state[delete_confirm_key]
-                                                st.rerun()
-                                    else:
-                                        if st.button("🗑️ Delete", key=f"delete_btn_{script_id}", use_container_width=True, type="secondary"):
-                                            st.session_state[delete_confirm_key] = True
-                                            st.rerun()
-                                    
-                                    # Show option to replace video
-                                    st.markdown("---")
-                                    if st.button("🔄 Replace Video", key=f"replace_video_{script_id}", use_container_width=True):
-                                        st.session_state[f'show_replace_{script_id}'] = True
-                                        st.rerun()
-                                
-                                # ============================================
-                                # SECTION 2: Upload section (shown when no video OR when replacing)
-                                # ============================================
-                                if not video_uploaded or st.session_state.get(f'show_replace_{script_id}', False):
-                                    # Show cancel replace button if replacing
-                                    if st.session_state.get(f'show_replace_{script_id}', False):
-                                        if st.button("❌ Cancel Replace", key=f"cancel_replace_{script_id}", use_container_width=True):
-                                            del st.session_state[f'show_replace_{script_id}']
-                                            st.rerun()
-                                    
-                                    # Upload section
-                                    uploaded_video = st.file_uploader("📹 Upload Video", key=f"video_upload_{script_id}", type=['mp4', 'mov', 'avi', 'webm'], help="Upload video file")
-                                    
-                                    # Initialize session state for frame selection
-                                    frame_key = f"selected_frame_{script_id}"
-                                    frames_key = f"extracted_frames_{script_id}"
-                                    temp_video_key = f"temp_video_path_{script_id}"
-                                    
-                                    # Handle video upload and frame extraction
-                                    if uploaded_video is not None:
-                                        # Save video temporarily to extract frames
-                                        uploads_dir = os.path.join(os.getcwd(), "uploads", "videos")
-                                        os.makedirs(uploads_dir, exist_ok=True)
-                                        
-                                        temp_video_path = os.path.join(uploads_dir, f"temp_{script_id}_{uploaded_video.name}")
-                                        
-                                        # Check if this is a new upload (different from stored temp path)
-                                        if temp_video_key not in st.session_state or st.session_state[temp_video_key] != temp_video_path:
-                                            # Save video temporarily
-                                            with open(temp_video_path, "wb") as f:
-                                                f.write(uploaded_video.getbuffer())
-                                            st.session_state[temp_video_path] = temp_video_path
-                                            
-                                            # Extract frames
-                                            try:
-                                                from utils.video_frame_extractor import extract_frames_from_video
-                                                
-                                                with st.spinner("Extracting frames from video..."):
-                                                    frames = extract_frames_from_video(temp_video_path, num_frames=12)
-                                                    st.session_state[frames_key] = frames
-                                                    st.session_state[temp_video_key] = temp_video_path
-                                                
-                                                st.success(f"✅ Extracted {len(frames)} frames from video")
-                                            except ImportError as e:
-                                                st.warning("⚠️ OpenCV not installed. Install with: pip install opencv-python")
-                                                st.session_state[frames_key] = []
-                                            except Exception as e:
-                                                st.error(f"❌ Error extracting frames: {str(e)}")
-                                                st.session_state[frames_key] = []
-                                        
-                                        # Display frames for selection
-                                        if frames_key in st.session_state and st.session_state[frames_key]:
-                                            frames = st.session_state[frames_key]
-                                            
-                                            st.markdown("**🎬 Select Thumbnail from Video Frames:**")
-                                            
-                                            # Display frames in a grid with selection buttons
-                                            num_cols = 4
-                                            num_rows = (len(frames) + num_cols - 1) // num_cols
-                                            
-                                            # Show currently selected frame if any
-                                            current_selection = st.session_state.get(frame_key, None)
-                                            
-                                            for row in range(num_rows):
-                                                cols = st.columns(num_cols)
-                                                for col_idx in range(num_cols):
-                                                    frame_idx = row * num_cols + col_idx
-                                                    if frame_idx < len(frames):
-                                                        with cols[col_idx]:
-                                                            frame_path = frames[frame_idx]
-                                                            
-                                                            # Skip if frame file doesn't exist (was deleted)
-                                                            if not os.path.exists(frame_path):
-                                                                continue
-                                                            
-                                                            frame_name = os.path.basename(frame_path)
-                                                            # Extract timestamp from filename (format: frame_XXXXXX_TIMESTAMPs.jpg)
-                                                            try:
-                                                                parts = frame_name.split('_')
-                                                                if len(parts) >= 3:
-                                                                    timestamp = parts[2].replace('s.jpg', '')
-                                                                else:
-                                                                    timestamp = f"{frame_idx}"
-                                                            except:
-                                                                timestamp = f"{frame_idx}"
-                                                            
-                                                            # Display frame with selection button
-                                                            try:
-                                                                from PIL import Image
-                                                                img = Image.open(frame_path)
-                                                                
-                                                                # Highlight selected frame
-                                                                is_current_selection = current_selection == frame_path
-                                                                border_color = "#00ff00" if is_current_selection else "transparent"
-                                                                
-                                                                st.image(img, use_container_width=True, caption=f"Frame at {timestamp}s")
-                                                                
-                                                                # Selection button
-                                                                button_label = "✅ Selected" if is_current_selection else "Select"
-                                                                button_type = "primary" if is_current_selection else "secondary"
-                                                                
-                                                                if st.button(button_label, key=f"select_frame_{script_id}_{frame_idx}", use_container_width=True, type=button_type):
-                                                                    st.session_state[frame_key] = frame_path
-                                                                    
-                                                                    # Delete remaining frames (except the selected one)
-                                                                    if frames_key in st.session_state:
-                                                                        remaining_frames = st.session_state[frames_key]
-                                                                        for remaining_frame in remaining_frames:
-                                                                            if remaining_frame != frame_path and os.path.exists(remaining_frame):
-                                                                                try:
-                                                                                    os.remove(remaining_frame)
-                                                                                except Exception as e:
-                                                                                    print(f"Warning: Could not delete frame {remaining_frame}: {str(e)}")
-                                                                        
-                                                                        # Update session state to only keep the selected frame
-                                                                        st.session_state[frames_key] = [frame_path]
-                                                                    
-                                                                    st.rerun()
-                                                            except Exception as e:
-                                                                st.error(f"Error loading frame: {str(e)}")
-                                                    
-                                                    # Add spacing for empty columns
-                                                    if frame_idx >= len(frames):
-                                                        with cols[col_idx]:
-                                                            st.empty()
-                                            
-                                            # Show selected frame info
-                                            if frame_key in st.session_state and st.session_state[frame_key]:
-                                                selected_frame = st.session_state[frame_key]
-                                                selected_name = os.path.basename(selected_frame)
-                                                try:
-                                                    parts = selected_name.split('_')
-                                                    if len(parts) >= 3:
-                                                        timestamp = parts[2].replace('s.jpg', '')
-                                                    else:
-                                                        timestamp = "unknown"
-                                                except:
-                                                    timestamp = "unknown"
-                                                st.success(f"✅ Selected thumbnail: Frame at {timestamp}s")
-                                        
-                                        # Manual thumbnail upload option (fallback)
-                                        st.markdown("---")
-                                        st.caption("Or upload a custom thumbnail:")
-                                        uploaded_thumbnail = st.file_uploader("Custom Thumbnail", key=f"thumbnail_upload_{script_id}", type=['jpg', 'jpeg', 'png', 'webp'], help="Upload a custom thumbnail image")
-                                        
-                                        if st.button("📤 Upload Video & Thumbnail", key=f"upload_btn_{script_id}", use_container_width=True, type="primary"):
-                                            video_path = None
-                                            thumbnail_path = None
-                                            video_storage_type = 'local'
-                                            thumbnail_storage_type = 'local'
-                                            
-                                            # Upload video file (use temp path if available, otherwise use uploaded file)
-                                            if uploaded_video:
-                                                if temp_video_key in st.session_state and os.path.exists(st.session_state[temp_video_key]):
-                                                    # Use the temp video file
-                                                    temp_path = st.session_state[temp_video_key]
-                                                    with open(temp_path, "rb") as f:
-                                                        video_bytes = f.read()
-                                                    
-                                                    # Clean up temp file
-                                                    try:
-                                                        os.remove(temp_path)
-                                                    except:
-                                                        pass
-                                                else:
-                                                    # Use uploaded video bytes
-                                                    video_bytes = uploaded_video.getbuffer()
-                                                
-                                                video_filename = f"script_{script_id}_video_{int(datetime.now().timestamp())}_{uploaded_video.name}"
-                                                
-                                                # Upload to Cloudinary or local storage
-                                                with st.spinner("📤 Uploading video..."):
-                                                    video_path, video_storage_type, cloudinary_video_url = upload_to_storage(
-                                                        video_bytes,
-                                                        video_filename,
-                                                        resource_type='video'
-                                                    )
-                                                
-                                                if video_storage_type == 'cloudinary':
-                                                    st.success(f"✅ Video uploaded to Cloudinary: {uploaded_video.name}")
-                                                    st.info(f"🌐 Cloudinary URL: {cloudinary_video_url[:80]}...")
-                                                else:
-                                                    st.success(f"✅ Video uploaded: {uploaded_video.name}")
-                                                    st.caption(f"💾 Stored locally: {video_path}")
-                                            
-                                            # Save thumbnail (prefer selected frame, then uploaded thumbnail)
-                                            if frame_key in st.session_state and st.session_state[frame_key]:
-                                                # Use selected frame as thumbnail
-                                                selected_frame = st.session_state[frame_key]
-                                                
-                                                # Read frame bytes
-                                                with open(selected_frame, "rb") as f:
-                                                    thumbnail_bytes = f.read()
-                                                
-                                                thumbnail_filename = f"script_{script_id}_thumbnail_{int(datetime.now().timestamp())}.jpg"
-                                                
-                                                # Upload to Cloudinary or local storage
-                                                with st.spinner("📤 Uploading thumbnail..."):
-                                                    thumbnail_path, thumbnail_storage_type, cloudinary_thumbnail_url = upload_to_storage(
-                                                        thumbnail_bytes,
-                                                        thumbnail_filename,
-                                                        resource_type='image'
-                                                    )
-                                                
-                                                if thumbnail_storage_type == 'cloudinary':
-                                                    st.success(f"✅ Thumbnail uploaded to Cloudinary")
-                                                    st.info(f"🌐 Cloudinary URL: {cloudinary_thumbnail_url[:80]}...")
-                                                else:
-                                                    st.success(f"✅ Thumbnail selected from video frame")
-                                                    st.caption(f"💾 Stored locally: {thumbnail_path}")
-                                                
-                                                # Clean up extracted frames and frame directory
-                                                if frames_key in st.session_state:
-                                                    frames_to_clean = st.session_state[frames_key]
-                                                    frame_dir = None
-                                                    
-                                                    # Delete all remaining frame files
-                                                    for frame in frames_to_clean:
-                                                        try:
-                                                            if os.path.exists(frame):
-                                                                # Get the frame directory (should be the same for all frames)
-                                                                if frame_dir is None:
-                                                                    frame_dir = os.path.dirname(frame)
-                                                                # Delete the frame file
-                                                                os.remove(frame)
-                                                        except Exception as e:
-                                                            print(f"Warning: Could not delete frame {frame}: {str(e)}")
-                                                    
-                                                    # Delete the frame directory if it exists and is empty
-                                                    if frame_dir and os.path.exists(frame_dir):
-                                                        try:
-                                                            import shutil
-                                                            # Try to remove the directory (will only work if empty)
-                                                            try:
-                                                                os.rmdir(frame_dir)
-                                                            except OSError:
-                                                                # Directory not empty, try to remove all contents
-                                                                shutil.rmtree(frame_dir, ignore_errors=True)
-                                                        except Exception as e:
-                                                            print(f"Warning: Could not delete frame directory {frame_dir}: {str(e)}")
-                                                    
-                                                    del st.session_state[frames_key]
-                                                
-                                                if frame_key in st.session_state:
-                                                    del st.session_state[frame_key]
-                                                if temp_video_key in st.session_state:
-                                                    del st.session_state[temp_video_key]
-                                                    
-                                            elif uploaded_thumbnail:
-                                                # Use uploaded thumbnail
-                                                thumbnail_bytes = uploaded_thumbnail.getbuffer()
-                                                thumbnail_filename = f"script_{script_id}_thumbnail_{int(datetime.now().timestamp())}_{uploaded_thumbnail.name}"
-                                                
-                                                # Upload to Cloudinary or local storage
-                                                with st.spinner("📤 Uploading thumbnail..."):
-                                                    thumbnail_path, thumbnail_storage_type, cloudinary_thumbnail_url = upload_to_storage(
-                                                        thumbnail_bytes,
-                                                        thumbnail_filename,
-                                                        resource_type='image'
-                                                    )
-                                                
-                                                if thumbnail_storage_type == 'cloudinary':
-                                                    st.success(f"✅ Thumbnail uploaded to Cloudinary: {uploaded_thumbnail.name}")
-                                                    st.info(f"🌐 Cloudinary URL: {cloudinary_thumbnail_url[:80]}...")
-                                                else:
-                                                    st.success(f"✅ Thumbnail uploaded: {uploaded_thumbnail.name}")
-                                                    st.caption(f"💾 Stored locally: {thumbnail_path}")
-                                            
-                                            # Copy title, description, and keywords directly from the script row (same as displayed in script generation page)
-                                            # Get the current script data to copy the values
-                                            script_title = script.get('title') or script.get('youtube_title') or None
-                                            script_description = script.get('youtube_description') or None
-                                            script_keywords = script.get('youtube_keywords') or None
-                                            
-                                            # Use the values from the script row directly (no extraction)
-                                            final_title = script_title
-                                            final_description = script_description if script_description and script_description != 'N/A' else None
-                                            final_keywords = script_keywords if script_keywords and script_keywords != 'N/A' else None
-                                            
-                                            # Update database - use _object_id for reliable update
-                                            script_object_id = script.get('_object_id') or script.get('script_object_id')
-                                            update_id = script_object_id if script_object_id else script_id
-                                            
-                                            # Only set upload_status = 'uploaded' if video_file_path exists (video is uploaded)
-                                            # Copy title, description, keywords from script row to ensure they're saved
-                                            db.execute_update("""
-                                                UPDATE scripts 
-                                                SET video_file_path = ?,
-                                                    thumbnail_file_path = ?,
-                                                    upload_status = ?,
-                                                    youtube_title = ?,
-                                                    youtube_description = ?,
-                                                    youtube_keywords = ?,
-                                                    updated_at = CURRENT_TIMESTAMP
-                                                WHERE id = ?
-                                            """, (
-                                                video_path,
-                                                thumbnail_path,
-                                                'uploaded' if video_path else 'not_uploaded',
-                                                final_title,  # Copy title from script row
-                                                final_description,  # Copy description from script row
-                                                final_keywords,  # Copy keywords from script row
-                                                update_id
-                                            ))
-                                            
-                                            # Clear replace flag if it was set
-                                            if f'show_replace_{script_id}' in st.session_state:
-                                                del st.session_state[f'show_replace_{script_id}']
-                                            
-                                            # Clear all video upload session state
-                                            upload_keys = [k for k in st.session_state.keys() if f'video_upload_{script_id}' in str(k) or f'selected_frame_{script_id}' in str(k) or f'extracted_frames_{script_id}' in str(k) or f'temp_video_path_{script_id}' in str(k) or f'thumbnail_upload_{script_id}' in str(k)]
-                                            for key in upload_keys:
-                                                try:
-                                                    del st.session_state[key]
-                                                except:
-                                                    pass
-                                            
-                                            st.rerun()
-                                    else:
-                                        # No video uploaded - show manual thumbnail upload option
-                                        uploaded_thumbnail = st.file_uploader("Thumbnail", key=f"thumbnail_upload_{script_id}", type=['jpg', 'jpeg', 'png', 'webp'], help="Upload thumbnail image")
-                                        
-                                        if uploaded_thumbnail:
-                                            if st.button("📤 Upload Thumbnail", key=f"upload_thumbnail_btn_{script_id}", use_container_width=True, type="primary"):
-                                                # Create uploads directory if it doesn't exist
-                                                uploads_dir = os.path.join(os.getcwd(), "uploads", "videos")
-                                                os.makedirs(uploads_dir, exist_ok=True)
-                                                
-                                                thumbnail_filename = f"script_{script_id}_thumbnail_{int(datetime.now().timestamp())}_{uploaded_thumbnail.name}"
-                                                thumbnail_path = os.path.join(uploads_dir, thumbnail_filename)
-                                                
-                                                with open(thumbnail_path, "wb") as f:
-                                                    f.write(uploaded_thumbnail.getbuffer())
-                                                
-                                                # Update database
-                                                db.execute_update("""
-                                                    UPDATE scripts 
-                                                    SET thumbnail_file_path = ?,
-                                                        updated_at = CURRENT_TIMESTAMP
-                                                    WHERE id = ?
-                                                """, (thumbnail_path, script_id))
-                                                
-                                                st.success(f"✅ Thumbnail uploaded: {uploaded_thumbnail.name}")
-                                                st.rerun()
-                            
-                            with sub_row_cols[4]:
-                                # Merged Status/Error column - show error if present, otherwise show status
-                                if error:
-                                    error_display = str(error)
-                                    if len(error_display) > 30:
-                                        with st.expander(f"❌ Error ({len(error_display)} chars)", expanded=False):
-                                            st.error(error_display)
-                                            
-                                            # If error contains API response debug info, format it nicely
-                                            if "🔍 ACTUAL API RESPONSE:" in error_display:
-                                                st.divider()
-                                                st.warning("**🔍 Debugging Information:**")
-                                                # Extract and display the API response part
-                                                parts = error_display.split("🔍 ACTUAL API RESPONSE:")
-                                                if len(parts) > 1:
-                                                    st.code(parts[1], language="text")
-                                                    st.info("💡 **Fix:** Update your master prompt to return JSON with these exact fields: `title`, `caption`, `description` (or `short_description`), and `script`. All fields must contain actual text (not empty strings). See Settings → Master Prompt → Format Guide for details.")
-                                            else:
-                                                st.code(error_display, language=None)
-                                    else:
-                                        st.error(error_display)
-                                else:
-                                    # Show status if no error
-                                    status_text = ""
-                                    if script_status == 'completed':
-                                        if upload_status == 'uploaded':
-                                            status_text = "✅ Video Uploaded"
-                                        else:
-                                            status_text = "✅ Script Generated"
-                                        st.success(status_text)
-                                    elif script_status == 'failed':
-                                        status_text = "❌ Script Failed"
-                                        st.error(status_text)
-                                    elif script_status == 'pending':
-                                        status_text = "⏳ Generating..."
-                                        st.info(status_text)
-                                    else:
-                                        status_text = script_status
-                                        st.text(status_text)
-                            
-                            with sub_row_cols[5]:
-                                if script_timestamp and script_timestamp != 'N/A':
-                                    try:
-                                        if isinstance(script_timestamp, str):
-                                            ts_str = str(script_timestamp)[:16]
-                                        else:
-                                            ts_str = str(script_timestamp)
-                                        st.caption(ts_str)
-                                    except:
-                                        st.caption(str(script_timestamp))
-                                else:
-                                    st.caption('N/A')
-                            
-                            st.markdown("---")
-                else:
-                    # No scripts yet - but check if blog status indicates what happened
-                    if blog_status == 'processing':
-                        st.info("⏳ Scripts are being generated... Please wait.")
-                    elif blog_status == 'failed':
-                        st.error("❌ Script generation failed. Check the error message above or try regenerating.")
-                        # Show a button to retry
-                        if st.button("🔄 Retry Script Generation", key=f"retry_blog_{blog_id}", use_container_width=True):
-                            # Reset status and trigger regeneration
-                            db.execute_update("""
-                                UPDATE blog_urls 
-                                SET status = 'pending', 
-                                    notes = NULL,
-                                    updated_at = CURRENT_TIMESTAMP
-                                WHERE id = ?
-                            """, (blog_id,))
-                            st.rerun()
-                    else:
-                        st.warning("⚠️ No scripts generated yet. Click 'Generate Scripts' to create scripts.")
-                
-                st.markdown("")
-        else:
-            st.info("ℹ️ No blog URLs added yet. Add a blog URL above to generate scripts.")
-        
-        # Legacy display (keep for reference but hide it)
-        # Display each blog URL as a main row with expandable sub-rows for scripts
-        if False:  # Disabled - using flat table above
-            for blog in blog_urls:
-                blog_id = blog['id']
-                blog_url = blog['url']
-                blog_status = blog['status']
-                blog_created_at = blog.get('created_at', 'N/A')
-                blog_updated_at = blog.get('updated_at', 'N/A')
-                
-                # Get scripts for this blog
-                scripts = db.execute_query("""
-                    SELECT id, script_number, script_content, title, caption, category, status,
-                           youtube_title, youtube_description, youtube_keywords,
-                           input_tokens, output_tokens, total_tokens,
-                           input_cost, output_cost, total_cost,
-                           updated_at, created_at, error, video_url
-                    FROM scripts
-                    WHERE blog_url_id = ?
-                    ORDER BY script_number ASC
-                """, (blog_id,))
-            
-            # Get blog token usage and cost
-            blog_token_info = db.execute_query("""
-                SELECT input_tokens, output_tokens, total_tokens,
-                       input_cost, output_cost, total_cost
-                FROM blog_urls
-                WHERE id = ?
-            """, (blog_id,))
-            
-            # Get token usage and cost from blog_urls table, defaulting to 0 if not found or None
-            if blog_token_info and len(blog_token_info) > 0:
-                blog_input_tokens = int(blog_token_info[0].get('input_tokens') or 0)
-                blog_output_tokens = int(blog_token_info[0].get('output_tokens') or 0)
-                blog_total_tokens = int(blog_token_info[0].get('total_tokens') or 0)
-                blog_input_cost = float(blog_token_info[0].get('input_cost') or 0.0)
-                blog_output_cost = float(blog_token_info[0].get('output_cost') or 0.0)
-                blog_total_cost = float(blog_token_info[0].get('total_cost') or 0.0)
-            else:
-                blog_input_tokens = 0
-                blog_output_tokens = 0
-                blog_total_tokens = 0
-                blog_input_cost = 0.0
-                blog_output_cost = 0.0
-                blog_total_cost = 0.0
-            
-            # Check if processing has been stuck for more than 30 minutes
-            if blog_status == 'processing':
-                # Check how long it's been processing
-                try:
-                    if blog_created_at and blog_created_at != 'N/A':
-                        created_time = datetime.strptime(str(blog_created_at)[:19], '%Y-%m-%d %H:%M:%S')
-                        current_time = datetime.now()
-                        time_diff = (current_time - created_time).total_seconds() / 60  # minutes
-                        
-                        # If stuck for more than 30 minutes, mark as likely failed
-                        if time_diff > 30:
-                            # Update status to failed
+                            st.session_state.blog_errors[blog_id] = "Failed to generate any scripts."
+                    
+                    st.rerun()
+                    
+                except Exception as e:
+                    # Handle any errors during the entire process
+                    error_msg = f"Error during script generation: {str(e)}"
+                    st.error(f"❌ {error_msg}")
+                    logger.debug("Exception in script generation: %s", e)
+                    import traceback
+                    traceback.print_exc()
+                    
+                    # Store error in session state for persistence
+                    if blog_id:
+                        st.session_state.blog_errors[blog_id] = error_msg
+                    
+                    # Update blog status to failed if an exception occurs
+                    if blog_id:
+                        try:
                             db.execute_update("""
                                 UPDATE blog_urls 
                                 SET status = 'failed', 
-                                    notes = 'Script generation appears to have failed or timed out. Status was stuck in processing for over 30 minutes.',
+                                    notes = ?,
                                     updated_at = CURRENT_TIMESTAMP
                                 WHERE id = ?
-                            """, (blog_id,))
-                            display_status = "❌ Timeout - Generation Failed"
-                            status_timestamp = blog_updated_at
-                            st.warning(f"⚠️ Blog URL {blog_id} was stuck in processing and has been marked as failed. You can try regenerating.")
-                        else:
-                            display_status = f"🔄 Processing... ({int(time_diff)} min)"
-                            status_timestamp = blog_created_at
-                    else:
-                        display_status = "🔄 Blog URL Added"
-                        status_timestamp = blog_created_at
-                except Exception as e:
-                    # If we can't parse the timestamp, just show processing
-                    display_status = "🔄 Blog URL Added"
-                    status_timestamp = blog_created_at
-            elif blog_status == 'completed':
-                if scripts:
-                    total_scripts = len(scripts)
-                    completed_count = sum(1 for s in scripts if s['status'] == 'completed')
-                    failed_count = sum(1 for s in scripts if s['status'] == 'failed')
-                    if failed_count > 0:
-                        display_status = f"✅ {completed_count}/{total_scripts} Scripts Generated ({failed_count} failed)"
-                    else:
-                        display_status = f"✅ {completed_count}/{total_scripts} Scripts Generated"
-                    status_timestamp = max([s.get('updated_at', blog_updated_at) for s in scripts] + [blog_updated_at])
-                else:
-                    display_status = "🔄 Blog URL Added"
-                    status_timestamp = blog_created_at
-            elif blog_status == 'failed':
-                display_status = "❌ Error"
-                status_timestamp = blog_updated_at
+                            """, (error_msg, blog_id))
+                            logger.debug("Updated blog %s status to 'failed' due to exception", blog_id)
+                        except Exception as update_error:
+                            logger.debug("Error updating blog status: %s", update_error)
+                            traceback.print_exc()
+                    if 'progress_bar' in locals():
+                        progress_bar.empty()
+                    if 'status_text' in locals():
+                        status_text.empty()
             else:
-                display_status = blog_status
-                status_timestamp = blog_updated_at
-            
-            # Main row for blog URL
-            main_cols = st.columns([2.5, 1.2, 1.2, 1.5, 1])
-            
-            with main_cols[0]:
-                st.markdown(f"**📄 {blog_url}**")
-                # Show token usage and cost below URL
-                if blog_total_tokens > 0:
-                    from utils.cost_calculator import format_cost
-                    st.caption(f"💰 Tokens: Input={blog_input_tokens:,} | Output={blog_output_tokens:,} | Total={blog_total_tokens:,}")
-                    if blog_total_cost > 0:
-                        st.caption(f"💵 Cost: {format_cost(blog_total_cost)} (Input: {format_cost(blog_input_cost)}, Output: {format_cost(blog_output_cost)})")
-            
-            with main_cols[1]:
-                if display_status.startswith("✅"):
-                    st.success(display_status)
-                elif display_status.startswith("🔄"):
-                    st.info(display_status)
-                elif display_status.startswith("❌"):
-                    st.error(display_status)
-                else:
-                    st.text(display_status)
-            
-            with main_cols[2]:
-                # Format timestamp
-                if status_timestamp and status_timestamp != 'N/A':
-                    try:
-                        if isinstance(status_timestamp, str):
-                            ts_str = str(status_timestamp)[:19]
-                        else:
-                            ts_str = str(status_timestamp)
-                        st.caption(f"Updated: {ts_str}")
-                    except:
-                        st.caption(f"Updated: {str(status_timestamp)}")
-                else:
-                    st.caption('N/A')
-            
-            with main_cols[3]:
-                # Show token usage and cost summary
-                if blog_total_tokens > 0:
-                    from utils.cost_calculator import format_cost
-                    st.info(f"📊 **Usage Summary**\n\n**Tokens:**\nInput: {blog_input_tokens:,}\nOutput: {blog_output_tokens:,}\nTotal: {blog_total_tokens:,}\n\n**Cost:**\nTotal: {format_cost(blog_total_cost)}\nInput: {format_cost(blog_input_cost)}\nOutput: {format_cost(blog_output_cost)}")
-            
-            with main_cols[4]:
-                # Delete button for entire blog with confirmation
-                if 'pending_delete_blog' in st.session_state and st.session_state.pending_delete_blog == blog_id:
-                    # Show confirm/cancel buttons
-                    col_confirm, col_cancel = st.columns(2)
-                    with col_confirm:
-                        if st.button("✅ Confirm", key=f"confirm_blog_{blog_id}", use_container_width=True, type="primary"):
-                            st.session_state.delete_blog = blog_id
-                            if 'pending_delete_blog' in st.session_state:
-                                del st.session_state.pending_delete_blog
-                            st.rerun()
-                    with col_cancel:
-                        if st.button("❌ Cancel", key=f"cancel_blog_{blog_id}", use_container_width=True):
-                            if 'pending_delete_blog' in st.session_state:
-                                del st.session_state.pending_delete_blog
-                            st.rerun()
-                else:
-                    if st.button("🗑️ Delete", key=f"delete_blog_{blog_id}", use_container_width=True, type="secondary"):
-                        st.session_state.pending_delete_blog = blog_id
+                st.error("Blog URL is required!")
+    
+    # Display table of blog URLs and scripts
+    st.divider()
+    st.subheader("📊 Generated Scripts")
+    
+    # Handle delete operations first (before displaying the table)
+    blog_id_to_delete = st.session_state.pop('delete_blog', None)
+    if blog_id_to_delete:
+        
+        # Get script count before deletion
+        scripts_count = db.execute_query("""
+            SELECT COUNT(*) as count FROM scripts WHERE blog_url_id = ?
+        """, (blog_id_to_delete,))
+        script_count = scripts_count[0].get('count', 0) if scripts_count and len(scripts_count) > 0 else 0
+        
+        # Delete blog URL (cascade will delete all scripts, videos, etc.)
+        db.execute_update("DELETE FROM blog_urls WHERE id = ?", (blog_id_to_delete,))
+        st.success(f"✅ Blog URL and all {script_count} associated script(s) deleted successfully!")
+        
+        # Clean up session state - also clear any errors for this blog
+        st.session_state.get('blog_errors', {}).pop(blog_id_to_delete, None)
+        st.session_state.pop('pending_delete_blog', None)
+        st.session_state['_needs_rerun'] = True
+    
+    # Handle re-extract metadata
+    blog_id = st.session_state.pop('re_extract_metadata', None)
+    if blog_id is not None:
+        
+        # Get all scripts for this blog that need metadata extraction
+        scripts = db.execute_query("""
+            SELECT id, script_content, title
+            FROM scripts
+            WHERE blog_url_id = ? AND status = ?
+        """, (blog_id, 'completed'))
+        
+        from utils.script_metadata_extractor import extract_metadata_from_script
+        
+        scripts = [s for s in scripts if s['script_content'] and not s['script_content'].startswith('Error:')]
+        contents = [s['script_content'] for s in scripts]
+        
+        # Re-extract metadata
+        metadatas = [extract_metadata_from_script(content) for content in contents]
+        
+        metadata_rows = [
+            (
+                metadata.get('title', '') or None,
+                metadata.get('description', '') or None,
+                ', '.join(metadata.get('keywords', [])) if metadata.get('keywords') else None,
+                script['id']
+            )
+            for script, metadata in zip(scripts, metadatas)
+        ]
+        
+        # Update all scripts with their new metadata in one bulk write
+        with db.transaction():
+            db.execute_update_many("""
+                UPDATE scripts
+                SET youtube_title = ?,
+                    youtube_description = ?,
+                    youtube_keywords = ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, metadata_rows)
+        updated_count = len(metadata_rows)
+        
+        st.success(f"✅ Re-extracted metadata for {updated_count} script(s)!")
+        st.session_state['_needs_rerun'] = True
+    
+    script_id_to_delete = st.session_state.pop('delete_script', None)
+    if script_id_to_delete:
+        # Delete individual script
+        db.execute_update("DELETE FROM scripts WHERE id = ?", (script_id_to_delete,))
+        st.success("✅ Script deleted successfully!")
+        st.session_state['_needs_rerun'] = True
+    
+    # Process regenerate button clicks
+    script_id = st.session_state.pop('regenerate_script', None)
+    if script_id is not None:
+        with st.spinner("Regenerating script... This may take a moment."):
+            regenerate_script(script_id)
+        st.session_state['_needs_rerun'] = True
+    
+    # Handle retry all failed scripts
+    if st.session_state.pop('retry_all_failed', False):
+        with st.spinner("Retrying all failed scripts... This may take several minutes."):
+            retry_all_failed_scripts()
+        st.session_state['_needs_rerun'] = True
+    
+    # Actions handled above (and stale errors dropped at the top) rerun the page once, together
+    if st.session_state.pop('_needs_rerun', False):
+        st.rerun()
+    
+    # Get all blog URLs (include _object_id for reliable updates), newest first.
+    # Cached until this process writes to the database (or the TTL expires).
+    version_tag = db.get_write_version()
+    blog_urls = _load_blogs(version_tag)
+    
+    if not blog_urls:
+        st.info("ℹ️ No blog URLs added yet. Add a blog URL above to generate scripts.")
+    else:
+        # Check if there are any failed scripts (one grouped count for all blogs)
+        failed_by_blog = _load_failed_counts(version_tag)
+        failed_scripts_count = sum(failed_by_blog.values())
+        
+        # Check for stuck processing statuses (processing for more than 5 minutes)
+        stuck_blogs = _load_stuck_blogs(version_tag)
+        stuck_count = len(stuck_blogs)
+        
+        # Show action buttons
+        action_cols = st.columns(3)
+        
+        with action_cols[0]:
+            if failed_scripts_count > 0:
+                if st.button("🔄 Retry All Failed", use_container_width=True, type="secondary"):
+                    st.session_state.retry_all_failed = True
+                    st.rerun()
+        
+        with action_cols[1]:
+            if stuck_count > 0:
+                if st.button("🔧 Reset Stuck Processing", use_container_width=True, type="secondary", help="Reset blog URLs stuck in processing status"):
+                    # Reset all stuck processing statuses with a single UPDATE ... WHERE id IN (...)
+                    # Use ObjectId string if available, otherwise use hash ID
+                    stuck_ids = tuple(blog.get('_object_id') or blog['id'] for blog in stuck_blogs)
+                    placeholders = ', '.join('?' * len(stuck_ids))
+                    reset_count = db.execute_update(f"""
+                        UPDATE blog_urls 
+                        SET status = 'failed', 
+                            notes = 'Reset: Script generation was stuck in processing status. You can try generating again.',
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE id IN ({placeholders})
+                    """, stuck_ids)
+                    if reset_count > 0:
+                        st.success(f"✅ Reset {reset_count} stuck blog URL(s)! They have been marked as 'failed' and can be regenerated.")
                         st.rerun()
-            
-            # Sub-rows for scripts (expandable)
-            if scripts:
-                # Check if any scripts are missing metadata
-                scripts_missing_metadata = [s for s in scripts if (
-                    s.get('youtube_title') in [None, '', 'N/A'] or 
-                    s.get('youtube_description') in [None, '', 'N/A'] or
-                    s.get('youtube_keywords') in [None, '', 'N/A']
-                ) and s.get('status') == 'completed' and s.get('script_content') and not s.get('script_content', '').startswith('Error:')]
-                
-                with st.expander(f"📋 View {len(scripts)} Script(s)", expanded=False):
-                    # Add button to re-extract metadata if any scripts are missing it
-                    if scripts_missing_metadata:
-                        col_extract, col_retry = st.columns([1, 1])
-                        with col_extract:
-                            if st.button("🔍 Re-extract Metadata", key=f"re_extract_{blog_id}", use_container_width=True, help="Re-extract title, description, and keywords from script content"):
-                                st.session_state.re_extract_metadata = blog_id
-                                st.rerun()
-                        with col_retry:
-                            # Check if there are failed scripts
-                            failed_scripts = [s for s in scripts if s.get('status') == 'failed']
-                            if failed_scripts:
-                                if st.button("🔄 Retry All Failed", key=f"retry_failed_{blog_id}", use_container_width=True):
-                                    st.session_state.retry_failed = blog_id
-                                    st.rerun()
-                        st.markdown("---")
-                    
-                    # Sub-row header (Script column is much wider)
-                    sub_header_cols = st.columns([0.5, 0.5, 0.8, 4.0, 0.8, 0.8, 0.5])
-                    sub_headers = ["Category", "Regenerate", "Tokens/Cost", "Script", "Status", "Timestamp", "Delete"]
-                    for i, header in enumerate(sub_headers):
-                        if i < len(sub_header_cols):
-                            sub_header_cols[i].markdown(f"**{header}**")
-                    st.markdown("---")
-                    
-                    # Display each script as a sub-row
-                    for script in scripts:
-                        script_id = script['id']
-                        category = script['title']
-                        script_content = script['script_content']
-                        title = script.get('youtube_title', '') or 'N/A'
-                        description = script.get('youtube_description', '') or 'N/A'
-                        keywords = script.get('youtube_keywords', '') or 'N/A'
-                        script_status = script['status']
-                        script_timestamp = script.get('updated_at', status_timestamp)
-                        # Get token usage and cost for this script, ensuring they're the correct types
-                        script_input_tokens = int(script.get('input_tokens') or 0)
-                        script_output_tokens = int(script.get('output_tokens') or 0)
-                        script_total_tokens = int(script.get('total_tokens') or 0)
-                        script_input_cost = float(script.get('input_cost') or 0.0)
-                        script_output_cost = float(script.get('output_cost') or 0.0)
-                        script_total_cost = float(script.get('total_cost') or 0.0)
-                        
-                        # Extract error message
-                        script_error_msg = ""
-                        if script_status == 'failed' and script_content:
-                            if script_content.startswith("Error:"):
-                                script_error_msg = script_content.replace("Error:", "").strip()
-                            else:
-                                script_error_msg = script_content
-                        
-                        # Create sub-row columns (7 columns - Script column is much wider)
-                        sub_row_cols = st.columns([0.5, 0.5, 0.8, 4.0, 0.8, 0.8, 0.5])
-                        
-                        with sub_row_cols[0]:
-                            st.text(category)
-                        
-                        with sub_row_cols[1]:
-                            if st.button("🔄", key=f"regenerate_{script_id}", use_container_width=True, help="Regenerate this script"):
-                                st.session_state.regenerate_script = script_id
-                                st.rerun()
-                        
-                        with sub_row_cols[2]:
-                            # Show token usage and cost for this script
-                            if script_total_tokens > 0:
-                                from utils.cost_calculator import format_cost
-                                st.text(f"💾 {script_total_tokens:,}")
-                                st.caption(f"In:{script_input_tokens:,} Out:{script_output_tokens:,}")
-                                if script_total_cost > 0:
-                                    st.text(f"💵 {format_cost(script_total_cost)}")
-                                else:
-                                    st.caption("Cost: $0.00")
-                            else:
-                                st.caption("N/A")
-                        
-                        with sub_row_cols[3]:
-                            with st.expander("📝 View", expanded=False):
-                                st.text_area("", script_content, height=150, key=f"script_view_{script_id}", label_visibility="collapsed")
-                        
-                        with sub_row_cols[4]:
-                            if script_status == 'completed':
-                                st.success("✅ Generated")
-                            elif script_status == 'pending':
-                                st.info("⏳ Pending")
-                            elif script_status == 'failed':
-                                error_display = script_error_msg if script_error_msg else "Failed to generate"
-                                st.error(f"❌ {error_display[:40]}")
-                            else:
-                                st.text(script_status)
-                        
-                        with sub_row_cols[5]:
-                            if script_timestamp and script_timestamp != 'N/A':
-                                try:
-                                    if isinstance(script_timestamp, str):
-                                        ts_str = str(script_timestamp)[:19]
-                                    else:
-                                        ts_str = str(script_timestamp)
-                                    st.caption(ts_str)
-                                except:
-                                    st.caption(str(script_timestamp))
-                            else:
-                                st.caption('N/A')
-                        
-                        with sub_row_cols[6]:
-                            # Delete button for individual script (simplified - direct delete)
-                            if st.button("🗑️", key=f"delete_script_{script_id}", use_container_width=True, help=f"Delete {category} script"):
-                                st.session_state.delete_script = script_id
-                                st.rerun()
-                        
-                        st.markdown("---")
-            else:
-                # No scripts yet
-                st.info("⏳ Scripts are being generated...")
-            
-            st.markdown("---")
+                    else:
+                        st.warning("⚠️ Could not reset stuck blog URLs. They may have already been processed or there was an error.")
+        
+        with action_cols[2]:
+            if st.button("🔄 Refresh", use_container_width=True, type="secondary", help="Refresh the page to check latest status"):
+                st.rerun()
+        
+        # Show warnings
+        if failed_scripts_count > 0:
+            st.warning(f"⚠️ {failed_scripts_count} script(s) failed. You can retry them individually or retry all at once.")
+        
+        if stuck_count > 0:
+            st.error(f"⚠️ {stuck_count} blog URL(s) appear to be stuck in processing. Click 'Reset Stuck Processing' to fix them.")
+        
+        # Display blogs with hierarchical structure (main row + sub-rows for scripts)
+        st.markdown("### Generated Scripts")
+        
+        if blog_urls:
+            scripts_by_blog = _load_scripts_by_blog(version_tag)
+            for blog in blog_urls:
+                _render_blog(blog, scripts_by_blog.get(blog['id'], []))
+        else:
+            st.info("ℹ️ No blog URLs added yet. Add a blog URL above to generate scripts.")
 
 def regenerate_script(script_id):
     """Regenerate a single script using the same JSON format as batch generation"""
-    # Get script details
+    # Get script details, then its blog URL (the database layer has no JOIN)
     scripts = db.execute_query("""
-        SELECT s.id, s.blog_url_id, s.script_number, s.category, bu.url
-        FROM scripts s
-        JOIN blog_urls bu ON s.blog_url_id = bu.id
-        WHERE s.id = ?
+        SELECT id, blog_url_id, script_number, category
+        FROM scripts
+        WHERE id = ?
     """, (script_id,))
     
     if not scripts:
@@ -2308,7 +2041,11 @@ def regenerate_script(script_id):
         return
     
     script = scripts[0]
-    blog_url = script['url']
+    blogs = db.execute_query("SELECT url FROM blog_urls WHERE id = ?", (script['blog_url_id'],))
+    if not blogs or not blogs[0].get('url'):
+        st.error("Blog URL not found for this script!")
+        return
+    blog_url = blogs[0]['url']
     script_number = script['script_number']
     category_name = script.get('category') or 'How-To'  # Default to How-To if category is missing
     blog_id = script['blog_url_id']
@@ -2336,35 +2073,7 @@ def regenerate_script(script_id):
     
     try:
         # Fetch article text
-        from utils.article_fetcher import fetch_article_text
-        article_text = fetch_article_text(blog_url)
-        
-        # Import utilities
-        from utils.cost_calculator import calculate_cost
-        
-        # Create a modified prompt for single script generation
-        # The prompt should ask for JSON with videos array containing only one video for the specified category
-        single_script_prompt = f"""{master_prompt}
-
-IMPORTANT: Generate ONLY ONE video script for the "{category_name}" category.
-Return a JSON object with a "videos" array containing exactly ONE video object with the following structure:
-{{
-  "videos": [
-    {{
-      "category": "{category_name}",
-      "title": "...",
-      "caption": "...",
-      "description": "...",
-      "short_description": "...",
-      "keywords": ["...", "..."],
-      "heygen_setup": {{...}},
-      "avatar_visual_style": {{...}},
-      "script": "..."
-    }}
-  ]
-}}
-
-The video object must be for the "{category_name}" category ONLY."""
+        article_text = _fetch_article_text(blog_url)
         
         # Get API key and model
         api_key = config.get_openai_api_key()
@@ -2379,42 +2088,19 @@ The video object must be for the "{category_name}" category ONLY."""
         
         model_name = config.get_openai_model()
         
-        # Import OpenAI SDK
-        try:
-            from openai import OpenAI
-        except ImportError:
+        # Fill the master prompt's placeholders and ask for a single script of this category
+        single_script_prompt = (
+            master_prompt.replace('{{ARTICLE}}', article_text).replace('{{SOURCE_URL}}', blog_url)
+            + _single_script_suffix(category_name)
+        )
+        
+        # Shared client - reuses pooled connections across regenerations
+        from utils.script_generator import OPENAI_SDK_AVAILABLE, get_openai_client, wait_for_openai_slot
+        if not OPENAI_SDK_AVAILABLE:
             progress_placeholder.error("❌ OpenAI Python SDK not installed. Please install it with: pip install openai")
             return
-        
-        # Initialize OpenAI client
-        # Handle potential proxy or compatibility issues
-        try:
-            client = OpenAI(api_key=api_key)
-        except TypeError as e:
-            # If there's a compatibility issue, try without any extra parameters
-            if 'proxies' in str(e) or 'unexpected keyword argument' in str(e):
-                # Try creating client with minimal parameters
-                import os
-                # Temporarily clear proxy-related environment variables that might cause issues
-                old_proxy_vars = {}
-                proxy_vars = ['HTTP_PROXY', 'HTTPS_PROXY', 'http_proxy', 'https_proxy', 'ALL_PROXY', 'all_proxy']
-                for var in proxy_vars:
-                    if var in os.environ:
-                        old_proxy_vars[var] = os.environ[var]
-                        del os.environ[var]
-                
-                try:
-                    client = OpenAI(api_key=api_key)
-                finally:
-                    # Restore proxy environment variables
-                    for var, value in old_proxy_vars.items():
-                        os.environ[var] = value
-            else:
-                raise
-        
-        # Replace placeholders in prompt
-        single_script_prompt = single_script_prompt.replace('{{ARTICLE}}', article_text)
-        single_script_prompt = single_script_prompt.replace('{{SOURCE_URL}}', blog_url)
+        import httpx
+        client = get_openai_client(api_key)
         
         # Make API call using new responses.create() API structure with fallback
         try:
@@ -2425,8 +2111,9 @@ The video object must be for the "{category_name}" category ONLY."""
             # Try new API structure first
             if hasattr(client, 'responses') and hasattr(client.responses, 'create'):
                 try:
-                    print(f"[DEBUG] Attempting to use new responses.create() API structure for regeneration")
+                    logger.debug("Attempting to use new responses.create() API structure for regeneration")
                     
+                    wait_for_openai_slot()
                     response = client.responses.create(
                         model=model_name,
                         input=[single_script_prompt],  # Pass the prompt in the input array
@@ -2449,7 +2136,7 @@ The video object must be for the "{category_name}" category ONLY."""
                     )
                     
                     use_new_api = True
-                    print(f"[DEBUG] Successfully used new responses.create() API structure")
+                    logger.debug("Successfully used new responses.create() API structure")
                     
                     # Extract content from new API response
                     if hasattr(response, 'output'):
@@ -2494,7 +2181,7 @@ The video object must be for the "{category_name}" category ONLY."""
                             else:
                                 content = str(response)
                         except Exception as e:
-                            print(f"[DEBUG] Error extracting content: {str(e)}")
+                            logger.debug("Error extracting content: %s", e)
                             content = str(response)
                     
                     if not content:
@@ -2514,14 +2201,14 @@ The video object must be for the "{category_name}" category ONLY."""
                         token_usage['input_tokens'] = getattr(response, 'input_tokens', 0)
                         token_usage['output_tokens'] = getattr(response, 'output_tokens', 0)
                         token_usage['total_tokens'] = token_usage['input_tokens'] + token_usage['output_tokens']
-                    
+                
                 except (AttributeError, Exception) as e:
-                    print(f"[DEBUG] New API structure failed or not available: {str(e)}, falling back to standard API")
+                    logger.debug("New API structure failed or not available: %s, falling back to standard API", e)
                     use_new_api = False
             
             # Fall back to standard chat completions API
             if not use_new_api:
-                print(f"[DEBUG] Using standard chat completions API for regeneration")
+                logger.debug("Using standard chat completions API for regeneration")
                 
                 # GPT-5 only supports default temperature (1), not custom values
                 api_params = {
@@ -2532,25 +2219,43 @@ The video object must be for the "{category_name}" category ONLY."""
                     ],
                     "max_tokens": 4000,
                     "response_format": {"type": "json_object"},
-                    "timeout": 180
+                    # A stream that sends nothing for this long (including before the first chunk) is abandoned
+                    "timeout": httpx.Timeout(180, read=_STREAM_STALL_SECONDS)
                 }
                 
                 # Only add temperature if not GPT-5 (GPT-5 only supports default value of 1)
                 if not model_name.startswith("gpt-5"):
                     api_params["temperature"] = 0.7
                 
-                response = client.chat.completions.create(**api_params)
+                # Stream the completion; the read timeout above abandons a stalled stream
+                wait_for_openai_slot()
+                stream = client.chat.completions.create(
+                    **api_params, stream=True, stream_options={"include_usage": True}
+                )
                 
-                # Extract content from standard API response
-                if response.choices and len(response.choices) > 0:
-                    content = response.choices[0].message.content
-                    
-                    # Extract token usage
-                    token_usage = {
-                        'input_tokens': response.usage.prompt_tokens if response.usage else 0,
-                        'output_tokens': response.usage.completion_tokens if response.usage else 0,
-                        'total_tokens': response.usage.total_tokens if response.usage else 0
-                    }
+                chunks = []
+                received_choices = False
+                # Closing the stream returns its connection to the pool even if reading raises
+                with stream:
+                    for chunk in stream:
+                        # The final chunk carries usage and no choices
+                        if chunk.usage:
+                            token_usage = {
+                                'input_tokens': chunk.usage.prompt_tokens or 0,
+                                'output_tokens': chunk.usage.completion_tokens or 0,
+                                'total_tokens': chunk.usage.total_tokens or 0
+                            }
+                        if not chunk.choices:
+                            continue
+                        received_choices = True
+                        delta = chunk.choices[0].delta.content
+                        if delta:
+                            chunks.append(delta)
+                            if len(chunks) % _STREAM_PROGRESS_EVERY == 0:
+                                progress_placeholder.info(f"🔄 Regenerating {category_name} script... {len(chunks)} tokens received")
+                
+                if received_choices:
+                    content = "".join(chunks)
                 else:
                     error_msg = "No choices in API response"
                     progress_placeholder.error(f"❌ Failed to regenerate script: {error_msg}")
@@ -2574,7 +2279,7 @@ The video object must be for the "{category_name}" category ONLY."""
                     WHERE id = ?
                 """, (error_msg, script_id))
                 return
-                
+        
         except Exception as api_error:
             error_msg = str(api_error)
             error_type = type(api_error).__name__
@@ -2615,7 +2320,7 @@ The video object must be for the "{category_name}" category ONLY."""
         
         # Parse JSON response
         try:
-            response_json = json.loads(content)
+            response_json = loads_json(content)
             videos = response_json.get('videos', [])
             
             if not videos or len(videos) == 0:
@@ -2641,7 +2346,7 @@ The video object must be for the "{category_name}" category ONLY."""
                 "keywords": keywords if isinstance(keywords, list) else []
             }
             
-            script_content = json.dumps(script_json, indent=2, ensure_ascii=False)
+            script_content = _dumps_compact(script_json)
             
             # Calculate cost
             cost_info = calculate_cost(
@@ -2653,90 +2358,72 @@ The video object must be for the "{category_name}" category ONLY."""
             token_usage['output_cost'] = cost_info['output_cost']
             token_usage['total_cost'] = cost_info['total_cost']
             
-            # Get old token usage and cost for this script (to subtract from blog totals)
+            # Old token usage and cost for this script (replaced in the blog totals below)
             old_script = db.execute_query("""
                 SELECT input_tokens, output_tokens, total_tokens,
                        input_cost, output_cost, total_cost
                 FROM scripts WHERE id = ?
-            """, (script_id,))
-            old_input = old_script[0].get('input_tokens', 0) if old_script else 0
-            old_output = old_script[0].get('output_tokens', 0) if old_script else 0
-            old_total = old_script[0].get('total_tokens', 0) if old_script else 0
-            old_input_cost = float(old_script[0].get('input_cost') or 0.0) if old_script else 0.0
-            old_output_cost = float(old_script[0].get('output_cost') or 0.0) if old_script else 0.0
-            old_total_cost = float(old_script[0].get('total_cost') or 0.0) if old_script else 0.0
-            
-            # Get current token usage and cost for this blog
-            blog_info = db.execute_query("""
-                SELECT input_tokens, output_tokens, total_tokens,
-                       input_cost, output_cost, total_cost
-                FROM blog_urls WHERE id = ?
-            """, (blog_id,))
-            current_input = blog_info[0].get('input_tokens', 0) if blog_info else 0
-            current_output = blog_info[0].get('output_tokens', 0) if blog_info else 0
-            current_total = blog_info[0].get('total_tokens', 0) if blog_info else 0
-            current_input_cost = float(blog_info[0].get('input_cost') or 0.0) if blog_info else 0.0
-            current_output_cost = float(blog_info[0].get('output_cost') or 0.0) if blog_info else 0.0
-            current_total_cost = float(blog_info[0].get('total_cost') or 0.0) if blog_info else 0.0
-            
-            # Calculate new totals (subtract old, add new)
-            new_input = current_input - old_input + token_usage.get('input_tokens', 0)
-            new_output = current_output - old_output + token_usage.get('output_tokens', 0)
-            new_total = current_total - old_total + token_usage.get('total_tokens', 0)
-            new_input_cost = current_input_cost - old_input_cost + token_usage.get('input_cost', 0.0)
-            new_output_cost = current_output_cost - old_output_cost + token_usage.get('output_cost', 0.0)
-            new_total_cost = current_total_cost - old_total_cost + token_usage.get('total_cost', 0.0)
-            
-            # Update blog token usage and cost
-            db.execute_update("""
-                UPDATE blog_urls
-                SET input_tokens = ?,
-                    output_tokens = ?,
-                    total_tokens = ?,
-                    input_cost = ?,
-                    output_cost = ?,
-                    total_cost = ?,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (new_input, new_output, new_total, 
-                  new_input_cost, new_output_cost, new_total_cost, blog_id))
+            """, (script_id,), project=True)
+            old_usage = old_script[0] if old_script else {}
             
-            # Update script
-            db.execute_update("""
-                UPDATE scripts
-                SET script_content = ?,
-                    title = ?,
-                    caption = ?,
-                    category = ?,
-                    youtube_title = ?,
-                    youtube_description = ?,
-                    youtube_keywords = ?,
-                    input_tokens = ?,
-                    output_tokens = ?,
-                    total_tokens = ?,
-                    input_cost = ?,
-                    output_cost = ?,
-                    total_cost = ?,
-                    status = 'completed',
-                    error = NULL,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (
-                script_content,
-                title,
-                caption,
-                category_name,
-                title,
-                description,
-                keywords_str,
-                token_usage.get('input_tokens', 0),
-                token_usage.get('output_tokens', 0),
-                token_usage.get('total_tokens', 0),
-                token_usage.get('input_cost', 0.0),
-                token_usage.get('output_cost', 0.0),
-                token_usage.get('total_cost', 0.0),
-                script_id
-            ))
+            with db.transaction():
+                # Shift the blog totals by the difference in place
+                db.execute_update("""
+                    UPDATE blog_urls
+                    SET input_tokens = input_tokens + ?,
+                        output_tokens = output_tokens + ?,
+                        total_tokens = total_tokens + ?,
+                        input_cost = input_cost + ?,
+                        output_cost = output_cost + ?,
+                        total_cost = total_cost + ?,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """, (
+                    token_usage.get('input_tokens', 0) - (old_usage.get('input_tokens') or 0),
+                    token_usage.get('output_tokens', 0) - (old_usage.get('output_tokens') or 0),
+                    token_usage.get('total_tokens', 0) - (old_usage.get('total_tokens') or 0),
+                    token_usage.get('input_cost', 0.0) - (old_usage.get('input_cost') or 0.0),
+                    token_usage.get('output_cost', 0.0) - (old_usage.get('output_cost') or 0.0),
+                    token_usage.get('total_cost', 0.0) - (old_usage.get('total_cost') or 0.0),
+                    blog_id
+                ))
+                
+                # Update script
+                db.execute_update("""
+                    UPDATE scripts
+                    SET script_content = ?,
+                        title = ?,
+                        caption = ?,
+                        category = ?,
+                        youtube_title = ?,
+                        youtube_description = ?,
+                        youtube_keywords = ?,
+                        input_tokens = ?,
+                        output_tokens = ?,
+                        total_tokens = ?,
+                        input_cost = ?,
+                        output_cost = ?,
+                        total_cost = ?,
+                        status = 'completed',
+                        error = NULL,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """, (
+                    script_content,
+                    title,
+                    caption,
+                    category_name,
+                    title,
+                    description,
+                    keywords_str,
+                    token_usage.get('input_tokens', 0),
+                    token_usage.get('output_tokens', 0),
+                    token_usage.get('total_tokens', 0),
+                    token_usage.get('input_cost', 0.0),
+                    token_usage.get('output_cost', 0.0),
+                    token_usage.get('total_cost', 0.0),
+                    script_id
+                ))
             
             progress_placeholder.success(f"✅ {category_name} script regenerated successfully!")
             
@@ -2767,15 +2454,14 @@ The video object must be for the "{category_name}" category ONLY."""
         """, (error_msg, script_id))
 
 def retry_all_failed_scripts():
-    """Retry all failed scripts"""
+    """Retry all failed scripts, batching each blog's scripts into a few requests run side by side"""
     # Get all failed scripts
     failed_scripts = db.execute_query("""
-        SELECT s.id, s.blog_url_id, s.script_number, s.title, bu.url
-        FROM scripts s
-        JOIN blog_urls bu ON s.blog_url_id = bu.id
-        WHERE s.status = 'failed'
-        ORDER BY bu.id, s.script_number
-    """)
+        SELECT id, blog_url_id, script_number, title, category
+        FROM scripts
+        WHERE status = ?
+        ORDER BY blog_url_id ASC, script_number ASC
+    """, ('failed',))
     
     if not failed_scripts:
         st.info("No failed scripts to retry.")
@@ -2790,10 +2476,17 @@ def retry_all_failed_scripts():
     
     master_prompt = master_prompts[0]['prompt_text']
     
+    # Blog URLs for all failed scripts in one query (the database layer has no JOIN)
+    blog_ids = tuple({script['blog_url_id'] for script in failed_scripts})
+    placeholders = ', '.join('?' * len(blog_ids))
+    blog_urls = {
+        str(blog['id']): blog['url']
+        for blog in db.execute_query(f"SELECT id, url FROM blog_urls WHERE id IN ({placeholders})", blog_ids)
+    }
+    
     # Import generation function
-    from pages.blog_url_page import generate_single_script_with_chatgpt
+    from pages.blog_url_page import generate_scripts_for_categories_with_chatgpt
     from utils.script_metadata_extractor import extract_metadata_from_script
-    import time
     
     progress_bar = st.progress(0)
     status_text = st.empty()
@@ -2803,63 +2496,69 @@ def retry_all_failed_scripts():
     
     status_text.text(f"🔄 Retrying {len(failed_scripts)} failed script(s)...")
     
-    for idx, script in enumerate(failed_scripts):
-        script_id = script['id']
-        blog_url = script['url']
-        script_number = script['script_number']
-        category_name = script['title']
-        
-        status_text.text(f"🔄 Retrying {category_name} script ({idx + 1}/{len(failed_scripts)})...")
-        progress_bar.progress((idx + 1) / len(failed_scripts))
-        
-        # Generate new script
-        script_content, error = generate_single_script_with_chatgpt(
-            blog_url,
-            master_prompt,
-            category_name,
-            script_number
-        )
+    # Scripts of the same blog share the master prompt and article, so they are
+    # regenerated a few per request instead of one request each
+    scripts_by_blog = defaultdict(list)
+    for script in failed_scripts:
+        scripts_by_blog[str(script['blog_url_id'])].append(script)
+    
+    # Requests overlap on a small pool; _request_script backs off on 429s itself.
+    # Results are queued and written in one transaction when all of them are in.
+    with db.batch() as updates, ThreadPoolExecutor(max_workers=_RETRY_CONCURRENCY) as executor:
+        futures = {}
+        for blog_id, scripts in scripts_by_blog.items():
+            blog_url = blog_urls.get(blog_id)
+            if not blog_url:
+                failed_count += len(scripts)
+                for script in scripts:
+                    updates.append((_SCRIPT_RETRY_FAILED_SQL, ("Error: Blog URL not found", script['id'])))
+                continue
+            for i in range(0, len(scripts), _RETRY_BATCH_SIZE):
+                group = scripts[i:i + _RETRY_BATCH_SIZE]
+                categories = [
+                    script.get('category') or script.get('title') or f"Script {script['script_number']}"
+                    for script in group
+                ]
+                future = executor.submit(
+                    generate_scripts_for_categories_with_chatgpt,
+                    blog_url,
+                    master_prompt,
+                    categories
+                )
+                futures[future] = [(script['id'], category) for script, category in zip(group, categories)]
         
-        if error:
-            failed_count += 1
-            # Update script with error
-            db.execute_update("""
-                UPDATE scripts
-                SET script_content = ?,
-                    status = 'failed',
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (f"Error: {error}", script_id))
-        else:
-            success_count += 1
-            # Extract metadata
-            metadata = extract_metadata_from_script(script_content)
+        done = 0
+        for future in as_completed(futures):
+            group = futures[future]
+            done += len(group)
+            status_text.text(f"🔄 Retried {', '.join(category for _, category in group)} ({done}/{len(failed_scripts)})...")
+            progress_bar.progress(min(done / len(failed_scripts), 1.0))
             
-            # Update script
-            db.execute_update("""
-                UPDATE scripts
-                SET script_content = ?,
-                    youtube_title = ?,
-                    youtube_description = ?,
-                    youtube_keywords = ?,
-                    status = 'completed',
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (
-                script_content.strip(),
-                metadata.get('title', ''),
-                metadata.get('description', ''),
-                ', '.join(metadata.get('keywords', [])) if metadata.get('keywords') else None,
-                script_id
-            ))
-        
-        # Add delay between retries to avoid rate limits
-        if idx < len(failed_scripts) - 1:
-            time.sleep(5)
-            # If we got a rate limit error, wait longer
-            if error and "rate limit" in error.lower():
-                status_text.warning(f"⚠️ Rate limit detected. Waiting 30 seconds before next retry...")
-                time.sleep(30)
+            try:
+                contents, error, _token_usage = future.result()
+            except Exception as e:
+                contents, error = None, str(e)
+            
+            for index, (script_id, category_name) in enumerate(group):
+                script_content = contents[index] if contents else None
+                if error or not script_content:
+                    failed_count += 1
+                    # Update script with error
+                    updates.append((_SCRIPT_RETRY_FAILED_SQL, (f"Error: {error or 'No content received'}", script_id)))
+                    continue
+                
+                success_count += 1
+                # Extract metadata
+                metadata = extract_metadata_from_script(script_content)
+                
+                # Update script
+                updates.append((_SCRIPT_RETRY_COMPLETED_SQL, (
+                    script_content,
+                    metadata.get('title', ''),
+                    metadata.get('description', ''),
+                    ', '.join(metadata.get('keywords', [])) if metadata.get('keywords') else None,
+                    script_id
+                )))
     
     progress_bar.empty()
     status_text.empty()
@@ -4,7 +4,11 @@ Allows users to upload videos with metadata and publish to multiple platforms
 """
 
 import streamlit as st
+import functools
 import os
+import shutil
+import time
+import uuid
 from datetime import datetime
 import database.db_setup as db
 import sys
@@ -12,6 +16,15 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
 import re
 
+# Uploaded files are stored here (relative to the app's working directory)
+UPLOADS_VIDEOS_DIR = os.path.join(os.getcwd(), "uploads", "videos")
+
+@functools.lru_cache(maxsize=8)
+def _ensure_dir(path: str) -> str:
+    """Create a directory once per process and return its path"""
+    os.makedirs(path, exist_ok=True)
+    return path
+
 def extract_cloudinary_public_id(cloudinary_url: str) -> str:
     """
     Extract public_id from Cloudinary URL
@@ -43,6 +56,9 @@ def delete_file_from_storage(file_path: str):
     
     # Check if it's a Cloudinary URL
     if isinstance(file_path, str) and 'res.cloudinary.com' in file_path:
+        if re.search(r'/upload/(?:[a-z]{1,3}_[^/]+/)+', file_path):
+            # Derived asset (e.g. a so_<offset> frame of the video) - it goes away with the video
+            return
         try:
             # Extract public_id from URL
             public_id = extract_cloudinary_public_id(file_path)
@@ -136,25 +152,26 @@ def show():
                 st.error("⚠️ Please enter a title")
             else:
                 # Save video and thumbnail files
-                uploads_dir = os.path.join(os.getcwd(), "uploads", "videos")
-                os.makedirs(uploads_dir, exist_ok=True)
                 
                 try:
                     # Save video file
-                    timestamp = int(datetime.now().timestamp())
+                    # Seconds plus a short random suffix so uploads in the same second don't overwrite each other
+                    timestamp = f"{int(time.time())}_{uuid.uuid4().hex[:8]}"
                     video_filename = f"video_{timestamp}_{uploaded_video.name}"
-                    video_path = os.path.join(uploads_dir, video_filename)
+                    video_path = os.path.join(_ensure_dir(UPLOADS_VIDEOS_DIR), video_filename)
                     
+                    uploaded_video.seek(0)
                     with open(video_path, "wb") as f:
-                        f.write(uploaded_video.getbuffer())
+                        shutil.copyfileobj(uploaded_video, f, length=4 * 1024 * 1024)
                     
                     # Save thumbnail file if provided
                     thumbnail_path = None
                     if uploaded_thumbnail:
                         thumbnail_filename = f"thumbnail_{timestamp}_{uploaded_thumbnail.name}"
-                        thumbnail_path = os.path.join(uploads_dir, thumbnail_filename)
+                        thumbnail_path = os.path.join(_ensure_dir(UPLOADS_VIDEOS_DIR), thumbnail_filename)
+                        uploaded_thumbnail.seek(0)
                         with open(thumbnail_path, "wb") as f:
-                            f.write(uploaded_thumbnail.getbuffer())
+                            shutil.copyfileobj(uploaded_thumbnail, f, length=1024 * 1024)
                     
                     # Save to database
                     # Note: We'll need to create a table for uploaded videos if it doesn't exist
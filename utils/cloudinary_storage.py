@@ -4,13 +4,22 @@ Cloudinary storage utility for uploading and managing files in Cloudinary.
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
+import cloudinary.utils
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional, Dict, Any
+import io
 import re
 
 # Global configuration state
 _cloudinary_configured = False
 _cloudinary_config = None
 
+# Background uploads (network-bound, so a few threads are enough)
+_upload_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cloudinary-upload")
+
+# Chunk size for upload_large (Cloudinary requires at least 5 MB per chunk)
+UPLOAD_CHUNK_SIZE = 6_000_000
+
 
 def configure_cloudinary(cloud_name: str, api_key: str, api_secret: str):
     """
@@ -27,6 +36,10 @@ def configure_cloudinary(cloud_name: str, api_key: str, api_secret: str):
     if not cloud_name or not api_key or not api_secret:
         raise ValueError("Missing required Cloudinary credentials (cloud_name, api_key, api_secret)")
     
+    # Already configured with these credentials - nothing to do
+    if _cloudinary_configured and _cloudinary_config == {'cloud_name': cloud_name, 'api_key': api_key, 'api_secret': api_secret}:
+        return
+    
     try:
         cloudinary.config(
             cloud_name=cloud_name,
@@ -126,6 +139,86 @@ def upload_file_from_bytes(
     return result
 
 
+def upload_file_from_path(
+    file_path: str,
+    resource_type: str = 'video',
+    public_id: Optional[str] = None,
+    folder: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Upload a file to Cloudinary from disk, letting the SDK stream it instead
+    of loading it into memory first.
+    
+    Args:
+        file_path: Path to the local file
+        resource_type: 'video' or 'image'
+        public_id: Optional public ID for the file
+        folder: Optional folder path in Cloudinary
+    
+    Returns:
+        Dictionary with upload result from Cloudinary
+    """
+    if not is_configured():
+        raise Exception("Cloudinary is not configured")
+    
+    # Build upload parameters
+    upload_params = {
+        'resource_type': resource_type,
+    }
+    
+    # Add folder if specified
+    if folder:
+        upload_params['folder'] = folder
+    
+    # Add public_id if specified
+    if public_id:
+        upload_params['public_id'] = public_id
+    
+    return cloudinary.uploader.upload(file_path, **upload_params)
+
+
+def upload_large_async(
+    file,
+    resource_type: str = 'video',
+    public_id: Optional[str] = None,
+    folder: Optional[str] = None
+) -> Future:
+    """
+    Start a chunked Cloudinary upload on a background thread.
+    
+    Args:
+        file: Local file path, file object or bytes
+        resource_type: 'video' or 'image'
+        public_id: Optional public ID for the file
+        folder: Optional folder path in Cloudinary
+    
+    Returns:
+        Future resolving to the upload result from Cloudinary
+    """
+    if not is_configured():
+        raise Exception("Cloudinary is not configured")
+    
+    # upload_large reads from a path or file object
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        file = io.BytesIO(file)
+    
+    # Build upload parameters
+    upload_params = {
+        'resource_type': resource_type,
+        'chunk_size': UPLOAD_CHUNK_SIZE,
+    }
+    
+    # Add folder if specified
+    if folder:
+        upload_params['folder'] = folder
+    
+    # Add public_id if specified
+    if public_id:
+        upload_params['public_id'] = public_id
+    
+    return _upload_executor.submit(cloudinary.uploader.upload_large, file, **upload_params)
+
+
 def delete_file(public_id: str, resource_type: str = 'video'):
     """
     Delete a file from Cloudinary.
@@ -146,6 +239,28 @@ def delete_file(public_id: str, resource_type: str = 'video'):
         raise Exception(f"Failed to delete file from Cloudinary: {str(e)}")
 
 
+def video_frame_url(video_public_id: str, offset_seconds: float) -> str:
+    """
+    Get the URL of a JPEG frame that Cloudinary renders on the fly from an
+    uploaded video (so_<offset>/f_jpg), so no separate thumbnail upload is needed.
+    
+    Args:
+        video_public_id: Public ID of the uploaded video
+        offset_seconds: Position of the frame in the video
+    
+    Returns:
+        Secure URL of the frame image
+    """
+    url, _ = cloudinary.utils.cloudinary_url(
+        video_public_id,
+        resource_type='video',
+        format='jpg',
+        start_offset=offset_seconds,
+        secure=True
+    )
+    return url
+
+
 def extract_public_id_from_url(url: str) -> Optional[str]:
     """
     Extract public_id from a Cloudinary URL.
@@ -23,6 +23,9 @@ PRICING = {
     }
 }
 
+# Resolved (input, output) rates per model name
+_RATE_CACHE = {}
+
 def get_model_pricing(model_name):
     """
     Get pricing for a specific model.
@@ -48,6 +51,17 @@ def get_model_pricing(model_name):
     # Default to gpt-4o-mini pricing
     return PRICING['gpt-4o-mini']
 
+def get_model_rates(model_name):
+    """
+    Get (input_rate, output_rate) per 1K tokens for a model, resolving the
+    model name against PRICING only once.
+    """
+    rates = _RATE_CACHE.get(model_name)
+    if rates is None:
+        pricing = get_model_pricing(model_name)
+        rates = _RATE_CACHE[model_name] = (pricing['input'], pricing['output'])
+    return rates
+
 def calculate_cost(input_tokens, output_tokens, model_name):
     """
     Calculate the cost for token usage.
@@ -60,11 +74,11 @@ def calculate_cost(input_tokens, output_tokens, model_name):
     Returns:
         Dictionary with 'input_cost', 'output_cost', and 'total_cost' in USD
     """
-    pricing = get_model_pricing(model_name)
+    input_rate, output_rate = get_model_rates(model_name)
     
     # Calculate costs (tokens / 1000 * price per 1K tokens)
-    input_cost = (input_tokens / 1000.0) * pricing['input']
-    output_cost = (output_tokens / 1000.0) * pricing['output']
+    input_cost = (input_tokens / 1000.0) * input_rate
+    output_cost = (output_tokens / 1000.0) * output_rate
     total_cost = input_cost + output_cost
     
     return {
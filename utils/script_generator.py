@@ -4,7 +4,9 @@ Generates scripts in a single API call based on master prompt (like Google Sheet
 The number of scripts generated depends on what the master prompt instructs the AI to create
 """
 
+import functools
 import json
+import threading
 import time
 from typing import Dict, List, Optional, Tuple
 import sys
@@ -35,8 +37,24 @@ def _safe_debug_value(value, limit: int = 200) -> str:
         return f"<unprintable: {exc}>"
 
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - fall back to the standard library parser
+    orjson = None
+
+def loads_json(text):
+    """Parse a JSON model response, with orjson when available; input orjson rejects (e.g. NaN) falls back to json"""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
 # Import OpenAI SDK
 try:
+    import httpx
     from openai import OpenAI
     try:
         # Helpful for differentiating transient network failures
@@ -49,6 +67,61 @@ except ImportError:
     APIConnectionError = None
     print("[WARNING] OpenAI Python SDK not available. Please install it with: pip install openai")
 
+class _RateLimiter:
+    """
+    Thread-safe token bucket allowing `rate` requests per minute, with bursts up to `rate`.
+    acquire() returns immediately while tokens remain and otherwise sleeps until one refills.
+    """
+    
+    def __init__(self, rate: int):
+        self._capacity = float(rate)
+        self._per_second = rate / 60.0
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._per_second)
+            self._updated = now
+            # Reserve a token; a negative balance is the queue of callers still waiting
+            self._tokens -= 1
+            wait = -self._tokens / self._per_second if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+def _openai_rpm(default: int = 60) -> int:
+    """OPENAI_RPM from the environment; missing or malformed values fall back to the default"""
+    try:
+        return max(1, int(os.getenv('OPENAI_RPM', default)))
+    except (TypeError, ValueError):
+        print(f"[WARNING] Ignoring invalid OPENAI_RPM={os.getenv('OPENAI_RPM')!r}, using {default}")
+        return default
+
+# OpenAI requests per minute for this process (set OPENAI_RPM to the account's limit)
+_openai_limiter = _RateLimiter(_openai_rpm())
+
+def wait_for_openai_slot():
+    """Block until the next OpenAI request fits under the configured requests-per-minute rate"""
+    _openai_limiter.acquire()
+
+@functools.lru_cache(maxsize=4)
+def get_openai_client(api_key: str):
+    """
+    OpenAI client for an API key, created once per process.
+    Requests made through it reuse pooled keep-alive connections instead of
+    opening a new TLS connection each time; it is safe to share across threads.
+    Timeout allows for slow GPT-5 responses; calls can pass a shorter one.
+    """
+    return OpenAI(
+        api_key=api_key,
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            timeout=600
+        )
+    )
+
 def generate_all_scripts_single_call(article_text: str, source_url: str, master_prompt: str) -> Tuple[Optional[List[Dict]], Optional[str], Dict]:
     """
     Generate scripts in a single API call based on master prompt.
@@ -81,13 +154,8 @@ def generate_all_scripts_single_call(article_text: str, source_url: str, master_
         if not OPENAI_SDK_AVAILABLE:
             return None, "OpenAI Python SDK not installed. Please install it with: pip install openai", {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
         
-        # Initialize OpenAI client with timeout
-        # Use a longer timeout for GPT-5 which can take more time
-        timeout_seconds = 600  # 10 minutes for GPT-5
-        client = OpenAI(
-            api_key=api_key,
-            timeout=timeout_seconds
-        )
+        # Shared client (10 minute timeout for GPT-5)
+        client = get_openai_client(api_key)
         
         # Replace placeholders in master prompt
         prompt = master_prompt.replace('{{ARTICLE}}', article_text).replace('{{SOURCE_URL}}', source_url)
@@ -101,7 +169,6 @@ def generate_all_scripts_single_call(article_text: str, source_url: str, master_
         
         # Retry logic with exponential backoff
         max_retries = 4  # Provide a few more chances to smooth over transient outages
-        timeout_seconds = 600  # Increased to 600 seconds (10 minutes) for GPT-5 which can take longer
         
         for attempt in range(max_retries):
             try:
@@ -132,6 +199,7 @@ def generate_all_scripts_single_call(article_text: str, source_url: str, master_
                 if not model_name.startswith("gpt-5"):
                     api_params["temperature"] = 0.7
                 
+                wait_for_openai_slot()
                 response = client.chat.completions.create(**api_params)
                 
                 # Extract content from standard API response
@@ -5,7 +5,10 @@ Extracts frames from video files for thumbnail selection
 
 import os
 import sys
-from typing import List, Optional
+import json
+import shutil
+import subprocess
+from typing import List, Optional, Tuple
 from pathlib import Path
 
 # Try to import video processing libraries
@@ -23,6 +26,84 @@ except ImportError:
     PIL_AVAILABLE = False
     print("[WARNING] PIL/Pillow not available. Install with: pip install pillow")
 
+# ffmpeg/ffprobe are optional - when installed, frames are extracted in a single decode pass
+FFMPEG_PATH = shutil.which("ffmpeg")
+FFPROBE_PATH = shutil.which("ffprobe")
+
+def _probe_video(video_path: str) -> Optional[Tuple[int, float]]:
+    """
+    Read (total_frames, fps) from the container metadata with ffprobe, without decoding.
+    Returns None if the video cannot be probed.
+    """
+    result = subprocess.run(
+        [FFPROBE_PATH, "-v", "error", "-select_streams", "v:0",
+         "-show_entries", "stream=nb_frames,r_frame_rate:format=duration",
+         "-of", "json", video_path],
+        capture_output=True, text=True, timeout=30
+    )
+    if result.returncode != 0:
+        return None
+    
+    info = json.loads(result.stdout or "{}")
+    streams = info.get("streams") or [{}]
+    num, _, den = (streams[0].get("r_frame_rate") or "0/1").partition("/")
+    fps = float(num) / float(den) if den and float(den) else 0.0
+    
+    total_frames = int(streams[0].get("nb_frames") or 0)
+    if total_frames <= 0:
+        # Some containers don't store a frame count - derive it from the duration
+        duration = float((info.get("format") or {}).get("duration") or 0)
+        total_frames = int(duration * fps)
+    
+    return (total_frames, fps) if total_frames > 0 else None
+
+def _extract_frames_ffmpeg(video_path: str, num_frames: int, output_dir: str) -> List[str]:
+    """
+    Extract evenly spaced frames with one ffmpeg call: a select filter picks the
+    frame numbers and decoding stops after the last one is written.
+    Returns an empty list if ffmpeg could not produce the frames.
+    """
+    try:
+        probed = _probe_video(video_path)
+        if not probed:
+            return []
+        total_frames, fps = probed
+        
+        # Calculate frame indices to extract (evenly spaced)
+        if num_frames >= total_frames:
+            frame_indices = list(range(total_frames))
+        else:
+            step = total_frames / (num_frames + 1)
+            frame_indices = [int(step * (i + 1)) for i in range(num_frames)]
+        
+        select_expr = "+".join(f"eq(n\\,{index})" for index in frame_indices)
+        output_pattern = os.path.join(output_dir, "ffmpeg_%04d.jpg")
+        result = subprocess.run(
+            [FFMPEG_PATH, "-v", "error", "-y", "-i", video_path,
+             "-vf", f"select='{select_expr}'", "-vsync", "0",
+             "-frames:v", str(len(frame_indices)), "-q:v", "2", output_pattern],
+            capture_output=True, text=True, timeout=300
+        )
+        if result.returncode != 0:
+            print(f"[WARNING] ffmpeg frame extraction failed: {result.stderr.strip()}")
+            return []
+        
+        # Rename to the frame_<index>_<timestamp>s.jpg names the UI reads timestamps from
+        extracted_frames = []
+        for position, frame_index in enumerate(frame_indices, start=1):
+            ffmpeg_path = output_pattern % position
+            if not os.path.exists(ffmpeg_path):
+                break
+            timestamp = frame_index / fps if fps > 0 else frame_index
+            frame_path = os.path.join(output_dir, f"frame_{frame_index:06d}_{timestamp:.2f}s.jpg")
+            os.replace(ffmpeg_path, frame_path)
+            extracted_frames.append(frame_path)
+        
+        return extracted_frames
+    except (OSError, ValueError, subprocess.SubprocessError) as e:
+        print(f"[WARNING] ffmpeg frame extraction failed: {str(e)}")
+        return []
+
 def extract_frames_from_video(video_path: str, num_frames: int = 12, output_dir: Optional[str] = None) -> List[str]:
     """
     Extract frames from a video file.
@@ -38,9 +119,6 @@ def extract_frames_from_video(video_path: str, num_frames: int = 12, output_dir:
     if not os.path.exists(video_path):
         raise FileNotFoundError(f"Video file not found: {video_path}")
     
-    if not CV2_AVAILABLE:
-        raise ImportError("OpenCV is required for frame extraction. Install with: pip install opencv-python")
-    
     # Create output directory if not provided
     if output_dir is None:
         video_name = Path(video_path).stem
@@ -48,6 +126,15 @@ def extract_frames_from_video(video_path: str, num_frames: int = 12, output_dir:
     
     os.makedirs(output_dir, exist_ok=True)
     
+    # Prefer a single ffmpeg decode pass; fall back to OpenCV if ffmpeg is missing or fails
+    if FFMPEG_PATH and FFPROBE_PATH:
+        extracted_frames = _extract_frames_ffmpeg(video_path, num_frames, output_dir)
+        if extracted_frames:
+            return extracted_frames
+    
+    if not CV2_AVAILABLE:
+        raise ImportError("OpenCV is required for frame extraction. Install with: pip install opencv-python")
+    
     # Open video file
     cap = cv2.VideoCapture(video_path)
     